@@ -1,37 +1,131 @@
 from textual.app import App, ComposeResult
-from textual.widgets import Footer, Header, Digits, Static, Markdown
+from textual.widgets import Footer, Header, Digits, Static, Markdown, ContentSwitcher
 from textual.containers import HorizontalGroup, VerticalGroup
 from textual.widgets import Input, Label
 from textual.screen import Screen
 from textual.reactive import reactive
+from textual.timer import Timer
+from textual.worker import Worker, WorkerState
+from functools import lru_cache, partial
+from pathlib import Path
+import asyncio
+from typing import Callable
 
 from diving_calc.calculators.nitrox_calculator import NitroxCalculator
 from diving_calc.physics.depth_converter import DepthConverter
 
+# Calculadora compartida por todas las cajas, el conversor sale del registro y no se crea en cada tecla
+calculadora_nitrox = NitroxCalculator(DepthConverter.for_salt_water(0)) # Agua del mar
 
-class Teoria(Markdown):
-    can_focus = False
+# Documentos de teoría junto al proyecto, no dependen del directorio desde el que se arranca
+DIRECTORIO_TEORIA = Path(__file__).resolve().parent.parent / "theory"
+
+# Segundos sin escribir antes de lanzar el cálculo, evita calcular cada tecla
+RETARDO_CALCULO = 0.15
+
+
+@lru_cache(maxsize=1024)
+def calcular_cacheado(calculo: Callable[[float, float], float], valor1: float, valor2: float) -> float:
+    """
+    Resultado compartido por todas las cajas, se ejecuta fuera del hilo de la interfaz.
 
-    def __init__(self, file_path: str, *args, **kwargs) -> None:
-        # Lee el contenido del archivo
-        with open(file_path, 'r') as file:
-            self.markdown_content = file.read()
-        super().__init__(self.markdown_content, *args, **kwargs)
+    :param calculo: Función de la caja que calcula el resultado.
+    :param valor1: Primer dato de la caja.
+    :param valor2: Segundo dato de la caja.
+    """
+    try:
+        return calculo(valor1, valor2)
+    except (ZeroDivisionError, ValueError):
+        return 0
+
+
+class Teoria(ContentSwitcher):
+    """
+    Documentos de teoría leídos una sola vez al arrancar, cada uno ya convertido en su propio widget Markdown.
+    Cambiar de documento solo muestra otro widget, no lee el disco ni vuelve a interpretar el Markdown.
+    """
+    can_focus = False
 
-    def update_content(self, new_file_path: str) -> None:
-        """Método para actualizar el contenido de la teoría según el archivo proporcionado."""
-        with open(new_file_path, 'r') as file:
-            self.markdown_content = file.read()
-        self.update(self.markdown_content)
+    def __init__(self, documento: str, directorio: Path = DIRECTORIO_TEORIA, *args, **kwargs) -> None:
+        """
+        :param documento: Nombre del documento mostrado al arrancar, sin la extensión.
+        :param directorio: Carpeta con los documentos de teoría en formato Markdown.
+        """
+        super().__init__(*args, **kwargs)
+        self.directorio = directorio
+        self.documento = documento
+
+    def on_mount(self) -> None:
+        self.run_worker(self.cargar_documentos(), exclusive=True)
+
+    async def cargar_documentos(self) -> None:
+        """Lee todos los documentos en paralelo fuera del hilo de la interfaz y los monta ocultos."""
+        rutas = sorted(self.directorio.glob("*.md"))
+        contenidos = await asyncio.gather(*(asyncio.to_thread(ruta.read_text, encoding="utf-8") for ruta in rutas))
+        documentos = [Markdown(contenido, id=Teoria.id_documento(ruta.stem))
+                      for ruta, contenido in zip(rutas, contenidos)]
+        # ContentSwitcher solo oculta los hijos que tiene al montarse, los añadidos después se ocultan aquí
+        for documento in documentos:
+            documento.display = False
+        await self.mount_all(documentos)
+        self.update_content(self.documento)
+
+    def update_content(self, documento: str) -> None:
+        """Muestra el documento por su nombre, si todavía se está cargando se mostrará al terminar."""
+        self.documento = documento
+        id_documento = Teoria.id_documento(documento)
+        if any(hijo.id == id_documento for hijo in self.children):
+            self.current = id_documento
+
+    @staticmethod
+    def id_documento(documento: str) -> str:
+        return f"teoria-{documento}"
 
 class CajaCalculos(Static):
+    """
+    Caja con dos datos y un resultado. El cálculo se lanza cuando el usuario deja de escribir
+    en un worker fuera del hilo de la interfaz, el nuevo cálculo cancela el anterior todavía pendiente,
+    así que la interfaz nunca espera al cálculo y solo se publica el resultado de los últimos datos.
+    """
+
+    def __init__(self, calculo: Callable[[float, float], float], *args, **kwargs) -> None:
+        """:param calculo: Calcula el resultado de la caja a partir de sus dos datos."""
+        super().__init__(*args, **kwargs)
+        self.calculo = calculo
+        self._temporizador: Timer | None = None
+
+    def leer_valores(self) -> tuple[float, float]:
+        try:
+            valor1 = float(self.input1.input.value) if self.input1.input.value else 0
+            valor2 = float(self.input2.input.value) if self.input2.input.value else 0
+        except ValueError:
+            valor1 = valor2 = 0  # Si hay un valor no numérico
+        return valor1, valor2
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Reinicia la espera con cada tecla, el cálculo se programa solo una vez."""
+        if self._temporizador is not None:
+            self._temporizador.stop()
+        self._temporizador = self.set_timer(RETARDO_CALCULO, self.lanzar_calculo)
+
+    def lanzar_calculo(self) -> None:
+        self._temporizador = None
+        valor1, valor2 = self.leer_valores()
+        self.run_worker(partial(calcular_cacheado, self.calculo, valor1, valor2),
+                        group="calculo", exclusive=True, thread=True, exit_on_error=False)
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        """Publica el resultado, los workers cancelados nunca terminan con éxito."""
+        if event.state == WorkerState.SUCCESS:
+            self.resultado.resultado = event.worker.result
+
     def on_descendant_focus(self):
         self.add_class("focused")
                 # Determinar qué tipo de caja tiene el foco y actualizar la teoría
         if isinstance(self, MOD):
-            self.app.get_widget_by_id("teoria").update_content("theory/mod.md")
+            self.app.get_widget_by_id("teoria").update_content("mod")
         elif isinstance(self, EAD):
-            self.app.get_widget_by_id("teoria").update_content("theory/ead.md")
+            self.app.get_widget_by_id("teoria").update_content("ead")
 
     def on_descendant_blur(self):
         self.remove_class("focused")
@@ -69,6 +163,9 @@ class ResultadoCalculo(Static):
             self.digits_widget.update(str(value))  # A
 
 class MOD(CajaCalculos):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(calculadora_nitrox.mod, *args, **kwargs)
+
     def compose(self) -> ComposeResult:
         with HorizontalGroup():
             self.input1 = FilaCalculo(label="Max ppO2 (bar)", placeholder="Ej. 1.6")
@@ -78,23 +175,11 @@ class MOD(CajaCalculos):
         self.resultado = ResultadoCalculo("MOD (m)")
         yield self.resultado
 
-    def on_input_changed(self, event: Input.Changed) -> None:
-        """Calcula el nuevo resultado cuando cambia un input."""
-        try:
-            valor1 = float(self.input1.input.value) if self.input1.input.value else 0
-            valor2 = float(self.input2.input.value) if self.input2.input.value else 0
-        except ValueError:
-            valor1 = valor2 = 0  # Si hay un valor no numérico
-        d = DepthConverter.for_salt_water(0) # Agua del mar
-        n = NitroxCalculator(d)
-        try:
-            mod = n.mod(valor1, valor2)
-        except (ZeroDivisionError, ValueError):
-            mod = 0
-        self.resultado.resultado = mod  # Actualiza el resultado
-
 
 class EAD(CajaCalculos):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(lambda valor1, valor2: calculadora_nitrox.ead(valor2, valor1), *args, **kwargs)
+
     def compose(self) -> ComposeResult:
         with HorizontalGroup():
             self.input1 = FilaCalculo(label="Depth (m)", placeholder="25")
@@ -104,24 +189,12 @@ class EAD(CajaCalculos):
         self.resultado = ResultadoCalculo("EAD (m)")
         yield self.resultado
 
-    def on_input_changed(self, event: Input.Changed) -> None:
-        """Calcula el nuevo resultado cuando cambia un input."""
-        try:
-            valor1 = float(self.input1.input.value) if self.input1.input.value else 0
-            valor2 = float(self.input2.input.value) if self.input2.input.value else 0
-        except ValueError:
-            valor1 = valor2 = 0  # Si hay un valor no numérico
-        d = DepthConverter.for_salt_water(0) # Agua del mar
-        n = NitroxCalculator(d)
-        try:
-            mod = n.ead(valor2, valor1)
-        except (ZeroDivisionError, ValueError):
-            mod = 0
-        self.resultado.resultado = mod  # Actualiza el resultado
-
 
 
 class BEST_MIX(CajaCalculos):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(lambda valor1, valor2: calculadora_nitrox.best_mix(valor2, valor1), *args, **kwargs)
+
     def compose(self) -> ComposeResult:
         with HorizontalGroup():
             self.input1 = FilaCalculo(label="Depth (m)", placeholder="25")
@@ -131,22 +204,10 @@ class BEST_MIX(CajaCalculos):
         self.resultado = ResultadoCalculo("BEST MIX (%)")
         yield self.resultado
 
-    def on_input_changed(self, event: Input.Changed) -> None:
-        """Calcula el nuevo resultado cuando cambia un input."""
-        try:
-            valor1 = float(self.input1.input.value) if self.input1.input.value else 0
-            valor2 = float(self.input2.input.value) if self.input2.input.value else 0
-        except ValueError:
-            valor1 = valor2 = 0  # Si hay un valor no numérico
-        d = DepthConverter.for_salt_water(0) # Agua del mar
-        n = NitroxCalculator(d)
-        try:
-            mod = n.best_mix(valor2, valor1)
-        except (ZeroDivisionError, ValueError):
-            mod = 0
-        self.resultado.resultado = mod  # Actualiza el resultado
-
 class PARTIAL_PRESSURE(CajaCalculos):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(lambda valor1, valor2: calculadora_nitrox.partial_pressure(valor2, valor1), *args, **kwargs)
+
     def compose(self) -> ComposeResult:
         with HorizontalGroup():
             self.input1 = FilaCalculo(label="Depth (m)", placeholder="25")
@@ -156,21 +217,6 @@ class PARTIAL_PRESSURE(CajaCalculos):
         self.resultado = ResultadoCalculo("PARTIAL PRESSURE (%)")
         yield self.resultado
 
-    def on_input_changed(self, event: Input.Changed) -> None:
-        """Calcula el nuevo resultado cuando cambia un input."""
-        try:
-            valor1 = float(self.input1.input.value) if self.input1.input.value else 0
-            valor2 = float(self.input2.input.value) if self.input2.input.value else 0
-        except ValueError:
-            valor1 = valor2 = 0  # Si hay un valor no numérico
-        d = DepthConverter.for_salt_water(0) # Agua del mar
-        n = NitroxCalculator(d)
-        try:
-            mod = n.partial_pressure(valor2, valor1)
-        except (ZeroDivisionError, ValueError):
-            mod = 0
-        self.resultado.resultado = mod  # Actualiza el resultado
-
 
 
 class CalculatorScreen(Screen):
@@ -181,7 +227,7 @@ class CalculatorScreen(Screen):
                 yield (ead := EAD())
                 yield (best_mix := BEST_MIX())
                 yield (partial_pressure := PARTIAL_PRESSURE())
-            yield (teoria := Teoria("theory/mod.md", id="teoria"))
+            yield (teoria := Teoria("mod", id="teoria"))
         mod.border_title = "MOD"
         ead.border_title = "EAD"
         best_mix.border_title = "BEST MIX"
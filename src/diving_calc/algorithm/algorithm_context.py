@@ -0,0 +1,135 @@
+from typing import NamedTuple
+from diving_calc.algorithm.gradient_factors import SubSurfaceGradientFactors
+from diving_calc.algorithm.options import Options
+from diving_calc.algorithm.tissues import LoadSegment, Tissues
+from diving_calc.depths.depth_levels import DepthLevels
+from diving_calc.depths.segments import Segment, Segments
+from diving_calc.depths.speeds import AscentSpeeds
+from diving_calc.gases.gases import Gases, OCGasSource
+from diving_calc.gases.standard_gases import Gas
+from diving_calc.physics.depth_converter import DepthConverter
+from diving_calc.physics.time import Time
+
+
+class ContextMemento(NamedTuple):
+    tissues: Tissues
+    segments: int
+    run_time: float
+    lowest_ceiling: float
+
+
+class PlanPrefix(NamedTuple):
+    """Tissues loaded by first planned segments, allows to continue the plan without loading them again."""
+    # count of the planned segments already loaded
+    segments: int
+    tissues: Tissues
+    # in seconds
+    run_time: float
+
+
+class AlgorithmContext:
+    def __init__(self, gases: Gases, segments: Segments, options: Options,
+                 depth_converter: DepthConverter, tissues: Tissues):
+        """
+        Mutable state of the decompression calculation.
+
+        :param gases: Gases available during the dive.
+        :param segments: Segments to be extended by the ascent, the instance is modified.
+        :param options: Calculation options.
+        :param depth_converter: Converter matching the options salinity and altitude.
+        :param tissues: Tissues at start of the dive, the instance is modified.
+        """
+        self.gases = gases
+        self.segments = segments
+        self.options = options
+        self.depth_converter = depth_converter
+        self.tissues = tissues
+        # in seconds
+        self.run_time = 0
+        # count of all tissue updates including the ones reverted by restore
+        self.tissue_loads = 0
+        self.current_gas: Gas = segments.last().gas
+        self.gradients = SubSurfaceGradientFactors(depth_converter, options, tissues)
+        self.speeds = AscentSpeeds(options)
+        self.levels = DepthLevels(depth_converter, options)
+        self.gas_source = OCGasSource(gases, options)
+
+    @property
+    def current_depth(self) -> float:
+        """Gets depth in meters at end of last segment."""
+        return self.segments.current_depth
+
+    @property
+    def ascent_speed(self) -> float:
+        """Ascent speed in meters/minute at current depth."""
+        return self.speeds.ascent(self.current_depth)
+
+    @property
+    def add_safety_stop(self) -> bool:
+        return self.levels.add_safety_stop(self.current_depth, self.segments.max_depth)
+
+    @property
+    def deco_stop_duration(self) -> float:
+        """Smallest step of the deco stop duration in seconds."""
+        return Time.ONE_MINUTE if self.options.round_stops_to_minutes else Time.ONE_SECOND
+
+    @property
+    def is_at_surface(self) -> bool:
+        return self.segments.last().end_depth == 0
+
+    def mark_average_depth(self) -> None:
+        """Use just before calculating ascent to be able calculate correct speeds."""
+        self.speeds.mark_average_depth(self.segments)
+
+    def ceiling(self) -> float:
+        """Current ceiling in meters."""
+        return self.gradients.ceiling()
+
+    def ceiling_at_surface(self) -> bool:
+        """True if the diver can ascent directly to the surface."""
+        return self.ceiling() <= 0
+
+    def next_stop(self, current_stop: float) -> float:
+        return self.levels.next_stop(current_stop)
+
+    def best_deco_gas(self) -> Gas:
+        return self.gas_source.best_gas(self.current_depth, self.current_gas)
+
+    def should_switch_to(self, new_gas: Gas) -> bool:
+        return new_gas is not None and not self.current_gas.composition_equals(new_gas)
+
+    def load_tissues(self, segment: Segment) -> float:
+        """Loads tissues by the whole segment at once, returns the load change in bars."""
+        if segment.duration <= 0:
+            return 0
+
+        load_segment = self.to_load_segment(segment)
+        self.run_time += segment.duration
+        self.tissue_loads += 1
+        return self.tissues.load(load_segment, segment.gas)
+
+    def to_load_segment(self, segment: Segment) -> LoadSegment:
+        converter = self.depth_converter
+        # because surface pressure was added during the conversion
+        speed = converter.to_bar(segment.speed) - converter.surface_pressure
+        return LoadSegment(converter.to_bar(segment.start_depth), segment.duration, speed)
+
+    def create_memento(self) -> ContextMemento:
+        return ContextMemento(self.tissues.copy(), len(self.segments), self.run_time, self.gradients.lowest_ceiling)
+
+    def restore(self, memento: ContextMemento) -> None:
+        self.tissues.restore_from(memento.tissues)
+        self.gradients.lowest_ceiling = memento.lowest_ceiling
+        self.run_time = memento.run_time
+        # segments are only added
+        self.segments.cut_down(len(self.segments) - memento.segments)
+
+    def add_ascent_segment(self, next_stop: float, duration: float) -> Segment:
+        return self.segments.add(next_stop, self.current_gas, duration)
+
+    def add_gas_switch_segment(self) -> Segment:
+        duration = self.options.gas_switch_duration * Time.ONE_MINUTE
+        return self.add_stop_segment(duration)
+
+    def add_stop_segment(self, duration: float) -> Segment:
+        return self.segments.add_flat(self.current_gas, duration)
@@ -0,0 +1,202 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Collection, Deque, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+from diving_calc.algorithm.buhlmann_algorithm import AlgorithmParams, duration_for
+from diving_calc.algorithm.options import Options
+from diving_calc.algorithm.plan_cache import PlanCache
+from diving_calc.depths.segments import Segments
+from diving_calc.gases.gas_mixtures import GasMixtures
+from diving_calc.gases.gases import Gases
+from diving_calc.gases.standard_gases import StandardGases
+from diving_calc.physics.depth_converter import DepthConverterFactory
+from diving_calc.physics.time import Time
+
+
+class PlanTask(NamedTuple):
+    """One cell of the dive table."""
+    # position in the grid, used to keep the order and to resume interrupted batch
+    index: int
+    # in meters
+    depth: float
+    # in minutes since start of the descent till start of the ascent
+    bottom_time: float
+    # name of the standard gas
+    gas: str
+
+
+class PlanRow(NamedTuple):
+    """Result of one dive table cell, all times in minutes."""
+    index: int
+    depth: float
+    bottom_time: float
+    gas: str
+    runtime: float = 0
+    # time spent at stops during the ascent, including safety stop
+    deco: float = 0
+    # in liters at surface pressure
+    gas_use: float = 0
+    # empty if the plan was calculated
+    error: str = ''
+
+
+class PlanGrid:
+    def __init__(self, depths: Sequence[float], bottom_times: Sequence[float], gases: Sequence[str]):
+        """
+        Dive table definition, each depth is planned for each bottom time and each gas.
+
+        :param depths: Depths in meters.
+        :param bottom_times: Bottom times in minutes.
+        :param gases: Names of standard gases.
+        """
+        unknown = [name for name in gases if StandardGases.by_name(name) is None]
+        if unknown:
+            raise ValueError(f"Unknown gases: {', '.join(unknown)}")
+
+        self.depths = list(depths)
+        self.bottom_times = list(bottom_times)
+        self.gases = list(gases)
+
+    @staticmethod
+    def standard(bottom_times: Sequence[float], min_depth: float = 3, max_depth: float = 60,
+                 depth_step: float = 3) -> "PlanGrid":
+        """Creates grid of all standard gases for depths in steps from min to max depth in meters."""
+        count = int((max_depth - min_depth) // depth_step) + 1
+        depths = [min_depth + depth_step * index for index in range(count)]
+        return PlanGrid(depths, bottom_times, StandardGases.all_names())
+
+    def __len__(self) -> int:
+        return len(self.depths) * len(self.bottom_times) * len(self.gases)
+
+    def tasks(self) -> Iterator[PlanTask]:
+        """Enumerates the cells ordered by gas, depth and bottom time, so consecutive plans share their descent."""
+        index = 0
+        for gas in self.gases:
+            for depth in self.depths:
+                for bottom_time in self.bottom_times:
+                    yield PlanTask(index, depth, bottom_time, gas)
+                    index += 1
+
+
+class TablePlanner:
+    def __init__(self, options: Options, sac: float = 20):
+        """
+        Plans single gas square profiles of the dive table in current process.
+
+        :param options: Options used for all plans.
+        :param sac: Surface air consumption in liters/minute used to calculate the gas use.
+        """
+        self.options = options
+        self.sac = sac
+        self.depth_converter = DepthConverterFactory(options).create()
+        # plans of the same depth differ only by the last segment, so only the descent is reused
+        self.cache = PlanCache(maxsize=16)
+
+    def plan(self, task: PlanTask) -> PlanRow:
+        gas = StandardGases.by_name(task.gas)
+        error = self._validate(task, gas)
+
+        if error:
+            return PlanRow(task.index, task.depth, task.bottom_time, task.gas, error=error)
+
+        descent = duration_for(task.depth, self.options.descent_speed)
+        segments = Segments()
+        segments.add(task.depth, gas, descent)
+        segments.add_flat(gas, Time.to_seconds(task.bottom_time) - descent)
+        params = AlgorithmParams(segments, Gases(gas), self.options)
+        profile = self.cache.decompression(params)
+
+        if not profile.was_calculated:
+            return PlanRow(task.index, task.depth, task.bottom_time, task.gas, error=profile.errors[0].message)
+
+        ascent = profile.segments[len(segments):]
+        deco = sum(segment.duration for segment in ascent if segment.speed == 0)
+        runtime = sum(segment.duration for segment in profile.segments)
+        gas_use = sum(Time.to_minutes(segment.duration) * self.depth_converter.to_bar(segment.average_depth)
+                      for segment in profile.segments) * self.sac
+        return PlanRow(task.index, task.depth, task.bottom_time, task.gas,
+                       Time.to_minutes(runtime), Time.to_minutes(deco), gas_use)
+
+    def _validate(self, task: PlanTask, gas) -> str:
+        bars = self.depth_converter.to_bar(task.depth)
+        if bars > GasMixtures.mod(self.options.max_ppO2, gas.o2_fraction) or \
+                bars < GasMixtures.ceiling(gas.o2_fraction, self.depth_converter.surface_pressure):
+            return 'Gas is not breathable at depth.'
+
+        if Time.to_seconds(task.bottom_time) < duration_for(task.depth, self.options.descent_speed):
+            return 'Bottom time is shorter than descent.'
+
+        return ''
+
+
+# planner of the worker process, created once per process by the pool initializer
+_worker_planner: Optional[TablePlanner] = None
+
+
+def _init_worker(options: Options, sac: float) -> None:
+    global _worker_planner
+    _worker_planner = TablePlanner(options, sac)
+
+
+def _plan_chunk(chunk: List[PlanTask]) -> List[PlanRow]:
+    return [_worker_planner.plan(task) for task in chunk]
+
+
+class BatchPlanner:
+    def __init__(self, options: Options, workers: Optional[int] = None, chunk_size: int = 32, sac: float = 20):
+        """
+        Plans dive tables spread across process pool.
+
+        :param options: Options used for all plans.
+        :param workers: Count of processes, by default count of CPUs. Single worker plans in current process.
+        :param chunk_size: Count of plans sent to a process at once, larger chunks reduce the transfer overhead.
+        :param sac: Surface air consumption in liters/minute used to calculate the gas use.
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk needs to contain at least one plan.")
+
+        self.options = options
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.sac = sac
+
+    def plan(self, grid: PlanGrid, completed: Collection[int] = ()) -> Iterator[PlanRow]:
+        """
+        Yields rows ordered by the task index as soon as all previous rows are available.
+
+        :param grid: Dive table definition.
+        :param completed: Indexes of tasks already planned by interrupted batch, these are skipped.
+        """
+        completed = frozenset(completed)
+        tasks = (task for task in grid.tasks() if task.index not in completed)
+        chunks = BatchPlanner.chunks(tasks, self.chunk_size)
+
+        if self.workers == 1:
+            planner = TablePlanner(self.options, self.sac)
+            for chunk in chunks:
+                yield from (planner.plan(task) for task in chunk)
+            return
+
+        pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.options, self.sac))
+        # only few chunks per worker are in flight, so interrupted batch doesn't wait for the whole grid
+        in_flight = self.workers * 2
+        pending: Deque[Future] = deque()
+
+        try:
+            for chunk in chunks:
+                pending.append(pool.submit(_plan_chunk, chunk))
+
+                if len(pending) >= in_flight:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    @staticmethod
+    def chunks(tasks: Iterable[PlanTask], chunk_size: int) -> Iterator[List[PlanTask]]:
+        iterator = iter(tasks)
+        while chunk := list(islice(iterator, chunk_size)):
+            yield chunk
@@ -0,0 +1,359 @@
+import math
+from typing import List, Optional
+from diving_calc.algorithm.algorithm_context import AlgorithmContext, ContextMemento, PlanPrefix
+from diving_calc.algorithm.calculated_profile import CalculatedProfile, Event
+from diving_calc.algorithm.no_deco_limit import ClosedFormNoDecoLimit, NoDecoLimit
+from diving_calc.algorithm.options import Options
+from diving_calc.algorithm.tissues import Tissues
+from diving_calc.common.binary_interval_search import BinaryIntervalSearch, SearchContext
+from diving_calc.common.precision import Precision
+from diving_calc.depths.compact_profile import CompactProfile
+from diving_calc.depths.segments import Segment, Segments
+from diving_calc.gases.gases import Gases
+from diving_calc.gases.standard_gases import Gas
+from diving_calc.physics.depth_converter import DepthConverterFactory
+from diving_calc.physics.time import Time
+
+
+def duration_for(depth_difference: float, speed: float) -> float:
+    """Returns duration in seconds to swim the depth difference in meters at speed in meters/minute."""
+    meters_per_second = Time.to_minutes(speed)
+    return depth_difference / meters_per_second
+
+
+class AlgorithmParams:
+    def __init__(self, segments: Segments, gases: Gases, options: Options, tissues: Optional[Tissues] = None,
+                 surface_interval: float = 0):
+        """
+        Dive definition used as input of the algorithm.
+
+        :param segments: Already realized part of the dive.
+        :param gases: Gases used during the dive and additional gases to be considered during decompression ascent.
+        :param options: Conservatism and environment options.
+        :param tissues: Tissues at end of previous dive or at start of the dive,
+            None for first dive saturated at options altitude.
+        :param surface_interval: Duration in seconds of rest at options altitude applied to the tissues
+            before the dive, infinity for first dive. Ignored, if no tissues are provided.
+        """
+        self.segments = segments
+        self.gases = gases
+        self.options = options
+        self.tissues = tissues
+        self.surface_interval = surface_interval
+
+    @staticmethod
+    def for_simple_dive(depth: float, gas: Gas, options: Options, tissues: Optional[Tissues] = None,
+                        surface_interval: float = 0) -> "AlgorithmParams":
+        """Creates parameters of descent to the depth in meters using the only gas."""
+        segments = Segments()
+        segments.add(depth, gas, duration_for(depth, options.descent_speed))
+        return AlgorithmParams(segments, Gases(gas), options, tissues, surface_interval)
+
+    @staticmethod
+    def for_multilevel_dive(segments: Segments, gases: Gases, options: Options, tissues: Optional[Tissues] = None,
+                            surface_interval: float = 0) -> "AlgorithmParams":
+        return AlgorithmParams(segments, gases, options, tissues, surface_interval)
+
+    @staticmethod
+    def for_compact_profile(profile: CompactProfile, gases: Gases, options: Options, tissues: Optional[Tissues] = None,
+                            surface_interval: float = 0) -> "AlgorithmParams":
+        """
+        Creates parameters of the planned segments stored in compact profile, which is kept unchanged.
+        The planned segments are converted to Segment objects once, because the algorithm appends the ascent to them
+        and returns them in the calculated profile. Use the compact profile for the repeated queries instead,
+        e.g. CNS, OTU or log replay, which read its arrays directly.
+        """
+        segments = Segments.from_collection(profile.to_segments())
+        return AlgorithmParams(segments, gases, options, tissues, surface_interval)
+
+    def start_tissues(self) -> Tissues:
+        """Returns new copy of tissues at start of the dive, after the surface interval."""
+        if self.tissues is not None:
+            return BuhlmannAlgorithm.apply_surface_interval(self.tissues, self.options.altitude, self.surface_interval)
+
+        return Tissues.create_at(self.options.altitude)
+
+
+class BuhlmannAlgorithm:
+    """
+    Buhlmann ZHL-16C decompression algorithm with gradient factors.
+    Tissues are loaded by whole segments at once, because Schreiner equation is exact for linear depth change.
+    """
+
+    @staticmethod
+    def apply_surface_interval(tissues: Tissues, altitude: float, surface_interval: float) -> Tissues:
+        """
+        Takes tissues at end of the dive and applies the surface interval,
+        which simulates diver resting at surface and breathing air.
+
+        :param tissues: Tissues at end of previous dive, kept unchanged.
+        :param altitude: Altitude in meters above sea level, at which the diver rests, usually of the following dive.
+        :param surface_interval: Duration of the rest in seconds, infinity for fully saturated tissues.
+        :return: New tissues at end of the surface interval.
+        """
+        if altitude < 0:
+            raise ValueError('Altitude needs to be positive number or 0.')
+
+        if surface_interval < 0:
+            raise ValueError('Surface interval needs to be positive number or 0.')
+
+        rested = tissues.copy()
+        if surface_interval > 0:
+            rested.rest(Tissues.surface_pressure_at(altitude), surface_interval)
+        return rested
+
+    def no_deco_limit(self, params: AlgorithmParams) -> float:
+        """
+        Calculates no decompression limit in minutes.
+        Returns positive number or infinity, in case there is no more tissues loading
+        usually at small depths (below 10 meters).
+        """
+        return self.no_deco_limit_result(params).minutes
+
+    def no_deco_limit_result(self, params: AlgorithmParams) -> NoDecoLimit:
+        """Calculates no decompression limit including count of tissue loads needed to find it."""
+        if self.validate(params.segments, params.gases):
+            return NoDecoLimit(0, 0, False)
+
+        depth_converter = DepthConverterFactory(params.options).create()
+        context = AlgorithmContext(params.gases, params.segments.copy(), params.options,
+                                   depth_converter, params.start_tissues())
+        current_ndl = self._swim_no_deco_limit(context)
+
+        if current_ndl is not None:
+            return NoDecoLimit(current_ndl, context.tissue_loads, False)
+
+        return self._predict_no_deco_limit(context)
+
+    def decompression(self, params: AlgorithmParams, prefix: Optional[PlanPrefix] = None,
+                      snapshots: Optional[List[PlanPrefix]] = None) -> CalculatedProfile:
+        """
+        Calculates decompression, generates missing ascent for the planned profile.
+
+        :param params: Dive definition.
+        :param prefix: Optional tissues already loaded by first planned segments of the same dive.
+        :param snapshots: Optional list filled by tissues after each planned segment loaded by this call.
+        :return: Merged planned and calculated segments with final tissues, or errors if the plan isn't valid.
+        """
+        segments = params.segments
+        new_segments = segments.copy()
+        errors = self.validate(segments, params.gases)
+
+        if errors:
+            return CalculatedProfile.from_errors(new_segments.items, errors)
+
+        depth_converter = DepthConverterFactory(params.options).create()
+        context = AlgorithmContext(params.gases, new_segments, params.options, depth_converter, params.start_tissues())
+        self.swim_plan(context, prefix, snapshots)
+        context.mark_average_depth()
+        next_stop = context.next_stop(context.current_depth)
+
+        # we don't iterate each second, only by deco stop distance steps where the changes happen
+        while next_stop >= 0 and not context.is_at_surface:
+            # multiple gas switches may happen before first deco stop
+            self._try_gas_switch(context)
+            self._stay_at_deco_stop(context, next_stop)
+            self._stay_at_safety_stop(context)
+            self._ascent_to_next_stop(context, next_stop)
+            next_stop = context.next_stop(next_stop)
+
+        merged = context.segments.merge_flat(len(segments))
+        return CalculatedProfile.from_profile(merged, context.tissues, context.tissue_loads)
+
+    def validate(self, segments: Segments, gases: Gases) -> List[Event]:
+        """Returns errors which prevent the calculation, empty list if the dive is valid."""
+        if not segments.any():
+            return [Event.create_error('There needs to be at least one segment at depth.')]
+
+        errors = []
+        for segment in segments.items:
+            if not gases.is_registered(segment.gas):
+                message = f'Segment {segment.start_depth}-{segment.end_depth} has gas not registered in gases.'
+                errors.append(Event.create_error(message))
+
+        if errors:
+            return errors
+
+        if not gases.has_bottom_gas:
+            return [Event.create_error('At least one bottom gas has to be defined.')]
+
+        return []
+
+    def swim_plan(self, context: AlgorithmContext, prefix: Optional[PlanPrefix] = None,
+                  snapshots: Optional[List[PlanPrefix]] = None) -> None:
+        """Loads tissues by planned segments, skips the ones already covered by the prefix."""
+        items = context.segments.items
+        start = 0
+
+        if prefix is not None:
+            context.tissues.restore_from(prefix.tissues)
+            context.run_time = prefix.run_time
+            start = prefix.segments
+
+        for index in range(start, len(items)):
+            context.load_tissues(items[index])
+
+            if snapshots is not None:
+                snapshots.append(PlanPrefix(index + 1, context.tissues.copy(), context.run_time))
+
+    def _try_gas_switch(self, context: AlgorithmContext) -> None:
+        new_gas = context.best_deco_gas()
+
+        if context.should_switch_to(new_gas):
+            context.current_gas = new_gas
+            stop = context.add_gas_switch_segment()
+            context.load_tissues(stop)
+
+    def _stay_at_deco_stop(self, context: AlgorithmContext, next_stop: float) -> None:
+        if not self._needs_deco_stop(context, next_stop):
+            return
+
+        memento = context.create_memento()
+        # searching in steps of the rounding, so no additional rounding is needed
+        step = context.deco_stop_duration
+        search_context = SearchContext(
+            # most of the stops take only few minutes, longer stops are found by halving
+            estimation_step=4 * Time.ONE_MINUTE // step,
+            initial_value=0,
+            # max stop duration was chosen as one day which may not be enough for saturation divers
+            max_value=Time.ONE_DAY // step,
+            meets_condition=lambda steps: self._needs_longer_stop(context, memento, next_stop, steps * step)
+        )
+        # the search returns the last step, where the stop isn't long enough yet
+        stop_steps = BinaryIntervalSearch().search(search_context) + 1
+        self._swim_deco_stop(context, memento, stop_steps * step)
+
+    def _needs_longer_stop(self, context: AlgorithmContext, memento: ContextMemento,
+                           next_stop: float, stop_duration: float) -> bool:
+        self._swim_deco_stop(context, memento, stop_duration)
+        return self._needs_deco_stop(context, next_stop)
+
+    def _swim_deco_stop(self, context: AlgorithmContext, memento: ContextMemento, stop_duration: float) -> None:
+        context.restore(memento)
+        self._swim_stop_duration(context, stop_duration)
+
+    def _stay_at_safety_stop(self, context: AlgorithmContext) -> None:
+        if context.add_safety_stop:
+            self._swim_stop_duration(context, Time.SAFETY_STOP_DURATION)
+
+    def _swim_stop_duration(self, context: AlgorithmContext, stop_duration: float) -> None:
+        stop = context.add_stop_segment(stop_duration)
+        context.load_tissues(stop)
+
+    def _needs_deco_stop(self, context: AlgorithmContext, next_stop: float) -> bool:
+        """There is no better option than to try, since we can't predict the tissues loading."""
+        if next_stop >= context.ceiling():
+            return False
+
+        # only in case the offgasing is faster than ascent to next stop
+        memento = context.create_memento()
+        self._ascent_to_next_stop(context, next_stop)
+        result = next_stop < context.ceiling()
+        context.restore(memento)
+        return result
+
+    def _ascent_to_next_stop(self, context: AlgorithmContext, next_stop: float) -> None:
+        depth_difference = context.current_depth - next_stop
+        duration = duration_for(depth_difference, context.ascent_speed)
+        ascent = context.add_ascent_segment(next_stop, duration)
+        context.load_tissues(ascent)
+
+    def _swim_no_deco_limit(self, context: AlgorithmContext) -> Optional[float]:
+        """
+        Swims the planned profile, returns no decompression limit in minutes,
+        if it was already reached by the plan, otherwise None.
+        Only end of each segment is checked, the ceiling doesn't decrease while ongasing.
+        """
+        for segment in context.segments.items:
+            memento = context.create_memento()
+            context.load_tissues(segment)
+
+            if not context.ceiling_at_surface():
+                seconds = self._search_limit_in_segment(context, memento, segment)
+                # samples are taken each whole minute of the dive
+                minutes = Precision.ceil(Time.to_minutes(memento.run_time + seconds))
+                return minutes - 1
+
+        return None
+
+    def _search_limit_in_segment(self, context: AlgorithmContext, memento: ContextMemento, segment: Segment) -> int:
+        """Returns first second since segment start, at which the ceiling isn't at surface."""
+        duration = math.ceil(segment.duration)
+
+        def at_surface(seconds: int) -> bool:
+            context.restore(memento)
+            part = Segment(segment.start_depth, segment.depth_at(seconds), segment.gas, seconds)
+            context.load_tissues(part)
+            return context.ceiling_at_surface()
+
+        if duration == 0:
+            return 0
+
+        # the limit is somewhere inside the segment, so only few estimation steps are needed
+        search_context = SearchContext(max(duration // 8, 1), 0, duration, at_surface)
+        return BinaryIntervalSearch().search(search_context) + 1
+
+    def _predict_no_deco_limit(self, context: AlgorithmContext) -> NoDecoLimit:
+        last = context.segments.last()
+
+        if last.end_depth == 0:
+            return NoDecoLimit(math.inf, context.tissue_loads, False)
+
+        memento = context.create_memento()
+        minutes = self._closed_form_hover(context, memento, last)
+        closed_form = minutes is not None
+
+        if not closed_form:
+            minutes = self._search_hover(context, memento, last)
+
+        if minutes == math.inf:
+            return NoDecoLimit(math.inf, context.tissue_loads, closed_form)
+
+        run_time = memento.run_time + minutes * Time.ONE_MINUTE
+        # We went one minute past a ceiling of "0"
+        ndl = Precision.floor(Time.to_minutes(run_time)) - 1
+        return NoDecoLimit(ndl, context.tissue_loads, closed_form)
+
+    def _closed_form_hover(self, context: AlgorithmContext, memento: ContextMemento, last: Segment) -> Optional[float]:
+        """Returns first whole minute of hovering with ceiling below surface, None if not solvable analytically."""
+        converter = context.depth_converter
+        seconds = ClosedFormNoDecoLimit.time_to_surface_ceiling(context.tissues, last.gas, converter.to_bar(last.end_depth),
+                                                                converter.surface_pressure, context.options.gf_high)
+        if seconds is None or seconds == math.inf:
+            return seconds
+
+        minutes = math.floor(Time.to_minutes(seconds)) + 1
+
+        if minutes > Time.ONE_DAY // Time.ONE_MINUTE:
+            return math.inf
+
+        # rounding of the exact time may cause one minute difference, verified using the same ceiling as the search
+        if self._hover(context, memento, last, minutes - 1) and not self._hover(context, memento, last, minutes):
+            return minutes
+
+        return None
+
+    def _search_hover(self, context: AlgorithmContext, memento: ContextMemento, last: Segment) -> float:
+        """Returns first whole minute of hovering with ceiling below surface, infinity if not reached within one day."""
+        max_minutes = Time.ONE_DAY // Time.ONE_MINUTE
+        search_context = SearchContext(
+            estimation_step=10,
+            initial_value=0,
+            max_value=max_minutes,
+            meets_condition=lambda minutes: self._hover(context, memento, last, minutes)
+        )
+        minutes = BinaryIntervalSearch().search(search_context)
+
+        # the search returns only values meeting the condition, so the whole day of hovering is still no deco
+        if minutes >= max_minutes:
+            return math.inf
+
+        return minutes + 1
+
+    def _hover(self, context: AlgorithmContext, memento: ContextMemento, last: Segment, minutes: float) -> bool:
+        """Stays at end of the last segment from the memento for given minutes, returns True if still no deco."""
+        context.restore(memento)
+        depth = last.end_depth
+        hover = Segment(depth, depth, last.gas, minutes * Time.ONE_MINUTE)
+        context.load_tissues(hover)
+        return context.ceiling_at_surface()
@@ -0,0 +1,98 @@
+from typing import List, Optional
+from diving_calc.algorithm.tissues import Tissues
+from diving_calc.depths.segments import Segment
+from diving_calc.gases.standard_gases import Gas
+
+
+class EventType:
+    NO_ACTION = 0
+    # Generic error which prevents algorithm calculation
+    ERROR = 1
+    # Gas switch happened at this moment
+    GAS_SWITCH = 2
+    # At this moment, diver reached end of no deco limit
+    NO_DECO_END = 3
+    # When breathing gas at this depth, it leads to Hypoxia
+    LOW_PPO2 = 4
+    # Breathing gas with high ppO2 can lead to oxygen toxicity
+    HIGH_PPO2 = 5
+    # High ascent speed can lead to decompression sickness
+    HIGH_ASCENT_SPEED = 6
+    # High descent speed can lead to uncontrolled falls to the bottom or reaching higher depth than expected
+    HIGH_DESCENT_SPEED = 7
+    # User defined segments may cross the ceiling
+    BROKEN_CEILING = 8
+    # Gas used at the depth exceeds the maximum narcotic depth
+    MAX_END_EXCEEDED = 9
+    # User switched to gas with higher N2 content (isobaric counter diffusion - ICD)
+    ISOBARIC_COUNTER_DIFFUSION = 10
+    # Exceeded maximum gas density at depth
+    HIGH_GAS_DENSITY = 11
+    # Marks start of additional safety stop
+    SAFETY_STOP = 12
+    # Algorithm is used in shallow depths bellow 9 meters with long exposure which may lead to saturation diving
+    MIN_DEPTH = 13
+    # Algorithm is used in depths higher than 120 meters, where the algorithm wasn't tested enough
+    MAX_DEPTH = 14
+    # Unable to switch to bottom gas, in case of generating air breaks
+    MISSING_AIR_BREAK = 15
+
+
+class Event:
+    def __init__(self, time_stamp: float, depth: float, type: int, message: str = '', gas: Optional[Gas] = None):
+        """
+        Something what happened during the dive.
+
+        :param time_stamp: Number of seconds since dive begin the event occurred.
+        :param depth: Depth in meters, at which the diver was, when the event occurred.
+        :param type: One of EventType values.
+        :param message: Optional explanation of the event.
+        :param gas: Optional gas associated with the event.
+        """
+        self.time_stamp = time_stamp
+        self.depth = depth
+        self.type = type
+        self.message = message
+        self.gas = gas
+
+    @staticmethod
+    def create_error(message: str) -> "Event":
+        return Event(0, 0, EventType.ERROR, message)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Event) and self.time_stamp == other.time_stamp and self.depth == other.depth and \
+            self.type == other.type and self.message == other.message and self.gas == other.gas
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'Event({self.type}, {self.time_stamp} s, {self.depth} m, {self.message!r})'
+
+
+class CalculatedProfile:
+    def __init__(self, segments: List[Segment], tissues: Optional[Tissues] = None,
+                 errors: Optional[List[Event]] = None, tissue_loads: int = 0):
+        """
+        Result of the decompression calculation.
+
+        :param segments: Planned segments followed by calculated ascent.
+        :param tissues: Tissues loading at end of the dive, None if the profile wasn't calculated.
+        :param errors: Errors which prevented the calculation.
+        :param tissue_loads: Count of tissue updates needed to calculate the profile.
+        """
+        self.segments = segments
+        self.tissues = tissues
+        self.errors = errors or []
+        self.tissue_loads = tissue_loads
+
+    @property
+    def was_calculated(self) -> bool:
+        return self.tissues is not None and not self.errors
+
+    @staticmethod
+    def from_profile(segments: List[Segment], tissues: Tissues, tissue_loads: int = 0) -> "CalculatedProfile":
+        return CalculatedProfile(segments, tissues, tissue_loads=tissue_loads)
+
+    @staticmethod
+    def from_errors(segments: List[Segment], errors: List[Event]) -> "CalculatedProfile":
+        return CalculatedProfile(segments, None, errors)
@@ -0,0 +1,56 @@
+import numpy as np
+
+
+def _frozen(values) -> np.ndarray:
+    result = np.array(values, dtype=np.float64)
+    result.flags.writeable = False
+    return result
+
+
+class Compartments:
+    """
+    Buhlmann ZHL-16C coefficients stored as contiguous arrays, one item per compartment ordered by half time.
+    Compartment 1 was replaced by 1b, values verified by Subsurface.
+    Version A (not conservative) nor B (for tables) are not implemented.
+    """
+    COUNT = 16
+
+    # (N2 half time [min], N2 a, N2 b, He half time [min], He a, He b)
+    buhlmann_zhl16c = (
+        (5.0, 1.1696, 0.5578, 1.88, 1.6189, 0.4770),
+        (8.0, 1.0000, 0.6514, 3.02, 1.3830, 0.5747),
+        (12.5, 0.8618, 0.7222, 4.72, 1.1919, 0.6527),
+        (18.5, 0.7562, 0.7826, 6.99, 1.0458, 0.7223),
+        (27.0, 0.62, 0.8125, 10.21, 0.9220, 0.7582),
+        (38.3, 0.5043, 0.8434, 14.48, 0.8205, 0.7957),
+        (54.3, 0.441, 0.8693, 20.53, 0.7305, 0.8279),
+        (77.0, 0.4, 0.8910, 29.11, 0.6502, 0.8553),
+        (109.0, 0.375, 0.9092, 41.20, 0.5950, 0.8757),
+        (146.0, 0.35, 0.9222, 55.19, 0.5545, 0.8903),
+        (187.0, 0.3295, 0.9319, 70.69, 0.5333, 0.8997),
+        (239.0, 0.3065, 0.9403, 90.34, 0.5189, 0.9073),
+        (305.0, 0.2835, 0.9477, 115.29, 0.5181, 0.9122),
+        (390.0, 0.261, 0.9544, 147.42, 0.5176, 0.9171),
+        (498.0, 0.248, 0.9602, 188.24, 0.5172, 0.9217),
+        (635.0, 0.2327, 0.9653, 240.03, 0.5119, 0.9267),
+    )
+
+    _columns = np.array(buhlmann_zhl16c, dtype=np.float64).T
+    N2_HALF_TIMES = _frozen(_columns[0])
+    N2_A = _frozen(_columns[1])
+    N2_B = _frozen(_columns[2])
+    HE_HALF_TIMES = _frozen(_columns[3])
+    HE_A = _frozen(_columns[4])
+    HE_B = _frozen(_columns[5])
+
+    # Math.log(2) / 60, half times are in minutes while durations in seconds
+    LOG2_60 = 1.155245301e-02
+    N2_RATES = _frozen(LOG2_60 / _columns[0])
+    HE_RATES = _frozen(LOG2_60 / _columns[3])
+
+    # Stacked nitrogen (row 0) and helium (row 1) values, so both gases are evaluated by one operation
+    A = _frozen(_columns[[1, 4]])
+    B = _frozen(_columns[[2, 5]])
+    RATES = _frozen(LOG2_60 / _columns[[0, 3]])
+    TIME_CONSTANTS = _frozen(_columns[[0, 3]] / LOG2_60)
+    del _columns
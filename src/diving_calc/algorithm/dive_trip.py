@@ -0,0 +1,60 @@
+import math
+from typing import Optional
+from diving_calc.algorithm.buhlmann_algorithm import AlgorithmParams, BuhlmannAlgorithm
+from diving_calc.algorithm.calculated_profile import CalculatedProfile
+from diving_calc.algorithm.options import Options
+from diving_calc.algorithm.tissues import Tissues
+from diving_calc.depths.segments import Segments
+from diving_calc.gases.gases import Gases
+
+
+class DiveTrip:
+    """
+    Repetitive dives of multi-day trip, each dive starts with tissues left by previous dives and surface intervals.
+    The only state carried between dives is the tissues loading, so it can be stored as snapshot and resumed later.
+    """
+
+    def __init__(self, tissues: Optional[Tissues] = None, algorithm: Optional[BuhlmannAlgorithm] = None):
+        """
+        :param tissues: Tissues at end of the last dive, None if the trip has no dive yet.
+        :param algorithm: Algorithm used to calculate the dives.
+        """
+        self.tissues = tissues
+        self.algorithm = algorithm or BuhlmannAlgorithm()
+
+    @staticmethod
+    def resume(snapshot: bytes, algorithm: Optional[BuhlmannAlgorithm] = None) -> "DiveTrip":
+        """Creates trip from snapshot created by DiveTrip.snapshot."""
+        tissues = Tissues.from_bytes(snapshot) if snapshot else None
+        return DiveTrip(tissues, algorithm)
+
+    def snapshot(self) -> bytes:
+        """Compact state of the trip, empty if the trip has no dive yet."""
+        return b'' if self.tissues is None else self.tissues.to_bytes()
+
+    def params(self, segments: Segments, gases: Gases, options: Options,
+               surface_interval: float = math.inf) -> AlgorithmParams:
+        """
+        Creates parameters of next dive.
+
+        :param surface_interval: Duration in seconds since end of the last dive, ignored for first dive.
+        """
+        return AlgorithmParams.for_multilevel_dive(segments, gases, options, self.tissues, surface_interval)
+
+    def dive(self, segments: Segments, gases: Gases, options: Options,
+             surface_interval: float = math.inf) -> CalculatedProfile:
+        """
+        Calculates next dive of the trip, tissues of the trip are updated only if the profile was calculated.
+
+        :param surface_interval: Duration in seconds since end of the last dive, ignored for first dive.
+        """
+        profile = self.algorithm.decompression(self.params(segments, gases, options, surface_interval))
+
+        if profile.was_calculated:
+            self.tissues = profile.tissues
+        return profile
+
+    def no_deco_limit(self, segments: Segments, gases: Gases, options: Options,
+                      surface_interval: float = math.inf) -> float:
+        """No decompression limit in minutes of next dive, the trip state isn't changed."""
+        return self.algorithm.no_deco_limit(self.params(segments, gases, options, surface_interval))
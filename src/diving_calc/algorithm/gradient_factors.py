@@ -0,0 +1,77 @@
+import numpy as np
+from diving_calc.algorithm.tissues import Tissues
+from diving_calc.physics.depth_converter import DepthConverter
+
+
+class SubSurfaceGradientFactors:
+    """
+    Calculation of gradient factors inspired by Subsurface (https://github.com/subsurface/subsurface),
+    this part needs to be under GNU General Public License v2.0.
+    Stops deeper, faster ceiling increase, higher total time.
+    """
+
+    def __init__(self, depth_converter: DepthConverter, options, tissues: Tissues):
+        """
+        :param depth_converter: Converter used to translate the ceiling pressure to depth.
+        :param options: Options defining gf_low and gf_high.
+        :param tissues: Tissues, which loading is evaluated.
+        """
+        self.depth_converter = depth_converter
+        self.options = options
+        self.tissues = tissues
+        # add 1 to compensate gradient low on start of the dive
+        self.lowest_ceiling = depth_converter.surface_pressure + 1
+
+    def ceiling(self) -> float:
+        """Gets current highest ceiling of all tissues in meters."""
+        bars = self.tolerated()
+
+        # less than surface pressure means no ceiling, this approximation is OK,
+        # because tissues are loaded only under water
+        if bars < self.depth_converter.surface_pressure:
+            bars = self.depth_converter.surface_pressure
+
+        return self.depth_converter.from_bar(bars)
+
+    def tolerated(self) -> float:
+        """Returns lowest value of tolerated pressure in bars, moves the lowest ceiling if needed."""
+        gf_low = self.options.gf_low
+        current_lowest_ceiling = self.tissues.ceiling(gf_low)
+
+        if current_lowest_ceiling > self.lowest_ceiling:
+            self.lowest_ceiling = current_lowest_ceiling
+
+        surface = self.depth_converter.surface_pressure
+        return SubSurfaceGradientFactors.tolerated_tissues(self.tissues, surface, self.lowest_ceiling,
+                                                           self.options.gf_high, gf_low)
+
+    @staticmethod
+    def tolerated_tissues(tissues: Tissues, surface: float, lowest_ceiling: float, gf_high: float, gf_low: float) -> float:
+        """
+        Returns lowest tolerated pressure in bars of all compartments at once.
+
+        :param tissues: Loaded tissues.
+        :param surface: Surface pressure in bars.
+        :param lowest_ceiling: Last known lowest ceiling in bars.
+        :param gf_high: Gradient factor high in range 0-1.
+        :param gf_low: Gradient factor low in range 0-1.
+        """
+        p_total, a, b = tissues.coefficients()
+        gf_difference = gf_high - gf_low
+        applies = (surface / b + a - surface) * gf_high + surface < \
+            (lowest_ceiling / b + a - lowest_ceiling) * gf_low + lowest_ceiling
+
+        if not applies.any():
+            return 0
+
+        a_b = a * b
+        one_minus_b = 1.0 - b
+        ceiling_distance = lowest_ceiling - surface
+        tolerated = (-a_b * (gf_high * lowest_ceiling - gf_low * surface) -
+                     one_minus_b * (gf_difference * lowest_ceiling * surface) +
+                     b * (ceiling_distance * p_total)) / \
+            (-a_b * gf_difference +
+             one_minus_b * (gf_low * lowest_ceiling - gf_high * surface) +
+             b * ceiling_distance)
+        # zero prevents negative values
+        return max(np.max(tolerated, where=applies, initial=0), 0)
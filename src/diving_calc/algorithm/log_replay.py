@@ -0,0 +1,155 @@
+import csv
+import json
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from diving_calc.algorithm.gradient_factors import SubSurfaceGradientFactors
+from diving_calc.algorithm.options import Options
+from diving_calc.algorithm.tissues import LoadSegment, Tissues
+from diving_calc.calculators.cns_calculator import CnsCalculator
+from diving_calc.depths.compact_profile import CompactProfile
+from diving_calc.gases.gas_density import GasDensity
+from diving_calc.gases.standard_gases import Gas, StandardGases
+from diving_calc.physics.depth_converter import DepthConverter, DepthConverterFactory
+
+# (time in seconds, depth in meters, gas name or None to keep the previous gas)
+Sample = Tuple[float, float, Optional[str]]
+
+# Order of the values in each tuple yielded by LogReplay.replay
+REPLAY_FIELDS = ('time', 'depth', 'ppO2', 'density', 'ceiling', 'gradient_factor', 'cns')
+
+
+class DiveLogReader:
+    """Incremental readers of the dive computer samples, only one line is held in memory at a time."""
+
+    @staticmethod
+    def csv(lines: Iterable[str]) -> Iterator[Sample]:
+        """
+        Reads samples from CSV lines with columns time (seconds), depth (meters) and optional gas name.
+        The first line is used as header, if it isn't numeric.
+        """
+        columns = (0, 1, 2)
+        for index, row in enumerate(csv.reader(lines)):
+            if not row:
+                continue
+
+            if index == 0 and not DiveLogReader._is_number(row[0]):
+                header = [name.strip().lower() for name in row]
+                columns = (header.index('time'), header.index('depth'), header.index('gas') if 'gas' in header else None)
+                continue
+
+            time_column, depth_column, gas_column = columns
+            gas = row[gas_column].strip() if gas_column is not None and gas_column < len(row) else ''
+            yield float(row[time_column]), float(row[depth_column]), gas or None
+
+    @staticmethod
+    def json_lines(lines: Iterable[str]) -> Iterator[Sample]:
+        """Reads samples from JSON objects, one per line, with keys time (seconds), depth (meters) and optional gas."""
+        for line in lines:
+            if not line.strip():
+                continue
+
+            sample = json.loads(line)
+            yield float(sample['time']), float(sample['depth']), sample.get('gas')
+
+    @staticmethod
+    def _is_number(value: str) -> bool:
+        try:
+            float(value)
+            return True
+        except ValueError:
+            return False
+
+
+class LogReplay:
+    def __init__(self, options: Options, tissues: Optional[Tissues] = None, default_gas: Gas = StandardGases.air):
+        """
+        Replays recorded dive samples through the tissues model.
+
+        :param options: Defines gradient factors, salinity and altitude of the dive.
+        :param tissues: Tissues at start of the dive, None for first dive saturated at options altitude.
+        :param default_gas: Gas breathed until first sample defining the gas.
+        """
+        self.options = options
+        self.depth_converter: DepthConverter = DepthConverterFactory(options).create()
+        self.tissues = tissues
+        self.default_gas = default_gas
+        # logs refer to few gases only, so each name is parsed only once
+        self._gases: Dict[str, Gas] = {}
+
+    def replay(self, samples: Iterable[Sample]) -> Iterator[Tuple[float, ...]]:
+        """
+        Yields derived metrics for each sample as plain tuple ordered by REPLAY_FIELDS.
+        Tissues are loaded by linear segment between each two samples breathing gas of the previous sample.
+        Only the current state is kept, so memory doesn't grow with length of the log.
+
+        :param samples: Samples ordered by time.
+        """
+        converter = self.depth_converter
+        surface = converter.surface_pressure
+        tissues = self.tissues.copy() if self.tissues is not None else Tissues.create_at(self.options.altitude)
+        gradients = SubSurfaceGradientFactors(converter, self.options, tissues)
+        cns = 0.0
+        gas = self.default_gas
+        previous_time = previous_bars = None
+
+        for time, depth, gas_name in samples:
+            bars = converter.to_bar(depth)
+
+            if previous_time is not None:
+                duration = time - previous_time
+
+                if duration < 0:
+                    raise ValueError(f'Samples need to be ordered by time, found {time} s after {previous_time} s.')
+
+                if duration > 0:
+                    speed = (bars - previous_bars) / duration
+                    tissues.load(LoadSegment(previous_bars, duration, speed), gas)
+                    cns += CnsCalculator.rate(gas.o2_fraction * (bars + previous_bars) / 2) * duration * 100
+
+            if gas_name is not None:
+                gas = self._gas(gas_name)
+
+            ppO2 = gas.o2_fraction * bars
+            density = GasDensity.for_gas(gas) * bars
+            yield time, depth, ppO2, density, gradients.ceiling(), tissues.gradient_factor(surface), cns
+            previous_time, previous_bars = time, bars
+
+    def record(self, samples: Iterable[Sample]) -> CompactProfile:
+        """
+        Converts samples to profile of linear segments between each two samples breathing gas of the previous sample.
+        Samples at the same time don't create any segment.
+
+        :param samples: Samples ordered by time.
+        """
+        profile = CompactProfile()
+        gas = self.default_gas
+        previous_time = previous_depth = None
+
+        for time, depth, gas_name in samples:
+            if previous_time is not None:
+                duration = time - previous_time
+
+                if duration < 0:
+                    raise ValueError(f'Samples need to be ordered by time, found {time} s after {previous_time} s.')
+
+                if duration > 0:
+                    profile.append(previous_depth, depth, gas, duration)
+
+            if gas_name is not None:
+                gas = self._gas(gas_name)
+
+            previous_time, previous_depth = time, depth
+
+        return profile
+
+    def _gas(self, name: str) -> Gas:
+        gas = self._gases.get(name)
+
+        if gas is None:
+            gas = StandardGases.by_name(name)
+
+            if gas is None:
+                raise ValueError(f"Unknown gas '{name}' in the dive log.")
+
+            self._gases[name] = gas
+
+        return gas
@@ -0,0 +1,59 @@
+import math
+from typing import NamedTuple, Optional
+import numpy as np
+from diving_calc.algorithm.compartments import Compartments
+from diving_calc.algorithm.tissues import Tissues
+from diving_calc.gases.standard_gases import Gas
+
+
+class NoDecoLimit(NamedTuple):
+    # in minutes, infinity if the tissues never reach the surface ceiling
+    minutes: float
+    # count of the tissue loads needed to find the limit
+    tissue_loads: int
+    # True if the limit was solved analytically, False if it was searched
+    closed_form: bool
+
+
+class ClosedFormNoDecoLimit:
+    """
+    Analytical no decompression limit for constant depth. Breathing one gas at constant depth,
+    each compartment loading is exponential function of time, so the moment it reaches the surface
+    M-value reduced by gradient factor high can be solved directly using logarithm.
+    """
+
+    @staticmethod
+    def time_to_surface_ceiling(tissues: Tissues, gas: Gas, ambient_pressure: float,
+                                surface_pressure: float, gf_high: float) -> Optional[float]:
+        """
+        Returns seconds of hovering at ambient pressure, after which first compartment ceiling raises above the surface.
+
+        :param tissues: Tissues at start of the hovering.
+        :param gas: Gas breathed during the hovering.
+        :param ambient_pressure: Constant pressure in bars at the hovering depth.
+        :param surface_pressure: Surface pressure in bars.
+        :param gf_high: Gradient factor high in range 0-1, applied at surface.
+        :return: Infinity if the ceiling never reaches the surface. None if not solvable, because helium is involved,
+            which makes the M-values depend on ratio of the gases changing in time.
+        """
+        if gas.he_fraction > 0 or tissues.p_he.any():
+            return None
+
+        # p_total > surface + gf * (a + surface / b - surface)
+        limits = surface_pressure + gf_high * (Compartments.N2_A + surface_pressure / Compartments.N2_B - surface_pressure)
+        p_begin = tissues.p_n2
+        p_gas = Tissues.pressure_in_lungs(ambient_pressure) * gas.n2_fraction
+
+        if np.any(p_begin > limits):
+            return 0
+
+        reachable = p_gas > limits
+        if not reachable.any():
+            return math.inf
+
+        # p(t) = p_gas + (p_begin - p_gas) * exp(-rate * t)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = (p_begin - p_gas) / (limits - p_gas)
+            times = np.log(ratios) / Compartments.N2_RATES
+
+        return float(np.min(times, where=reachable, initial=math.inf))
@@ -0,0 +1,77 @@
+from diving_calc.gases.gas_mixtures import GasMixtures
+from diving_calc.physics.depth_converter import DepthOptions
+from diving_calc.physics.pressure_converter import Salinity
+
+
+# Supported modes of the safety stop at last stop depth
+class SafetyStop:
+    NEVER = 1
+    AUTO = 2  # only if the dive was deeper than minimum auto stop depth
+    ALWAYS = 3
+
+
+class OptionDefaults:
+    altitude = 0
+    salinity = Salinity.SALT
+    round_stops_to_minutes = False
+    gas_switch_duration = 2
+    problem_solving_duration = 1
+    last_stop_depth = 3
+    safety_stop = SafetyStop.AUTO
+    deco_stop_distance = 3
+    minimum_auto_stop_depth = 10
+    max_end = GasMixtures.max_end
+    oxygen_narcotic = True
+
+    ascent_speed_6m = 3
+    ascent_speed_50perc_to_6m = 3
+    ascent_speed_50perc = 9
+    descent_speed = 18
+
+    gf_low = 0.4
+    gf_high = 0.85
+    max_ppO2 = 1.4
+    max_deco_ppO2 = 1.6
+
+
+class Options(DepthOptions):
+    def __init__(self, gf_low: float = OptionDefaults.gf_low, gf_high: float = OptionDefaults.gf_high,
+                 max_ppO2: float = OptionDefaults.max_ppO2, max_deco_ppO2: float = OptionDefaults.max_deco_ppO2,
+                 salinity: Salinity = OptionDefaults.salinity):
+        """
+        Configuration used to customize profile generation, all units are metric.
+
+        :param gf_low: Low gradient factor in range 0-1.
+        :param gf_high: High gradient factor in range 0-1.
+        :param max_ppO2: Maximum ppO2 used during the dive.
+        :param max_deco_ppO2: Maximum ppO2 used during decompression.
+        :param salinity: Water type used to create the depth converter.
+        """
+        super().__init__(OptionDefaults.altitude, salinity)
+        self.gf_low = gf_low
+        self.gf_high = gf_high
+        self.max_ppO2 = max_ppO2
+        self.max_deco_ppO2 = max_deco_ppO2
+
+        # If true, deco stops are rounded up to whole minutes, otherwise precise stops in seconds
+        self.round_stops_to_minutes = OptionDefaults.round_stops_to_minutes
+        # Gas switch stop length in minutes
+        self.gas_switch_duration = OptionDefaults.gas_switch_duration
+        # In case of problem how long does it take to solve it at the bottom in minutes
+        self.problem_solving_duration = OptionDefaults.problem_solving_duration
+        self.safety_stop = OptionDefaults.safety_stop
+        # Depth in meters of the last stop, should be 3-6 m
+        self.last_stop_depth = OptionDefaults.last_stop_depth
+        # Depth difference between two deco stops in meters
+        self.deco_stop_distance = OptionDefaults.deco_stop_distance
+        # Maximum depth in meters, which doesn't require safety stop in auto mode
+        self.minimum_auto_stop_depth = OptionDefaults.minimum_auto_stop_depth
+        # Maximum equivalent narcotic depth in meters
+        self.max_end = OptionDefaults.max_end
+        self.oxygen_narcotic = OptionDefaults.oxygen_narcotic
+
+        # Speeds in meters/minute
+        self.ascent_speed_6m = OptionDefaults.ascent_speed_6m
+        self.ascent_speed_50perc_to_6m = OptionDefaults.ascent_speed_50perc_to_6m
+        self.ascent_speed_50perc = OptionDefaults.ascent_speed_50perc
+        self.descent_speed = OptionDefaults.descent_speed
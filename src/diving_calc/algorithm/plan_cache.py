@@ -0,0 +1,179 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Callable, Hashable, List, Optional, Tuple
+from diving_calc.algorithm.algorithm_context import PlanPrefix
+from diving_calc.algorithm.buhlmann_algorithm import AlgorithmParams, BuhlmannAlgorithm
+from diving_calc.algorithm.calculated_profile import CalculatedProfile
+from diving_calc.depths.segments import Segment
+from diving_calc.gases.standard_gases import Gas
+
+PlanCacheInfo = namedtuple('PlanCacheInfo', ['hits', 'misses', 'prefix_hits', 'maxsize', 'currsize'])
+
+
+class _ExpiringLru:
+    """Not thread safe LRU store, where each entry expires after ttl seconds since it was stored."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float], clock: Callable[[], float]):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._items: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable):
+        entry = self._items.get(key)
+
+        if entry is None:
+            return None
+
+        value, expires = entry
+        if expires is not None and expires <= self.clock():
+            del self._items[key]
+            return None
+
+        self._items.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value) -> None:
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        self._items[key] = (value, expires)
+        self._items.move_to_end(key)
+
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+class PlanCache:
+    """
+    Thread safe memoization of the plan level algorithm entry points.
+    Plans are identified by canonical key built from values of segments, gases, options and initial tissues,
+    so equal dives defined by different instances share the same result.
+    Tissues after each planned segment are cached too, so plan differing e.g. only by bottom time
+    loads only the differing tail of the planned segments. Cached profiles are shared, don't modify them.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None, prefixes_maxsize: Optional[int] = None,
+                 algorithm: Optional[BuhlmannAlgorithm] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        :param maxsize: Maximum count of cached results.
+        :param ttl: Optional number of seconds after which cached entries expire.
+        :param prefixes_maxsize: Maximum count of cached tissue snapshots, by default four per cached result.
+        :param algorithm: Algorithm used to calculate not cached plans.
+        :param clock: Source of the current time in seconds used for expiration.
+        """
+        if maxsize < 1:
+            raise ValueError("Cache needs to hold at least one plan.")
+
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Time to live needs to be positive number.")
+
+        prefixes_maxsize = maxsize * 4 if prefixes_maxsize is None else prefixes_maxsize
+        self.algorithm = algorithm or BuhlmannAlgorithm()
+        self._results = _ExpiringLru(maxsize, ttl, clock)
+        self._prefixes = _ExpiringLru(max(prefixes_maxsize, 1), ttl, clock)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._prefix_hits = 0
+
+    def decompression(self, params: AlgorithmParams) -> CalculatedProfile:
+        """
+        Returns cached decompression profile of the dive, calculates it only if not cached yet.
+        Validation depends only on content of the segments and gases, so profiles with errors are cached too.
+        """
+        key = ('decompression',) + PlanCache.plan_key(params)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        environment = PlanCache.environment_key(params)
+        planned = PlanCache.segments_key(params.segments.items)
+        prefix = self._longest_prefix(environment, planned)
+        snapshots: List[PlanPrefix] = []
+        profile = self.algorithm.decompression(params, prefix, snapshots)
+
+        with self._lock:
+            for snapshot in snapshots:
+                self._prefixes.put((environment, planned[:snapshot.segments]), snapshot)
+
+            self._results.put(key, profile)
+
+        return profile
+
+    def no_deco_limit(self, params: AlgorithmParams) -> float:
+        """Returns cached no decompression limit in minutes, calculates it only if not cached yet."""
+        key = ('no_deco_limit',) + PlanCache.plan_key(params)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        result = self.algorithm.no_deco_limit(params)
+        with self._lock:
+            self._results.put(key, result)
+
+        return result
+
+    def info(self) -> PlanCacheInfo:
+        """Returns hit/miss statistics, prefix hits are counted only for the calculated plans."""
+        with self._lock:
+            return PlanCacheInfo(self._hits, self._misses, self._prefix_hits, self._results.maxsize, len(self._results))
+
+    def clear(self) -> None:
+        """Removes all cached results and tissue snapshots and resets the statistics."""
+        with self._lock:
+            self._results.clear()
+            self._prefixes.clear()
+            self._hits = 0
+            self._misses = 0
+            self._prefix_hits = 0
+
+    @staticmethod
+    def plan_key(params: AlgorithmParams) -> Tuple:
+        """Canonical hashable representation of all inputs of the algorithm."""
+        gases = tuple(PlanCache.gas_key(gas) for gas in params.gases.all)
+        options = tuple(sorted(vars(params.options).items()))
+        return PlanCache.environment_key(params), PlanCache.segments_key(params.segments.items), gases, options
+
+    @staticmethod
+    def environment_key(params: AlgorithmParams) -> Tuple:
+        """Inputs, which together with the segments define the tissues loading."""
+        options = params.options
+        tissues = None if params.tissues is None else (params.tissues.to_bytes(), float(params.surface_interval))
+        return options.salinity, float(options.altitude), tissues
+
+    @staticmethod
+    def segments_key(segments: List[Segment]) -> Tuple:
+        return tuple((float(segment.start_depth), float(segment.end_depth),
+                      PlanCache.gas_key(segment.gas), float(segment.duration)) for segment in segments)
+
+    @staticmethod
+    def gas_key(gas: Gas) -> Tuple[float, float]:
+        return float(gas.o2_fraction), float(gas.he_fraction)
+
+    def _cached(self, key: Tuple):
+        with self._lock:
+            cached = self._results.get(key)
+
+            if cached is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+
+            return cached
+
+    def _longest_prefix(self, environment: Tuple, planned: Tuple) -> Optional[PlanPrefix]:
+        with self._lock:
+            for count in range(len(planned), 0, -1):
+                prefix = self._prefixes.get((environment, planned[:count]))
+
+                if prefix is not None:
+                    self._prefix_hits += 1
+                    return prefix
+
+        return None
@@ -0,0 +1,145 @@
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from diving_calc.algorithm.options import Options
+from diving_calc.depths.compact_profile import CompactProfile
+from diving_calc.depths.segments import Segment
+from diving_calc.gases.gas_toxicity import GasToxicity
+from diving_calc.gases.standard_gases import Gas
+from diving_calc.physics.depth_converter import DepthConverter
+
+Profile = Union[List[Segment], CompactProfile]
+
+
+class LimitExceeded(NamedTuple):
+    # run time in seconds, when the limit was crossed
+    time: float
+    # in meters
+    depth: float
+    gas: Gas
+
+
+class GasSwitch(NamedTuple):
+    # run time in seconds at start of the segment breathing the new gas
+    time: float
+    # in meters
+    depth: float
+    gas: Gas
+    # recommended maximum switch depth of the gas in meters
+    switch_depth: float
+
+
+class ProfileAnalysis(NamedTuple):
+    # highest gas density in g/l, its depth in meters and the gas, None for empty profile
+    max_density: float
+    max_density_depth: float
+    max_density_gas: Optional[Gas]
+    # highest and lowest partial pressure of oxygen in bars, both 0 for empty profile
+    max_ppO2: float
+    min_ppO2: float
+    high_ppO2: Tuple[LimitExceeded, ...]
+    low_ppO2: Tuple[LimitExceeded, ...]
+    mnd_exceeded: Tuple[LimitExceeded, ...]
+    gas_switches: Tuple[GasSwitch, ...]
+
+    @property
+    def has_violations(self) -> bool:
+        return bool(self.high_ppO2 or self.low_ppO2 or self.mnd_exceeded)
+
+
+class ProfileAnalyzer:
+    """
+    Finds gas density and oxygen toxicity limits broken by the profile in one pass over its segments.
+    Limits of each gas are taken from GasToxicity, which caches them, so analysis of each segment
+    costs only few comparisons. Limit crossed by one segment is reported only once, until the diver
+    returns into the limit or switches the gas.
+    Partial pressures and narcotic depths use simple depth converter, density uses the exact one.
+    """
+
+    def __init__(self, options: Options, depth_converter: DepthConverter):
+        """
+        :param options: Defines max_ppO2, max_deco_ppO2, max_end and oxygen_narcotic.
+        :param depth_converter: Converter used to calculate the gas density.
+        """
+        self.toxicity = GasToxicity(options)
+        self.depth_converter = depth_converter
+
+    def analyze(self, profile: Profile, start_ascent_index: Optional[int] = None) -> ProfileAnalysis:
+        """
+        :param profile: Segments of the dive, their start depths need to follow end depth of previous segment.
+        :param start_ascent_index: Count of segments from beginning considered as the dive,
+            max_deco_ppO2 is applied to all later segments. None to apply max_ppO2 to whole profile.
+        """
+        rows = profile.rows() if isinstance(profile, CompactProfile) else ProfileAnalyzer._rows(profile)
+        if start_ascent_index is None:
+            start_ascent_index = len(profile)
+
+        to_simple_bar = GasToxicity.depth_converter.to_bar
+        to_bar = self.depth_converter.to_bar
+        limits_of = self.toxicity.limits
+        max_density = max_density_depth = 0
+        max_density_gas = None
+        max_ppO2 = 0
+        min_ppO2 = None
+        high_ppO2: List[LimitExceeded] = []
+        low_ppO2: List[LimitExceeded] = []
+        mnd_exceeded: List[LimitExceeded] = []
+        gas_switches: List[GasSwitch] = []
+        in_high = in_low = in_mnd = False
+        previous_gas = None
+        elapsed = 0
+
+        for index, (start_depth, end_depth, duration, gas) in enumerate(rows):
+            limits = limits_of(gas)
+
+            if previous_gas is not None and gas != previous_gas:
+                gas_switches.append(GasSwitch(elapsed, start_depth, gas, limits.switch_depth))
+                in_high = in_low = in_mnd = False
+
+            previous_gas = gas
+            deeper = max(start_depth, end_depth)
+            shallower = min(start_depth, end_depth)
+            fO2 = gas.o2_fraction
+            max_ppO2 = max(max_ppO2, to_simple_bar(deeper) * fO2)
+            low = to_simple_bar(shallower) * fO2
+            min_ppO2 = low if min_ppO2 is None else min(min_ppO2, low)
+
+            density = limits.density * to_bar(deeper)
+            if density > max_density:
+                max_density, max_density_depth, max_density_gas = density, deeper, gas
+
+            mod = limits.mod if index < start_ascent_index else limits.deco_mod
+            if deeper > mod and not in_high:
+                high_ppO2.append(ProfileAnalyzer._crossing(elapsed, start_depth, end_depth, duration,
+                                                           mod, gas, start_depth > mod))
+            in_high = end_depth > mod
+
+            if deeper > limits.mnd and not in_mnd:
+                mnd_exceeded.append(ProfileAnalyzer._crossing(elapsed, start_depth, end_depth, duration,
+                                                              limits.mnd, gas, start_depth > limits.mnd))
+            in_mnd = end_depth > limits.mnd
+
+            if shallower < limits.ceiling and not in_low:
+                low_ppO2.append(ProfileAnalyzer._crossing(elapsed, start_depth, end_depth, duration,
+                                                          limits.ceiling, gas, start_depth < limits.ceiling))
+            in_low = end_depth < limits.ceiling
+            elapsed += duration
+
+        return ProfileAnalysis(max_density, max_density_depth, max_density_gas, max_ppO2, min_ppO2 or 0,
+                               tuple(high_ppO2), tuple(low_ppO2), tuple(mnd_exceeded), tuple(gas_switches))
+
+    def analyze_many(self, profiles: Iterable[Profile]) -> List[ProfileAnalysis]:
+        """Analyzes catalog of profiles, limits of gases shared by the profiles are calculated only once."""
+        return [self.analyze(profile) for profile in profiles]
+
+    @staticmethod
+    def _rows(segments: List[Segment]) -> Iterator[Tuple[float, float, float, Gas]]:
+        return ((segment.start_depth, segment.end_depth, segment.duration, segment.gas) for segment in segments)
+
+    @staticmethod
+    def _crossing(elapsed: float, start_depth: float, end_depth: float, duration: float,
+                  limit: float, gas: Gas, start_beyond: bool) -> LimitExceeded:
+        """Already beyond the limit at start of the segment (e.g. gas switch) or crossing it during the segment."""
+        if start_beyond:
+            return LimitExceeded(elapsed, start_depth, gas)
+
+        time_at = (limit - start_depth) / (end_depth - start_depth) * duration
+        return LimitExceeded(elapsed + time_at, limit, gas)
@@ -0,0 +1,276 @@
+from itertools import chain
+from typing import Iterable, List, Optional, Tuple
+from diving_calc.algorithm.calculated_profile import Event, EventType
+from diving_calc.algorithm.options import Options
+from diving_calc.common.precision import Precision
+from diving_calc.depths.segments import Segment, Segments
+from diving_calc.depths.speeds import AscentSpeeds
+from diving_calc.gases.gas_density import DensityAtDepth, GasDensity
+from diving_calc.gases.gas_toxicity import GasToxicity
+from diving_calc.physics.depth_converter import DepthConverterFactory
+from diving_calc.physics.time import Time
+
+
+class ProfileEvents:
+    """
+    Keeps warnings of the profile up to date while the profile is edited.
+    Events of each segment depend only on the segment, the previous segment, its start time
+    and whether exceeded maximum narcotic depth was already fixed. After each change only the changed segment,
+    its follower and following segments reached by changed MND state are evaluated again.
+    Events of later segments are only moved in time and their ascent speeds are checked again,
+    if average depth of the deepest part changed. The events list is updated in place ordered by segments.
+    Partial pressures and narcotic depths use simple depth converter, density uses the exact one.
+    """
+
+    def __init__(self, options: Options, start_ascent_index: Optional[int] = None,
+                 max_density: float = GasDensity.recommended_maximum):
+        """
+        :param options: Profile behavior options, also used to create the depth converter.
+        :param start_ascent_index: Count of segments from beginning considered as the dive,
+            later segments are considered as decompression ascent. None to consider all segments as the dive.
+        :param max_density: Maximum gas density in gram per liter.
+        """
+        self.options = options
+        self.max_density = max_density
+        self.toxicity = GasToxicity(options)
+        self.density_at_depth = DensityAtDepth(DepthConverterFactory(options).create())
+        self.speeds = AscentSpeeds(options)
+        # all events of the profile
+        self.events: List[Event] = []
+        # count of segments evaluated by the last change
+        self.evaluated = 0
+        self._start_ascent_index = start_ascent_index
+        self._segments: List[Segment] = []
+        self._segment_events: List[List[Event]] = []
+        # values used by the last evaluation of each segment
+        self._start_times: List[float] = []
+        self._durations: List[float] = []
+        # MND state after each segment, None for not evaluated segment
+        self._fixed_mnd: List[Optional[bool]] = []
+
+    @staticmethod
+    def from_profile(segments: Iterable[Segment], options: Options, start_ascent_index: Optional[int] = None,
+                     max_density: float = GasDensity.recommended_maximum) -> "ProfileEvents":
+        """Evaluates all events of the profile at once."""
+        result = ProfileEvents(options, start_ascent_index, max_density)
+        result.reset(segments)
+        return result
+
+    @property
+    def segments(self) -> Tuple[Segment, ...]:
+        return tuple(self._segments)
+
+    @property
+    def start_ascent_index(self) -> Optional[int]:
+        return self._start_ascent_index
+
+    @start_ascent_index.setter
+    def start_ascent_index(self, value: Optional[int]) -> None:
+        count = len(self._segments)
+        old = count if self._start_ascent_index is None else min(self._start_ascent_index, count)
+        new = count if value is None else min(value, count)
+        self._start_ascent_index = value
+        # only segments between both indexes switch the ppO2 limit
+        changed = range(min(old, new), max(old, new))
+        self._evaluate_many(changed)
+        self.evaluated = len(changed)
+
+    def reset(self, segments: Iterable[Segment]) -> None:
+        """Replaces whole profile."""
+        self._segments = list(segments)
+        count = len(self._segments)
+        self._segment_events = [[] for _ in range(count)]
+        self._start_times = [0] * count
+        self._durations = [0] * count
+        self._fixed_mnd = [None] * count
+        self.events.clear()
+        self._changed(0)
+
+    def append(self, segment: Segment) -> None:
+        self.insert(len(self._segments), segment)
+
+    def insert(self, index: int, segment: Segment) -> None:
+        index = min(max(index, 0), len(self._segments))
+        self._segments.insert(index, segment)
+        self._segment_events.insert(index, [])
+        self._start_times.insert(index, self._start_times[index] if index < len(self._start_times) else 0)
+        self._durations.insert(index, 0)
+        self._fixed_mnd.insert(index, None)
+        self._changed(index, moved=True)
+
+    def update(self, index: int, segment: Optional[Segment] = None) -> None:
+        """
+        Evaluates the segment at index again.
+
+        :param segment: Replacement of the segment, None if the segment was changed in place.
+        """
+        if segment is not None:
+            self._segments[index] = segment
+        self._changed(index % len(self._segments))
+
+    def remove(self, index: int) -> Segment:
+        index %= len(self._segments)
+        removed = self._segments.pop(index)
+        # removes also the events of the segment
+        self._replace_events(index, index + 1, [])
+        del self._start_times[index]
+        del self._durations[index]
+        del self._fixed_mnd[index]
+        self._changed(index, moved=True)
+        return removed
+
+    def _changed(self, first: int, moved: bool = False) -> None:
+        """:param moved: True, if the later segments moved to another index."""
+        segments = self._segments
+        count = len(segments)
+        old_average = self.speeds.average_depth
+        self.speeds.average_depth = Segments.average_depth(Segments.from_collection(segments).deepest_part())
+
+        index = first
+        window: List[List[Event]] = []
+        state_changed = True
+        while index < count and (index <= first + 1 or state_changed):
+            start_time = self._start_times[index - 1] + self._durations[index - 1] if index else 0
+            events, fixed_mnd = self._evaluate(index, start_time)
+            state_changed = fixed_mnd != self._fixed_mnd[index]
+            window.append(events)
+            self._start_times[index] = start_time
+            self._durations[index] = segments[index].duration
+            self._fixed_mnd[index] = fixed_mnd
+            index += 1
+
+        self._replace_events(first, index, window)
+        self.evaluated = index - first
+        self._shift_from(index)
+
+        outdated = set()
+        if old_average != self.speeds.average_depth:
+            # ascent speeds of all ascents outside of the evaluated window depend on the average depth
+            outside = chain(range(0, first), range(index, count))
+            outdated.update(rest for rest in outside if segments[rest].speed < 0)
+
+        # moved segments around the start of ascent switch the ppO2 limit
+        start_ascent_index = self._start_ascent_index
+        if moved and start_ascent_index is not None and first < start_ascent_index:
+            outdated.update(rest for rest in (start_ascent_index - 1, start_ascent_index) if index <= rest < count)
+
+        if outdated:
+            self._evaluate_many(sorted(outdated))
+            self.evaluated += len(outdated)
+
+    def _shift_from(self, first: int) -> None:
+        """Moves events of not evaluated segments after change of previous durations."""
+        if first == 0 or first >= len(self._segments):
+            return
+
+        shift = self._start_times[first - 1] + self._durations[first - 1] - self._start_times[first]
+        if shift == 0:
+            return
+
+        for index in range(first, len(self._segments)):
+            self._start_times[index] += shift
+            for event in self._segment_events[index]:
+                event.time_stamp += shift
+
+    def _evaluate_many(self, indexes: Iterable[int]) -> None:
+        """Evaluates segments using already known start times and MND states."""
+        for index in indexes:
+            self._segment_events[index], _ = self._evaluate(index, self._start_times[index])
+        self.events[:] = [event for events in self._segment_events for event in events]
+
+    def _replace_events(self, first: int, last: int, window: List[List[Event]]) -> None:
+        offset = sum(len(events) for events in self._segment_events[:first])
+        old_count = sum(len(events) for events in self._segment_events[first:last])
+        self.events[offset:offset + old_count] = [event for events in window for event in events]
+        self._segment_events[first:last] = window
+
+    def _evaluate(self, index: int, elapsed: float) -> Tuple[List[Event], bool]:
+        """Returns events of the segment and MND state after the segment."""
+        current = self._segments[index]
+        previous = self._segments[index - 1] if index else None
+        fixed_mnd = self._fixed_mnd[index - 1] if index else True
+        switching_gas = previous is not None and not current.gas.composition_equals(previous.gas)
+        limits = self.toxicity.limits(current.gas)
+        start_ascent_index = self._start_ascent_index
+        before_deco_ascent = start_ascent_index is None or index < start_ascent_index
+        events: List[Event] = []
+
+        # order and conditions follow the reference ProfileEvents
+        descent = current.end_depth > current.start_depth
+        if descent or (before_deco_ascent and switching_gas):
+            mod = limits.mod if before_deco_ascent else limits.deco_mod
+            if max(current.start_depth, current.end_depth) > mod:
+                events.append(ProfileEvents._crossing(current, elapsed, mod, current.start_depth >= mod,
+                                                      EventType.HIGH_PPO2))
+
+        ceiling = limits.ceiling
+        ascent = current.end_depth < current.start_depth
+        if (min(current.start_depth, current.end_depth) < ceiling and switching_gas) or \
+                (current.start_depth > ceiling > current.end_depth and ascent) or \
+                (current.start_depth == 0 and current.start_depth < ceiling and descent):
+            events.append(ProfileEvents._crossing(current, elapsed, ceiling, current.start_depth <= ceiling,
+                                                  EventType.LOW_PPO2))
+
+        if switching_gas:
+            events.append(Event(elapsed, current.start_depth, EventType.GAS_SWITCH, gas=current.gas))
+
+        speed = Time.to_seconds(current.speed)
+        if speed > self.options.descent_speed:
+            events.append(Event(elapsed, current.start_depth, EventType.HIGH_DESCENT_SPEED))
+
+        # prevent events generated by precise numbers of calculated segments
+        if -Precision.round(speed, 2) > self.speeds.ascent(current.start_depth):
+            events.append(Event(elapsed, current.start_depth, EventType.HIGH_ASCENT_SPEED))
+
+        if switching_gas and ProfileEvents._counter_diffusion(previous, current):
+            events.append(Event(elapsed, current.start_depth, EventType.ISOBARIC_COUNTER_DIFFUSION, gas=current.gas))
+
+        mnd = limits.mnd
+        if fixed_mnd and max(current.start_depth, current.end_depth) > mnd:
+            event = ProfileEvents._crossing(current, elapsed, mnd, current.start_depth > mnd,
+                                           EventType.MAX_END_EXCEEDED)
+            event.gas = current.gas
+            events.append(event)
+        # the event can be added again only after it is fixed
+        fixed_mnd = current.end_depth <= mnd
+
+        density_event = self._density_exceeded(current, elapsed, switching_gas)
+        if density_event is not None:
+            events.append(density_event)
+
+        return events, fixed_mnd
+
+    def _density_exceeded(self, current: Segment, elapsed: float, switching_gas: bool) -> Optional[Event]:
+        start_density = self.density_at_depth.at_depth(current.gas, current.start_depth)
+        end_density = self.density_at_depth.at_depth(current.gas, current.end_depth)
+        max_density = self.max_density
+        descent = current.end_depth > current.start_depth
+
+        # first segment starts at surface, so there is never high density
+        if not ((switching_gas and start_density > max_density) or (descent and end_density > max_density)):
+            return None
+
+        # gas switch already above the limit
+        if start_density > max_density:
+            return Event(elapsed, current.start_depth, EventType.HIGH_GAS_DENSITY, gas=current.gas)
+
+        time_at = (max_density - start_density) / (end_density - start_density) * current.duration
+        return Event(elapsed + time_at, current.depth_at(time_at), EventType.HIGH_GAS_DENSITY, gas=current.gas)
+
+    @staticmethod
+    def _counter_diffusion(previous: Segment, current: Segment) -> bool:
+        """Switch to gas with higher nitrogen content from gas containing helium."""
+        previous_fN2 = 1 - previous.gas.o2_fraction - previous.gas.he_fraction
+        current_fN2 = 1 - current.gas.o2_fraction - current.gas.he_fraction
+        delta_N2 = current_fN2 - previous_fN2
+        delta_He = current.gas.he_fraction - previous.gas.he_fraction
+        return previous.gas.he_fraction > 0 and delta_N2 * 5 > -delta_He
+
+    @staticmethod
+    def _crossing(current: Segment, elapsed: float, limit: float, start_beyond: bool, type: int) -> Event:
+        """Event at start of the segment (e.g. gas switch), or at the moment the segment crosses the limit depth."""
+        if start_beyond:
+            return Event(elapsed, current.start_depth, type)
+
+        time_at = (limit - current.start_depth) / current.speed
+        return Event(elapsed + time_at, limit, type)
@@ -0,0 +1,222 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+import numpy as np
+from diving_calc.algorithm.compartments import Compartments
+from diving_calc.gases.gas_mixtures import GasMixtures
+from diving_calc.gases.standard_gases import Gas
+from diving_calc.physics.pressure_converter import AltitudePressure, PressureConverter
+
+
+class LoadSegment:
+    def __init__(self, start_pressure: float, duration: float, speed: float):
+        """
+        Represents transition between depths during dive in pressure units.
+
+        :param start_pressure: Depth in bars at beginning of the segment.
+        :param duration: Duration in seconds of the transition.
+        :param speed: Direction of the swim in bars/second.
+        """
+        self.start_pressure = start_pressure
+        self.duration = duration
+        self.speed = speed
+
+
+@lru_cache(maxsize=1024)
+def _decay(time: float) -> np.ndarray:
+    """Exponential decay of all compartments for given duration in seconds, stops use only few distinct durations."""
+    result = np.exp(-Compartments.RATES * time)
+    result.flags.writeable = False
+    return result
+
+
+class Tissues:
+    # as constant for body temperature 37°C
+    WATER_VAPOUR_PRESSURE = 0.0627
+    # little endian doubles, nitrogen followed by helium
+    _SNAPSHOT_TYPE = np.dtype('<f8')
+
+    def __init__(self, p_n2, p_he):
+        """
+        Inert gas loading of all compartments stored in one contiguous array,
+        nitrogen in row 0 and helium in row 1. All operations update all compartments at once.
+
+        :param p_n2: Partial pressures of nitrogen in bars, one per compartment.
+        :param p_he: Partial pressures of helium in bars, one per compartment.
+        """
+        self.pressures = np.array((p_n2, p_he), dtype=np.float64)
+        self._coefficients: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    @staticmethod
+    def create(surface_pressure: float) -> "Tissues":
+        """Creates tissues saturated by air at given surface pressure in bars, use for first dive only."""
+        p_n2 = np.full(Compartments.COUNT, Tissues.inspired_n2_pressure(surface_pressure))
+        return Tissues(p_n2, np.zeros(Compartments.COUNT))
+
+    @staticmethod
+    def create_at(altitude: float) -> "Tissues":
+        """Creates tissues saturated by air at given altitude in meters above sea level."""
+        return Tissues.create(Tissues.surface_pressure_at(altitude))
+
+    @staticmethod
+    def surface_pressure_at(altitude: float) -> float:
+        """Returns pressure in bars at given altitude in meters above sea level."""
+        return PressureConverter.pascal_to_bar(AltitudePressure.pressure(altitude))
+
+    @staticmethod
+    def create_loaded(p_n2, p_he) -> "Tissues":
+        """Creates tissues already loaded e.g. by previous dive, values are copied."""
+        if np.shape(p_n2) != (Compartments.COUNT,) or np.shape(p_he) != (Compartments.COUNT,):
+            raise ValueError("Provided incompatible count of tissues.")
+
+        return Tissues(p_n2, p_he)
+
+    @staticmethod
+    def from_bytes(snapshot: bytes) -> "Tissues":
+        """Restores tissues from snapshot created by to_bytes."""
+        values = np.frombuffer(snapshot, dtype=Tissues._SNAPSHOT_TYPE)
+        if values.shape != (2 * Compartments.COUNT,):
+            raise ValueError("Provided incompatible count of tissues.")
+
+        return Tissues(values[:Compartments.COUNT], values[Compartments.COUNT:])
+
+    @staticmethod
+    def inspired_n2_pressure(surface_pressure: float) -> float:
+        """Calculates partial pressure of nitrogen in the tissue equilibrium at given surface pressure in bars."""
+        pressure = Tissues.pressure_in_lungs(surface_pressure)
+        return GasMixtures.partial_pressure(pressure, GasMixtures.nitrox_in_air)
+
+    @staticmethod
+    def pressure_in_lungs(ambient_pressure: float) -> float:
+        return ambient_pressure - Tissues.WATER_VAPOUR_PRESSURE
+
+    @property
+    def p_n2(self) -> np.ndarray:
+        """Partial pressures of nitrogen saturated in the compartments in bars."""
+        return self.pressures[0]
+
+    @property
+    def p_he(self) -> np.ndarray:
+        """Partial pressures of helium saturated in the compartments in bars."""
+        return self.pressures[1]
+
+    @property
+    def p_total(self) -> np.ndarray:
+        """Total partial pressure of inert gases (He and N2) saturated in each compartment in bars."""
+        return self.coefficients()[0]
+
+    @property
+    def a(self) -> np.ndarray:
+        """Buhlmann a M-value coefficients weighted by current loading."""
+        return self.coefficients()[1]
+
+    @property
+    def b(self) -> np.ndarray:
+        """Buhlmann b M-value coefficients weighted by current loading."""
+        return self.coefficients()[2]
+
+    def coefficients(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns total pressures, a and b coefficients, calculated only once after each change of the loading."""
+        if self._coefficients is None:
+            p_total = self.pressures.sum(axis=0)
+            a = (Compartments.A * self.pressures).sum(axis=0) / p_total
+            b = (Compartments.B * self.pressures).sum(axis=0) / p_total
+            self._coefficients = (p_total, a, b)
+        return self._coefficients
+
+    def copy(self) -> "Tissues":
+        copy = Tissues.__new__(Tissues)
+        copy.pressures = self.pressures.copy()
+        copy._coefficients = self._coefficients
+        return copy
+
+    def restore_from(self, source: "Tissues") -> None:
+        """Copies loading from the source without allocating new arrays."""
+        np.copyto(self.pressures, source.pressures)
+        self._coefficients = source._coefficients
+
+    def to_bytes(self) -> bytes:
+        """Compact snapshot of the loading, which can be stored and restored by from_bytes."""
+        return self.pressures.astype(Tissues._SNAPSHOT_TYPE).tobytes()
+
+    def __reduce__(self):
+        # cached coefficients are not part of the state
+        return Tissues.from_bytes, (self.to_bytes(),)
+
+    def rest(self, surface_pressure: float, duration: float) -> None:
+        """
+        Fast forwards the tissues by resting at surface breathing air. Without depth change the Schreiner equation
+        reduces to exponential decay, so hours of surface interval cost the same as one second.
+
+        :param surface_pressure: Pressure in bars at the surface, where the diver is resting.
+        :param duration: Duration in seconds, infinity saturates the tissues at the surface pressure.
+        """
+        p_gas = np.array(((Tissues.inspired_n2_pressure(surface_pressure),), (0,)))
+        # not cached decay, since each surface interval has different duration
+        decay = np.exp(-Compartments.RATES * duration)
+        self.pressures = p_gas + (self.pressures - p_gas) * decay
+        self._coefficients = None
+
+    def load(self, segment: LoadSegment, gas: Gas) -> float:
+        """
+        Loads all compartments with inert gases from the gas during the segment using Schreiner equation.
+
+        :param segment: Segment of the dive in pressure units.
+        :param gas: Gas breathed during the segment.
+        :return: Total load change in bars, negative in case the tissues are offgasing.
+        """
+        previous = self.pressures.sum()
+        fractions = np.array(((gas.n2_fraction,), (gas.he_fraction,)))
+        gas_rates = segment.speed * fractions
+        # partial pressure at starting depth, not at the target depth
+        p_gas = Tissues.pressure_in_lungs(segment.start_pressure) * fractions
+        self.pressures = Tissues.schreiner_equation(self.pressures, p_gas, segment.duration, gas_rates)
+        self._coefficients = None
+        return self.pressures.sum() - previous
+
+    def ceiling(self, gradient: float) -> float:
+        """
+        Returns pressure in bars of the deepest tolerated ceiling of all compartments reduced by the gradient.
+
+        :param gradient: Gradient factor constant in range 0-1.
+        :return: Zero in case there is no ceiling, otherwise ceiling pressure in bars.
+        """
+        p_total, a, b = self.coefficients()
+        # tolerated = (pTotal - a) * b  // Buhlmann
+        bars = (p_total - a * gradient) / (gradient / b + 1.0 - gradient)
+        return max(bars.max(), 0)
+
+    def gradient_factor(self, ambient_pressure: float) -> float:
+        """Returns the highest gradient factor from the original Buhlmann M-value at given pressure in bars."""
+        return self._gradient_factors(ambient_pressure).max()
+
+    def saturation_ratio(self, ambient_pressure: float) -> np.ndarray:
+        """
+        Calculates saturation ratio of all compartments relative to ambient pressure.
+        -1..0: is offgasing, -1 = surface pressure.
+           =0: is equilibrium (tissue is not offgasing or ongasing), at ambient pressure.
+           >0: is ongasing, +1 = 100% gradient i.e. at m-value, more means exceeded limit.
+
+        :param ambient_pressure: The current ambient pressure in bars.
+        """
+        p_total = self.p_total
+        below = p_total / ambient_pressure - 1
+        return np.where(p_total < ambient_pressure, below, self._gradient_factors(ambient_pressure))
+
+    def _gradient_factors(self, ambient_pressure: float) -> np.ndarray:
+        p_total, a, b = self.coefficients()
+        m_value = a + ambient_pressure / b
+        result = (p_total - ambient_pressure) / (m_value - ambient_pressure)
+        return np.maximum(result, 0)
+
+    @staticmethod
+    def schreiner_equation(p_begin: np.ndarray, p_gas: np.ndarray, time: float, gas_rate: np.ndarray) -> np.ndarray:
+        """
+        Calculates the end compartment inert gas pressures in bar for nitrogen and helium at once.
+
+        :param p_begin: Initial compartments inert gas pressures, nitrogen and helium rows.
+        :param p_gas: Partial pressure of inert gases at the starting depth, one per row.
+        :param time: Time of exposure in seconds.
+        :param gas_rate: Rate of descent/ascent in bar/second times the fraction of inert gas, one per row.
+        """
+        time_constants = Compartments.TIME_CONSTANTS
+        return p_gas + gas_rate * (time - time_constants) - (p_gas - p_begin - gas_rate * time_constants) * _decay(time)
@@ -0,0 +1,55 @@
+from typing import Optional
+import numpy as np
+from numpy.typing import ArrayLike
+from diving_calc.common.arrays import as_array
+from diving_calc.physics.altitude_pressure_batch import AltitudePressureBatch, AltitudeTable
+from diving_calc.physics.pressure_converter import AltitudePressure, PressureConverter
+
+
+class AltitudeBatchCalculator:
+    """
+    Vectorized version of AltitudeCalculator converting many dive sites at once.
+    All arguments are broadcasted against each other, so altitudes[:, np.newaxis] with depths[np.newaxis, :]
+    evaluates full grid of depths for each site.
+    """
+
+    def __init__(self, table: Optional[AltitudeTable] = None):
+        """:param table: Optional interpolation table used instead of the exact barometric formula."""
+        self.table = table
+
+    def to_pressure(self, altitude: ArrayLike) -> np.ndarray:
+        """
+        :param altitude: Altitudes in meters above sea level.
+        :return: Pressures in bars.
+        """
+        if self.table is not None:
+            return self.table.to_pressure(altitude)
+
+        return PressureConverter.pascal_to_bar(AltitudePressureBatch.pressure(altitude))
+
+    def to_altitude(self, pressure: ArrayLike) -> np.ndarray:
+        """
+        :param pressure: Pressures in bars.
+        :return: Altitudes in meters above sea level, 0 m for pressures above standard pressure.
+        """
+        if self.table is not None:
+            return self.table.to_altitude(pressure)
+
+        return AltitudePressureBatch.altitude(PressureConverter.bar_to_pascal(as_array(pressure)))
+
+    def theoretical_depth(self, altitude_depth: ArrayLike, altitude: ArrayLike) -> np.ndarray:
+        """
+        Calculates sea level equivalent depths used to read the decompression tables.
+
+        :param altitude_depth: Depths in fresh water meters at the dive sites.
+        :param altitude: Altitudes of the dive sites in meters above sea level.
+        """
+        # targeting sea level pressure, because tables are calculated to sea level
+        ratio = AltitudePressure.STANDARD_PRESSURE / self.to_pressure(altitude)
+        return as_array(altitude_depth) * ratio
+
+    def depth_grid(self, altitudes: ArrayLike, depths: ArrayLike) -> np.ndarray:
+        """Theoretical depths with shape (sites, depths) for each combination of site altitude and depth."""
+        altitudes = np.atleast_1d(as_array(altitudes))
+        depths = np.atleast_1d(as_array(depths))
+        return self.theoretical_depth(depths[np.newaxis, :], altitudes[:, np.newaxis])
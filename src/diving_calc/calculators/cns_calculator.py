@@ -0,0 +1,126 @@
+import math
+from bisect import bisect_left
+from typing import List
+import numpy as np
+from diving_calc.depths.compact_profile import CompactProfile
+from diving_calc.depths.segments import Segment
+from diving_calc.physics.depth_converter import DepthConverter
+
+
+class CnsCalculator:
+    """
+    Central nervous system oxygen toxicity, reference: https://www.shearwater.com/wp-content/uploads/2012/08/Oxygen_Toxicity_Calculations.pdf
+    """
+    minimum_ppO2 = 0.5
+    # NOAA single exposure limits, ppO2 in bars sorted ascending and limits in minutes
+    noaa_ppO2 = (0.6, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3, 1.4, 1.5, 1.6)
+    noaa_limits = (720, 570, 450, 360, 300, 240, 210, 180, 150, 120, 45)
+    # ppO2 is rounded before the lookup, so e.g. 1.4000000001 still matches the 1.4 row
+    noaa_precision = 6
+    # ppO2 range in bars, intercept and slope of the exponent of each piece of the slope function
+    slope_pieces = (
+        (minimum_ppO2, 1.5, -11.7853, 1.93873),
+        (1.5, math.inf, -23.6349, 9.80829),
+    )
+
+    def __init__(self, depth_converter: DepthConverter):
+        self.depth_converter = depth_converter
+
+    def calculate_for_profile(self, profile: List[Segment]) -> float:
+        """Calculates total CNS in % for provided profile."""
+        return sum(self.calculate(segment.gas.o2_fraction, segment.start_depth, segment.end_depth, segment.duration)
+                   for segment in profile)
+
+    def calculate_for_compact_profile(self, profile: CompactProfile) -> float:
+        """Calculates total CNS in % for provided profile, all segments at once."""
+        average_depths = (profile.start_depths + profile.end_depths) / 2
+        ppO2 = profile.o2_fractions * self.depth_converter.to_bar_many(average_depths)
+        return float(np.dot(CnsCalculator.rate_many(ppO2), profile.durations) * 100)
+
+    def calculate(self, fO2: float, start_depth: float, end_depth: float, duration: float) -> float:
+        """
+        Calculates CNS in % for provided profile segment.
+
+        :param fO2: Oxygen fraction.
+        :param start_depth: Starting depth in meters.
+        :param end_depth: End depth in meters.
+        :param duration: Duration in seconds.
+        """
+        average_depth = (start_depth + end_depth) / 2
+        ppO2 = fO2 * self.depth_converter.to_bar(average_depth)
+        return CnsCalculator.rate(ppO2) * duration * 100
+
+    def calculate_integrated(self, fO2: float, start_depth: float, end_depth: float, duration: float) -> float:
+        """
+        Calculates CNS in % for provided profile segment by exact integration of the slope function,
+        instead of using the rate at average depth. Differs from calculate only for ascents and descents.
+
+        :param fO2: Oxygen fraction.
+        :param start_depth: Starting depth in meters.
+        :param end_depth: End depth in meters.
+        :param duration: Duration in seconds.
+        """
+        ppO2_start = fO2 * self.depth_converter.to_bar(start_depth)
+        ppO2_end = fO2 * self.depth_converter.to_bar(end_depth)
+
+        if ppO2_start == ppO2_end:
+            return CnsCalculator.rate(ppO2_start) * duration * 100
+
+        low, high = sorted((ppO2_start, ppO2_end))
+        seconds_per_bar = duration / (high - low)
+        total = 0
+        for lower_bound, upper_bound, intercept, slope in CnsCalculator.slope_pieces:
+            piece_low = max(low, lower_bound)
+            piece_high = min(high, upper_bound)
+
+            if piece_high > piece_low:
+                # antiderivative of exp(intercept + slope * ppO2)
+                total += (math.exp(intercept + slope * piece_high) - math.exp(intercept + slope * piece_low)) / slope
+
+        return total * seconds_per_bar * 100
+
+    def calculate_noaa(self, fO2: float, start_depth: float, end_depth: float, duration: float) -> float:
+        """Calculates CNS in % for provided profile segment at average depth using the NOAA limits table."""
+        average_depth = (start_depth + end_depth) / 2
+        ppO2 = fO2 * self.depth_converter.to_bar(average_depth)
+        return duration / CnsCalculator.noaa_limit(ppO2) * 100
+
+    @staticmethod
+    def noaa_limit(ppO2: float) -> float:
+        """
+        Finds maximum single exposure duration in seconds at given ppO2 in the NOAA table.
+        Uses the nearest higher tabulated ppO2, infinity below minimum ppO2 and 0 above the table.
+        """
+        if ppO2 <= CnsCalculator.minimum_ppO2:
+            return math.inf
+
+        index = bisect_left(CnsCalculator.noaa_ppO2, round(ppO2, CnsCalculator.noaa_precision))
+
+        if index == len(CnsCalculator.noaa_ppO2):
+            return 0
+
+        return CnsCalculator.noaa_limits[index] * 60
+
+    @staticmethod
+    def rate(ppO2: float) -> float:
+        """Fraction of the CNS limit consumed per second at given ppO2."""
+        if ppO2 <= CnsCalculator.minimum_ppO2:
+            return 0
+
+        # slope function from https://thetheoreticaldiver.org/wordpress/index.php/2019/08/15/calculating-oxygen-cns-toxicity/
+        _, _, intercept, slope = CnsCalculator.slope_pieces[0 if ppO2 <= 1.5 else 1]
+        exponent = intercept + slope * ppO2
+
+        try:
+            return math.exp(exponent)
+        except OverflowError:
+            return math.inf
+
+    @staticmethod
+    def rate_many(ppO2: np.ndarray) -> np.ndarray:
+        """Vectorized rate, fraction of the CNS limit consumed per second at each ppO2."""
+        (_, _, low_intercept, low_slope), (_, _, high_intercept, high_slope) = CnsCalculator.slope_pieces
+        exponents = np.where(ppO2 <= 1.5, low_intercept + low_slope * ppO2, high_intercept + high_slope * ppO2)
+        with np.errstate(over='ignore'):
+            return np.where(ppO2 <= CnsCalculator.minimum_ppO2, 0, np.exp(exponents))
+
@@ -0,0 +1,64 @@
+import numpy as np
+from numpy.typing import ArrayLike
+from diving_calc.common.arrays import as_array
+from diving_calc.physics.depth_converter import BelowSurface, DepthConverter
+from diving_calc.gases.gas_mixtures import GasMixtures
+from diving_calc.gases.gas_mixtures_batch import GasMixturesBatch
+
+
+class NitroxBatchCalculator:
+    """
+    Vectorized version of NitroxCalculator, all arguments are broadcasted against each other.
+    Instead of raising for the whole batch, not convertible elements result in NaN.
+    """
+
+    def __init__(self, depth_converter: DepthConverter, o2_in_air: float = GasMixtures.o2_in_air):
+        self.depth_converter = depth_converter
+        self.o2_in_air = o2_in_air
+
+    def ead(self, percent_O2: ArrayLike, depth: ArrayLike) -> np.ndarray:
+        """
+        Calcula la profundidad equivalente de aire para mezclas nitrox dadas.
+
+        :param percent_O2: Porcentajes de oxígeno en el gas.
+        :param depth: Profundidades actuales en metros.
+        :return: Profundidades equivalentes de aire en metros, 0 para resultados sobre la superficie.
+        """
+        fO2 = as_array(percent_O2) / 100
+        bars = self.depth_converter.to_bar_many(depth)
+        result = GasMixturesBatch.ead(fO2, bars, self.o2_in_air)
+        result_meters = self.depth_converter.from_bar_many(result, BelowSurface.NAN)
+        return np.where(result <= self.depth_converter.surface_pressure, 0.0, result_meters)
+
+    def best_mix(self, pO2: ArrayLike, depth: ArrayLike) -> np.ndarray:
+        """
+        Calcula la mejor mezcla nitrox para profundidades dadas.
+
+        :param pO2: Presiones parciales constantes.
+        :param depth: Profundidades actuales en metros.
+        :return: Porcentajes de oxígeno en la mezcla requerida.
+        """
+        return GasMixturesBatch.best_mix(pO2, depth, self.depth_converter) * 100
+
+    def mod(self, ppO2: ArrayLike, percent_O2: ArrayLike) -> np.ndarray:
+        """
+        Calcula la profundidad máxima operativa para mezclas dadas.
+
+        :param ppO2: Presiones parciales constantes.
+        :param percent_O2: Porcentajes de oxígeno en el gas.
+        :return: Profundidades en metros, NaN si no es convertible a profundidad.
+        """
+        fO2 = as_array(percent_O2) / 100
+        result = GasMixturesBatch.mod(ppO2, fO2)
+        return self.depth_converter.from_bar_many(result, BelowSurface.NAN)
+
+    def partial_pressure(self, fO2: ArrayLike, depth: ArrayLike) -> np.ndarray:
+        """
+        Calcula la presión parcial para mezclas dadas a profundidades determinadas.
+
+        :param fO2: Porcentajes de oxígeno en el gas.
+        :param depth: Profundidades actuales en metros.
+        :return: Presiones parciales.
+        """
+        bar = self.depth_converter.to_bar_many(depth)
+        return GasMixturesBatch.partial_pressure(bar, fO2) / 100
@@ -0,0 +1,77 @@
+from typing import List
+import numpy as np
+from diving_calc.depths.compact_profile import CompactProfile
+from diving_calc.depths.segments import Segment
+from diving_calc.physics.depth_converter import DepthConverter
+from diving_calc.physics.time import Time
+
+
+class OtuCalculator:
+    """
+    OTU - Oxygen Toxicity Units, reference: https://www.shearwater.com/wp-content/uploads/2012/08/Oxygen_Toxicity_Calculations.pdf
+    """
+    daily_limit = 300
+    minimum_ppO2 = 0.5
+
+    def __init__(self, depth_converter: DepthConverter):
+        self.depth_converter = depth_converter
+
+    def calculate_for_profile(self, profile: List[Segment]) -> float:
+        """Calculates total OTU for provided profile."""
+        return sum(self.calculate(segment.duration, segment.gas.o2_fraction, segment.start_depth, segment.end_depth)
+                   for segment in profile)
+
+    def calculate_for_compact_profile(self, profile: CompactProfile) -> float:
+        """Calculates total OTU for provided profile, all segments at once."""
+        ppO2_start = profile.o2_fractions * self.depth_converter.to_bar_many(profile.start_depths)
+        ppO2_end = profile.o2_fractions * self.depth_converter.to_bar_many(profile.end_depths)
+        return float(OtuCalculator.otu_many(ppO2_start, ppO2_end, profile.durations).sum())
+
+    def calculate(self, duration: float, fO2: float, start_depth: float, end_depth: float) -> float:
+        """
+        Calculates OTU of ascent, descent or flat segment at constant speed in closed form.
+
+        :param duration: Duration in seconds.
+        :param fO2: Oxygen fraction.
+        :param start_depth: Starting depth in meters.
+        :param end_depth: End depth in meters.
+        """
+        duration_minutes = Time.to_minutes(duration)
+        ppO2_start = self.depth_converter.to_bar(start_depth) * fO2
+        ppO2_end = self.depth_converter.to_bar(end_depth) * fO2
+
+        if ppO2_start <= self.minimum_ppO2 and ppO2_end <= self.minimum_ppO2:
+            return 0
+
+        # only part of the segment above the limit
+        if ppO2_start <= self.minimum_ppO2:
+            duration_minutes *= (ppO2_end - self.minimum_ppO2) / (ppO2_end - ppO2_start)
+            ppO2_start = 0.501
+        elif ppO2_end <= self.minimum_ppO2:
+            duration_minutes *= (ppO2_start - self.minimum_ppO2) / (ppO2_start - ppO2_end)
+            ppO2_end = 0.501
+
+        # https://thetheoreticaldiver.org/wordpress/index.php/2018/12/05/a-few-thoughts-on-oxygen-toxicity/
+        # simplified version of ((Pa + Pb) / 2 - 0.5) / 0.5
+        pm = ppO2_start + ppO2_end - 1.0
+        rate = pm ** (5.0 / 6.0) * (1.0 - 5.0 * (ppO2_end - ppO2_start) ** 2 / 216 / pm ** 2)
+        return rate * duration_minutes
+
+    @staticmethod
+    def otu_many(ppO2_start: np.ndarray, ppO2_end: np.ndarray, duration: np.ndarray) -> np.ndarray:
+        """Vectorized calculate of segments defined by ppO2 at their start and end, duration in seconds."""
+        minimum = OtuCalculator.minimum_ppO2
+        ppO2_start, ppO2_end, minutes = np.broadcast_arrays(ppO2_start, ppO2_end, Time.to_minutes(duration))
+        below = (ppO2_start <= minimum) & (ppO2_end <= minimum)
+        start_below = ~below & (ppO2_start <= minimum)
+        end_below = ~below & (ppO2_end <= minimum)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            minutes = np.where(start_below, minutes * (ppO2_end - minimum) / (ppO2_end - ppO2_start), minutes)
+            minutes = np.where(end_below, minutes * (ppO2_start - minimum) / (ppO2_start - ppO2_end), minutes)
+            ppO2_start = np.where(start_below, 0.501, ppO2_start)
+            ppO2_end = np.where(end_below, 0.501, ppO2_end)
+            pm = ppO2_start + ppO2_end - 1.0
+            rate = np.power(pm, 5.0 / 6.0) * (1.0 - 5.0 * (ppO2_end - ppO2_start) ** 2 / 216 / pm ** 2)
+
+        return np.where(below, 0, rate * minutes)
@@ -0,0 +1,120 @@
+from typing import NamedTuple, Sequence
+import numpy as np
+from numpy.typing import ArrayLike
+from diving_calc.calculators.cns_calculator import CnsCalculator
+from diving_calc.calculators.otu_calculator import OtuCalculator
+from diving_calc.common.arrays import as_array
+from diving_calc.depths.compact_profile import CompactProfile
+from diving_calc.physics.depth_converter import DepthConverter
+
+
+class ToxicityTotals(NamedTuple):
+    # shape (n,), CNS in % of each profile
+    cns: np.ndarray
+    # shape (n,), OTU of each profile
+    otu: np.ndarray
+
+
+class OxygenToxicityBatch:
+    """
+    Vectorized CnsCalculator and OtuCalculator, segment arguments are broadcasted against each other.
+    Segments of any count of profiles are evaluated in one pass, so whole dive logs are summed at once.
+    """
+
+    _noaa_ppO2 = np.array(CnsCalculator.noaa_ppO2)
+    # seconds, exceeding the last tabulated ppO2 means no allowed exposure
+    _noaa_limits = np.append(np.array(CnsCalculator.noaa_limits, dtype=float) * 60, 0)
+
+    def __init__(self, depth_converter: DepthConverter):
+        self.depth_converter = depth_converter
+
+    def cns(self, fO2: ArrayLike, start_depth: ArrayLike, end_depth: ArrayLike, duration: ArrayLike) -> np.ndarray:
+        """Calculates CNS in % of each segment at its average depth, see CnsCalculator.calculate."""
+        average_depth = (as_array(start_depth) + as_array(end_depth)) / 2
+        ppO2 = as_array(fO2) * self.depth_converter.to_bar_many(average_depth)
+        return CnsCalculator.rate_many(ppO2) * as_array(duration) * 100
+
+    def cns_integrated(self, fO2: ArrayLike, start_depth: ArrayLike, end_depth: ArrayLike,
+                       duration: ArrayLike) -> np.ndarray:
+        """
+        Calculates CNS in % of each segment by exact integration of the slope function over linear change of ppO2.
+        Each exponential piece is integrated in closed form only over the part of the segment in its ppO2 range.
+        """
+        fO2 = as_array(fO2)
+        ppO2_start = fO2 * self.depth_converter.to_bar_many(start_depth)
+        ppO2_end = fO2 * self.depth_converter.to_bar_many(end_depth)
+        ppO2_start, ppO2_end, duration = np.broadcast_arrays(ppO2_start, ppO2_end, as_array(duration))
+        low = np.minimum(ppO2_start, ppO2_end)
+        high = np.maximum(ppO2_start, ppO2_end)
+        change = high - low
+        flat = change == 0
+        # flat segments would divide by zero, they are exactly the average depth rate
+        result = np.where(flat, CnsCalculator.rate_many(ppO2_start) * duration, 0)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            for lower_bound, upper_bound, intercept, slope in CnsCalculator.slope_pieces:
+                piece_low = np.maximum(low, lower_bound)
+                piece_high = np.minimum(high, upper_bound)
+                integral = (np.exp(intercept + slope * piece_high) - np.exp(intercept + slope * piece_low)) / slope
+                seconds_per_bar = duration / change
+                result = np.where(~flat & (piece_high > piece_low), result + integral * seconds_per_bar, result)
+
+        return result * 100
+
+    def noaa_cns(self, fO2: ArrayLike, start_depth: ArrayLike, end_depth: ArrayLike,
+                 duration: ArrayLike) -> np.ndarray:
+        """Calculates CNS in % of each segment at its average depth using the NOAA limits table."""
+        average_depth = (as_array(start_depth) + as_array(end_depth)) / 2
+        ppO2 = as_array(fO2) * self.depth_converter.to_bar_many(average_depth)
+        return as_array(duration) / OxygenToxicityBatch.noaa_limit(ppO2) * 100
+
+    @staticmethod
+    def noaa_limit(ppO2: ArrayLike) -> np.ndarray:
+        """Vectorized CnsCalculator.noaa_limit, in seconds."""
+        ppO2 = as_array(ppO2)
+        indexes = np.searchsorted(OxygenToxicityBatch._noaa_ppO2, np.round(ppO2, CnsCalculator.noaa_precision))
+        limits = OxygenToxicityBatch._noaa_limits[indexes]
+        return np.where(ppO2 <= CnsCalculator.minimum_ppO2, np.inf, limits)
+
+    def otu(self, fO2: ArrayLike, start_depth: ArrayLike, end_depth: ArrayLike, duration: ArrayLike) -> np.ndarray:
+        """Calculates OTU of each segment, see OtuCalculator.calculate."""
+        fO2 = as_array(fO2)
+        ppO2_start = fO2 * self.depth_converter.to_bar_many(start_depth)
+        ppO2_end = fO2 * self.depth_converter.to_bar_many(end_depth)
+        return OtuCalculator.otu_many(ppO2_start, ppO2_end, as_array(duration))
+
+    def for_profiles(self, profiles: Sequence[CompactProfile]) -> ToxicityTotals:
+        """Calculates total CNS and OTU of each profile, segments of all profiles are evaluated together."""
+        counts = np.array([len(profile) for profile in profiles], dtype=np.intp)
+
+        if counts.sum() == 0:
+            return ToxicityTotals(np.zeros(len(profiles)), np.zeros(len(profiles)))
+
+        def column(name: str) -> np.ndarray:
+            return np.concatenate([getattr(profile, name) for profile in profiles])
+
+        columns = column('o2_fractions'), column('start_depths'), column('end_depths'), column('durations')
+        owners = np.repeat(np.arange(len(profiles)), counts)
+        cns = np.bincount(owners, self.cns(*columns), minlength=len(profiles))
+        otu = np.bincount(owners, self.otu(*columns), minlength=len(profiles))
+        return ToxicityTotals(cns, otu)
+
+    @staticmethod
+    def daily_totals(values: ArrayLike, divers: ArrayLike, days: ArrayLike) -> np.ndarray:
+        """
+        Sums values of dives (e.g. OTU) by diver and day.
+
+        :param values: Value of each dive, shape (n,).
+        :param divers: Zero based index of the diver of each dive, shape (n,).
+        :param days: Zero based index of the day of each dive, shape (n,).
+        :return: Totals of shape (divers count, days count).
+        """
+        divers = np.asarray(divers, dtype=np.intp)
+        days = np.asarray(days, dtype=np.intp)
+
+        if len(divers) == 0:
+            return np.zeros((0, 0))
+
+        shape = (int(divers.max()) + 1, int(days.max()) + 1)
+        totals = np.bincount(divers * shape[1] + days, as_array(values), minlength=shape[0] * shape[1])
+        return totals.reshape(shape)
@@ -0,0 +1,416 @@
+import argparse
+import json
+import os
+import shlex
+import sys
+from typing import Callable, Dict, List, Optional, Set, TextIO
+from diving_calc.algorithm.options import OptionDefaults
+from diving_calc.physics.pressure_converter import Salinity
+
+# Modules are imported by the commands which need them, so single calculation starts without NumPy
+Query = Callable[[argparse.Namespace], Dict[str, object]]
+
+_salinities = {
+    'fresh': Salinity.FRESH,
+    'brackish': Salinity.BRACKISH,
+    'salt': Salinity.SALT,
+}
+
+
+def parse_range(value: str) -> List[float]:
+    """Parses inclusive range 'start:stop:step' or comma separated list of numbers."""
+    try:
+        if ':' not in value:
+            return [float(item) for item in value.split(',')]
+
+        start, stop, step = (float(item) for item in value.split(':'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid range '{value}', expected 'start:stop:step' or list of numbers.")
+
+    if step <= 0 or stop < start:
+        raise argparse.ArgumentTypeError(f"Invalid range '{value}', step needs to be positive and stop after start.")
+
+    count = int((stop - start) // step) + 1
+    return [start + step * index for index in range(count)]
+
+
+def parse_gases(value: str) -> List[str]:
+    from diving_calc.gases.standard_gases import StandardGases
+
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if StandardGases.by_name(name) is None]
+
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown gases: {', '.join(unknown)}")
+
+    return names
+
+
+def parse_gas(value: str):
+    from diving_calc.gases.standard_gases import StandardGases
+
+    gas = StandardGases.by_name(value)
+    if gas is None:
+        raise argparse.ArgumentTypeError(f"Unknown gas '{value}'")
+
+    return gas
+
+
+class QueryParser(argparse.ArgumentParser):
+    """
+    Reports invalid query as an exception instead of exiting, so the next query can be answered.
+    Queries have no --help, which would print usage into the answers and exit.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('add_help', False)
+        super().__init__(*args, **kwargs)
+
+    def error(self, message: str):
+        raise ValueError(message)
+
+
+def add_queries(commands) -> None:
+    """Single calculations, each prints one JSON object."""
+    mod = commands.add_parser('mod', help='Maximum operating depth of nitrox in meters.')
+    mod.add_argument('--ppo2', type=float, required=True, help='Maximum partial pressure of oxygen in bars.')
+    mod.add_argument('--o2', type=float, required=True, help='Oxygen content in %%.')
+    add_water(mod)
+    mod.set_defaults(query=query_mod)
+
+    ead = commands.add_parser('ead', help='Equivalent air depth of nitrox in meters.')
+    ead.add_argument('--depth', type=float, required=True, help='Depth in meters.')
+    ead.add_argument('--o2', type=float, required=True, help='Oxygen content in %%.')
+    add_water(ead)
+    ead.set_defaults(query=query_ead)
+
+    best_mix = commands.add_parser('best-mix', help='Oxygen content in %% of best nitrox for the depth.')
+    best_mix.add_argument('--depth', type=float, required=True, help='Depth in meters.')
+    best_mix.add_argument('--ppo2', type=float, required=True, help='Maximum partial pressure of oxygen in bars.')
+    add_water(best_mix)
+    best_mix.set_defaults(query=query_best_mix)
+
+    partial_pressure = commands.add_parser('partial-pressure', help='Partial pressure of oxygen in bars.')
+    partial_pressure.add_argument('--depth', type=float, required=True, help='Depth in meters.')
+    partial_pressure.add_argument('--o2', type=float, required=True, help='Oxygen content in %%.')
+    add_water(partial_pressure)
+    partial_pressure.set_defaults(query=query_partial_pressure)
+
+    altitude = commands.add_parser('altitude', help='Altitude in meters for atmospheric pressure.')
+    altitude.add_argument('--pressure', type=float, required=True, help='Atmospheric pressure in bars.')
+    altitude.set_defaults(query=query_altitude)
+
+    pressure = commands.add_parser('pressure', help='Atmospheric pressure in bars at altitude.')
+    pressure.add_argument('--altitude', type=float, required=True, help='Altitude in meters above sea level.')
+    pressure.set_defaults(query=query_pressure)
+
+    theoretical_depth = commands.add_parser('theoretical-depth',
+                                            help='Sea level depth used to read tables for dive at altitude.')
+    theoretical_depth.add_argument('--depth', type=float, required=True, help='Depth in fresh water meters.')
+    theoretical_depth.add_argument('--altitude', type=float, required=True,
+                                   help='Altitude of the dive site in meters above sea level.')
+    theoretical_depth.set_defaults(query=query_theoretical_depth)
+
+    end = commands.add_parser('end', help='Equivalent narcotic depth in meters.')
+    end.add_argument('--depth', type=float, required=True, help='Depth in meters.')
+    end.add_argument('--gas', type=parse_gas, required=True, help="Gas name, e.g. 'EAN32' or '18/45'.")
+    add_narcotic(end)
+    add_water(end)
+    end.set_defaults(query=query_end)
+
+    mnd = commands.add_parser('mnd', help='Maximum narcotic depth in meters.')
+    mnd.add_argument('--gas', type=parse_gas, required=True, help="Gas name, e.g. 'EAN32' or '18/45'.")
+    mnd.add_argument('--max-end', type=float, default=OptionDefaults.max_end,
+                     help='Maximum equivalent narcotic depth in meters.')
+    add_narcotic(mnd)
+    add_water(mnd)
+    mnd.set_defaults(query=query_mnd)
+
+    ceiling = commands.add_parser('ceiling', help='Minimum depth in meters at which the gas is breathable.')
+    ceiling.add_argument('--gas', type=parse_gas, required=True, help="Gas name, e.g. 'EAN32' or '18/45'.")
+    add_water(ceiling)
+    ceiling.set_defaults(query=query_ceiling)
+
+    gas = commands.add_parser('gas', help='Content of the gas in %%.')
+    gas.add_argument('name', help="Gas name, e.g. 'EAN32' or '18/45'.")
+    gas.set_defaults(query=query_gas)
+
+    gases = commands.add_parser('gases', help='Names of standard gases.')
+    gases.add_argument('--nitrox', action='store_true', help='Only gases without helium.')
+    gases.set_defaults(query=query_gases)
+
+
+def add_water(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--salinity', choices=_salinities.keys(), default='salt')
+    parser.add_argument('--altitude', type=float, default=OptionDefaults.altitude,
+                        help='Altitude in meters above sea level.')
+
+
+def add_narcotic(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--oxygen-narcotic', action=argparse.BooleanOptionalAction,
+                        default=OptionDefaults.oxygen_narcotic, help='Consider oxygen as narcotic gas.')
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='diving-calc', description='Diving calculations from command line.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    add_queries(commands)
+
+    queries = commands.add_parser('queries', help='Answers queries read line by line, e.g. "mod --ppo2 1.4 --o2 32".')
+    queries.add_argument('--input', help='File with one query per line, default standard input.')
+    queries.set_defaults(handler=run_queries)
+
+    serve = commands.add_parser('serve', help='Local HTTP service answering the calculations as JSON.')
+    serve.add_argument('--host', default='127.0.0.1', help='Address to listen on, default only local connections.')
+    serve.add_argument('--port', type=int, default=8080)
+    serve.add_argument('--workers', type=int, default=None, help='Count of calculating threads, default count of CPUs.')
+    serve.add_argument('--max-batch', type=int, default=1024, help='Maximum count of requests calculated at once.')
+    serve.add_argument('--batch-window', type=float, default=1,
+                       help='Milliseconds to wait for other requests to calculate them in one batch.')
+    serve.add_argument('--max-pending', type=int, default=10000,
+                       help='Count of waiting requests above which new requests are rejected.')
+    serve.set_defaults(handler=run_serve)
+
+    batch = commands.add_parser('batch', help='Plans dive table for each depth, bottom time and gas.')
+    batch.add_argument('--depths', type=parse_range, default=parse_range('12:60:3'),
+                       help="Depths in meters as 'start:stop:step' or list, default 12:60:3.")
+    batch.add_argument('--times', type=parse_range, default=parse_range('10:60:5'),
+                       help="Bottom times in minutes as 'start:stop:step' or list, default 10:60:5.")
+    batch.add_argument('--gases', type=parse_gases, default=None,
+                       help='Comma separated names of standard gases, default all standard gases.')
+    batch.add_argument('--gf-low', type=float, default=OptionDefaults.gf_low, help='Gradient factor low in range 0-1.')
+    batch.add_argument('--gf-high', type=float, default=OptionDefaults.gf_high, help='Gradient factor high in range 0-1.')
+    batch.add_argument('--max-ppo2', type=float, default=OptionDefaults.max_ppO2, help='Maximum ppO2 at the bottom.')
+    batch.add_argument('--salinity', choices=_salinities.keys(), default='salt')
+    batch.add_argument('--altitude', type=float, default=OptionDefaults.altitude, help='Altitude in meters above sea level.')
+    batch.add_argument('--sac', type=float, default=20, help='Surface air consumption in liters/minute.')
+    batch.add_argument('--workers', type=int, default=None, help='Count of processes, default count of CPUs.')
+    batch.add_argument('--chunk-size', type=int, default=32, help='Count of plans sent to a process at once.')
+    batch.add_argument('--output', help='JSON lines file to write the rows to, default standard output.')
+    batch.add_argument('--resume', action='store_true', help='Skips rows already present in the output file.')
+    batch.set_defaults(handler=run_batch)
+    return parser
+
+
+def converter(args: argparse.Namespace):
+    from diving_calc.physics.depth_converter import shared_converters
+
+    return shared_converters.get(_salinities[args.salinity], args.altitude)
+
+
+def nitrox_calculator(args: argparse.Namespace):
+    from diving_calc.calculators.nitrox_calculator import NitroxCalculator
+
+    return NitroxCalculator(converter(args))
+
+
+def query_mod(args: argparse.Namespace) -> Dict[str, object]:
+    return {'mod': nitrox_calculator(args).mod(args.ppo2, args.o2)}
+
+
+def query_ead(args: argparse.Namespace) -> Dict[str, object]:
+    return {'ead': nitrox_calculator(args).ead(args.o2, args.depth)}
+
+
+def query_best_mix(args: argparse.Namespace) -> Dict[str, object]:
+    return {'best_mix': nitrox_calculator(args).best_mix(args.ppo2, args.depth)}
+
+
+def query_partial_pressure(args: argparse.Namespace) -> Dict[str, object]:
+    return {'partial_pressure': nitrox_calculator(args).partial_pressure(args.o2, args.depth)}
+
+
+def query_altitude(args: argparse.Namespace) -> Dict[str, object]:
+    from diving_calc.calculators.altitude_calculator import AltitudeCalculator
+
+    calculator = AltitudeCalculator()
+    calculator.pressure = args.pressure
+    return {'altitude': calculator.altitude}
+
+
+def query_pressure(args: argparse.Namespace) -> Dict[str, object]:
+    from diving_calc.calculators.altitude_calculator import AltitudeCalculator
+
+    return {'pressure': AltitudeCalculator(altitude=args.altitude).pressure}
+
+
+def query_theoretical_depth(args: argparse.Namespace) -> Dict[str, object]:
+    from diving_calc.calculators.altitude_calculator import AltitudeCalculator
+
+    return {'theoretical_depth': AltitudeCalculator(args.depth, args.altitude).theoretical_depth}
+
+
+def narcotic_fractions(args: argparse.Namespace):
+    """Fractions of nitrogen and oxygen, oxygen is 0 if not considered narcotic."""
+    fO2 = args.gas.o2_fraction if args.oxygen_narcotic else 0
+    return args.gas.n2_fraction, fO2
+
+
+def query_end(args: argparse.Namespace) -> Dict[str, object]:
+    from diving_calc.gases.gas_mixtures import GasMixtures
+
+    depth_converter = converter(args)
+    fN2, fO2 = narcotic_fractions(args)
+    narcotic_bars = GasMixtures.end(depth_converter.to_bar(args.depth), fN2, fO2)
+    # air has the narcotic index below 1, when oxygen isn't narcotic
+    air_fN2, air_fO2 = 1 - GasMixtures.o2_in_air, GasMixtures.o2_in_air if args.oxygen_narcotic else 0
+    bars = narcotic_bars / GasMixtures.narcotic_index(air_fN2, air_fO2)
+    end = depth_converter.from_bar(bars) if bars > depth_converter.surface_pressure else 0
+    return {'end': end}
+
+
+def query_mnd(args: argparse.Namespace) -> Dict[str, object]:
+    from diving_calc.gases.gas_mixtures import GasMixtures
+
+    depth_converter = converter(args)
+    fN2, fO2 = narcotic_fractions(args)
+    air_fN2, air_fO2 = 1 - GasMixtures.o2_in_air, GasMixtures.o2_in_air if args.oxygen_narcotic else 0
+    narcotic_bars = depth_converter.to_bar(args.max_end) * GasMixtures.narcotic_index(air_fN2, air_fO2)
+    bars = GasMixtures.mnd(narcotic_bars, fN2, fO2)
+    return {'mnd': depth_converter.from_bar(bars)}
+
+
+def query_ceiling(args: argparse.Namespace) -> Dict[str, object]:
+    from diving_calc.gases.gas_mixtures import GasMixtures
+
+    depth_converter = converter(args)
+    bars = GasMixtures.ceiling(args.gas.o2_fraction, depth_converter.surface_pressure)
+    return {'ceiling': depth_converter.from_bar(bars)}
+
+
+def query_gas(args: argparse.Namespace) -> Dict[str, object]:
+    from diving_calc.gases.standard_gases import StandardGases
+
+    gas = StandardGases.by_name(args.name)
+    if gas is None:
+        raise ValueError(f"Unknown gas '{args.name}'")
+
+    return {'name': args.name, 'o2': gas.o2_fraction * 100, 'he': gas.he_fraction * 100, 'n2': gas.n2_fraction * 100}
+
+
+def query_gases(args: argparse.Namespace) -> Dict[str, object]:
+    from diving_calc.gases.standard_gases import StandardGases
+
+    return {'gases': StandardGases.nitrox_names() if args.nitrox else StandardGases.all_names()}
+
+
+def answer(args: argparse.Namespace) -> Dict[str, object]:
+    """Result of the query, or error for values out of range of the calculation."""
+    try:
+        return args.query(args)
+    except (ValueError, ZeroDivisionError) as error:
+        return {'error': str(error) or type(error).__name__}
+
+
+def run_query(args: argparse.Namespace, stdout: TextIO) -> int:
+    row = answer(args)
+    stdout.write(json.dumps(row) + '\n')
+    return 1 if 'error' in row else 0
+
+
+def run_queries(args: argparse.Namespace, stdout: TextIO) -> int:
+    """Answers each line as soon as it is read, invalid query is answered by error and doesn't stop the rest."""
+    parser = QueryParser(prog='query')
+    add_queries(parser.add_subparsers(dest='command', required=True))
+    source = open(args.input) if args.input else sys.stdin
+    failed = 0
+
+    try:
+        for line in source:
+            if not line.strip():
+                continue
+
+            try:
+                row = answer(parser.parse_args(shlex.split(line)))
+            except ValueError as error:
+                row = {'error': str(error)}
+
+            failed += 'error' in row
+
+            stdout.write(json.dumps(row) + '\n')
+            stdout.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    return 1 if failed else 0
+
+
+def run_serve(args: argparse.Namespace, stdout: TextIO) -> int:
+    import asyncio
+    from diving_calc.service import CalculationService, serve_forever
+
+    service = CalculationService(args.workers, args.max_batch, args.batch_window / 1000, args.max_pending)
+    stdout.write(f'Serving on http://{args.host}:{args.port} with {service.workers} workers\n')
+    stdout.flush()
+
+    try:
+        asyncio.run(serve_forever(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+def run_batch(args: argparse.Namespace, stdout: TextIO) -> int:
+    from diving_calc.algorithm.batch_planner import BatchPlanner, PlanGrid
+    from diving_calc.algorithm.options import Options
+    from diving_calc.gases.standard_gases import StandardGases
+
+    options = Options(args.gf_low, args.gf_high, args.max_ppo2, salinity=_salinities[args.salinity])
+    options.altitude = args.altitude
+    grid = PlanGrid(args.depths, args.times, args.gases or StandardGases.all_names())
+    planner = BatchPlanner(options, args.workers, args.chunk_size, args.sac)
+    completed: Set[int] = set()
+
+    if args.resume:
+        if not args.output:
+            raise SystemExit('--resume requires --output file.')
+        completed = completed_rows(args.output)
+
+    output = open(args.output, 'a' if args.resume else 'w') if args.output else stdout
+    try:
+        for row in planner.plan(grid, completed):
+            output.write(json.dumps(row._asdict()) + '\n')
+            # each row is written completely, so interrupted batch can be resumed
+            output.flush()
+    finally:
+        if output is not stdout:
+            output.close()
+
+    return 0
+
+
+def completed_rows(path: str) -> Set[int]:
+    """Reads indexes of rows already written, incomplete last line of interrupted batch is removed."""
+    if not os.path.exists(path):
+        return set()
+
+    completed = set()
+    valid_length = 0
+    with open(path, 'rb') as file:
+        for line in file:
+            if not line.endswith(b'\n'):
+                break
+
+            try:
+                completed.add(json.loads(line)['index'])
+            except (ValueError, KeyError):
+                break
+
+            valid_length += len(line)
+
+    with open(path, 'r+b') as file:
+        file.truncate(valid_length)
+
+    return completed
+
+
+def main(argv: Optional[List[str]] = None, stdout: TextIO = sys.stdout) -> int:
+    args = create_parser().parse_args(argv)
+    handler = getattr(args, 'handler', run_query)
+    return handler(args, stdout)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
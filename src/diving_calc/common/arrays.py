@@ -0,0 +1,7 @@
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+def as_array(values: ArrayLike) -> np.ndarray:
+    """Converts scalars, sequences, NumPy arrays or buffers (array.array, memoryview) to float array without copy if possible."""
+    return np.asarray(values, dtype=np.float64)
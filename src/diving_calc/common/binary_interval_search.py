@@ -0,0 +1,81 @@
+from typing import Callable, NamedTuple
+
+
+class Interval(NamedTuple):
+    left: int
+    right: int
+
+
+class SearchContext:
+    def __init__(self, estimation_step: int, initial_value: int, max_value: int,
+                 meets_condition: Callable[[int], bool]):
+        """
+        Definition of the searched range.
+
+        :param estimation_step: Initial step used to find highest (upper boundary) limit.
+        :param initial_value: Lower boundary for the search.
+        :param max_value: Upper boundary extreme limit when searching its limit.
+        :param meets_condition: Decides, if the value is still in range. Each call has to be independent of the
+            previous ones, e.g. evaluated from the same tissues snapshot, because the values aren't ordered.
+        """
+        self.estimation_step = estimation_step
+        self.initial_value = initial_value
+        self.max_value = max_value
+        self.meets_condition = meets_condition
+
+
+class BinaryIntervalSearch:
+    """
+    High performance way to find the highest value still meeting the condition.
+    Used to predict no decompression limit or deco stop duration based on ceiling.
+    First the interval is found by estimation steps, then it is halved (https://en.wikipedia.org/wiki/Binary_search_algorithm).
+    """
+    # in our usage minimal step corresponds to one second or one minute
+    minimal_step = 1
+
+    def __init__(self):
+        # count of the condition evaluations done by last search
+        self.evaluations = 0
+
+    def search(self, context: SearchContext) -> int:
+        """
+        Returns the highest value meeting the condition, initial value in case it is not met at all.
+
+        :param context: Definition of the searched range.
+        """
+        if context.max_value < context.initial_value:
+            raise ValueError('Max value cant be smaller than initial value')
+
+        if context.estimation_step > context.max_value - context.initial_value:
+            raise ValueError('Step cant be larger than range')
+
+        self.evaluations = 0
+        limits = self._find_initial_limit(context)
+        return self._search_inside_interval(context, limits)
+
+    def _evaluate(self, context: SearchContext, value: int) -> bool:
+        self.evaluations += 1
+        return context.meets_condition(value)
+
+    def _search_inside_interval(self, context: SearchContext, limits: Interval) -> int:
+        left, right = limits
+        while right - left > BinaryIntervalSearch.minimal_step:
+            middle = (left + right) // 2
+
+            if self._evaluate(context, middle):
+                left = middle
+            else:
+                right = middle
+
+        return left
+
+    def _find_initial_limit(self, context: SearchContext) -> Interval:
+        """Guess right upper value by adding step to current value and prevent left 0 or positive value."""
+        current = context.initial_value
+
+        while self._evaluate(context, current) and current <= context.max_value:
+            current += context.estimation_step
+
+        left = max(current - context.estimation_step, context.initial_value)
+        right = min(current, context.max_value)
+        return Interval(left, right)
@@ -0,0 +1,43 @@
+import math
+
+
+class Precision:
+    """Rounding helpers, rounding half up the same way as the reference implementation does (not banker's rounding)."""
+
+    @staticmethod
+    def fix(source: float, digits: int = 10) -> float:
+        """Removes floating point noise, e.g. 3.999999999999999 becomes 4, before floor or ceil."""
+        return round(source, digits)
+
+    @staticmethod
+    def round(source: float, digits: int = 0) -> float:
+        return Precision._adapt(Precision._round_half_up, source, digits)
+
+    @staticmethod
+    def floor(source: float, digits: int = 0) -> float:
+        return Precision._adapt(math.floor, source, digits)
+
+    @staticmethod
+    def ceil(source: float, digits: int = 0) -> float:
+        return Precision._adapt(math.ceil, source, digits)
+
+    @staticmethod
+    def round_distance(source: float, distance: float) -> float:
+        return Precision._round_half_up(source / distance) * distance
+
+    @staticmethod
+    def floor_distance(source: float, distance: float) -> float:
+        return math.floor(source / distance) * distance
+
+    @staticmethod
+    def ceil_distance(source: float, distance: float) -> float:
+        return math.ceil(source / distance) * distance
+
+    @staticmethod
+    def _round_half_up(source: float) -> int:
+        return math.floor(source + 0.5)
+
+    @staticmethod
+    def _adapt(func, source: float, digits: int) -> float:
+        precision = math.pow(10, digits)
+        return func(source * precision) / precision
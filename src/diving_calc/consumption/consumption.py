@@ -0,0 +1,239 @@
+from typing import Callable, Dict, List, Optional
+from diving_calc.algorithm.algorithm_context import AlgorithmContext, PlanPrefix
+from diving_calc.algorithm.buhlmann_algorithm import AlgorithmParams, BuhlmannAlgorithm
+from diving_calc.algorithm.options import Options
+from diving_calc.algorithm.tissues import Tissues
+from diving_calc.common.binary_interval_search import BinaryIntervalSearch, SearchContext
+from diving_calc.common.precision import Precision
+from diving_calc.consumption.diver import Diver
+from diving_calc.consumption.tanks import Tank, Tanks
+from diving_calc.depths.segments import Segment, Segments
+from diving_calc.gases.standard_gases import Gas
+from diving_calc.physics.depth_converter import DepthConverter, DepthConverterFactory
+from diving_calc.physics.time import Time
+
+# Liters of gas at surface pressure to be consumed by each gas
+GasVolumes = Dict[Gas, float]
+
+
+class ConsumptionOptions:
+    def __init__(self, diver: Diver, primary_tank_reserve: float = 30, stage_tank_reserve: float = 20):
+        """
+        Defines how to consume the gases.
+
+        :param diver: Defines the breathing rates.
+        :param primary_tank_reserve: Minimum tank reserve for first tank in bars.
+        :param stage_tank_reserve: Minimum tank reserve for all other stage tanks in bars.
+        """
+        self.diver = diver
+        self.primary_tank_reserve = primary_tank_reserve
+        self.stage_tank_reserve = stage_tank_reserve
+
+
+class Consumption:
+    """Calculates tanks consumption during the dive and related variables (e.g. rock bottom)."""
+
+    # Minimum bars to keep in first tank, even for shallow dives
+    default_primary_reserve = 30
+    # Minimum bars to keep in stage tank, even for shallow dives
+    default_stage_reserve = 20
+
+    def __init__(self, depth_converter: DepthConverter, algorithm: Optional[BuhlmannAlgorithm] = None):
+        self.depth_converter = depth_converter
+        self.algorithm = algorithm or BuhlmannAlgorithm()
+
+    def consume_from_tanks(self, segments: List[Segment], options: Options, tanks: List[Tank],
+                           consumption_options: ConsumptionOptions, tissues: Optional[Tissues] = None) -> None:
+        """
+        Updates tanks consumption based on segments, also calculates emergency ascent using the decompression algorithm.
+        Emergency ascent is calculated at end of deepest point of the dive.
+
+        :param segments: Profile generated by algorithm including user defined and generated ascent.
+        :param options: Profile behavior options.
+        :param tanks: All tanks used to generate the profile, their gases need to fit all gases used in segments.
+        :param consumption_options: Defines how to consume the gases.
+        :param tissues: Tissues at start of the dive, None for first dive.
+        """
+        if len(segments) < 2:
+            raise ValueError('Profile needs to contain at least 2 segments.')
+
+        emergency_ascent = self.emergency_ascent(segments, options, tanks, tissues)
+        self.consume_with_ascent(segments, emergency_ascent, tanks, consumption_options)
+
+    def consume_with_ascent(self, segments: List[Segment], emergency_ascent: List[Segment], tanks: List[Tank],
+                            consumption_options: ConsumptionOptions) -> None:
+        """Updates tanks consumption based on segments, uses already calculated emergency ascent."""
+        if len(segments) < 2:
+            raise ValueError('Profile needs to contain at least 2 segments.')
+
+        if len(emergency_ascent) < 1:
+            raise ValueError('Emergency ascent needs to contain at least 1 segment.')
+
+        rmv = consumption_options.diver.rmv
+        to_consume = self._to_be_consumed(segments, {}, lambda _: rmv)
+        self._consume(to_consume, emergency_ascent, tanks, consumption_options)
+
+    def emergency_ascent(self, segments: List[Segment], options: Options, tanks: List[Tank],
+                         tissues: Optional[Tissues] = None, prefix: Optional[PlanPrefix] = None) -> List[Segment]:
+        """
+        Calculates ascent after problem solving at end of the deepest part of the profile.
+
+        :param prefix: Optional tissues already loaded by the deepest part of the profile.
+        :return: Problem solving segment followed by the calculated ascent.
+        """
+        deepest_part = Segments.from_collection(segments).deepest_part()
+        plan = Segments.from_collection(deepest_part)
+        last = plan.last()
+        plan.add_flat(last.gas, Time.to_seconds(options.problem_solving_duration))
+        params = AlgorithmParams(plan, Tanks.to_gases(tanks), options, tissues)
+        profile = self.algorithm.decompression(params, prefix)
+        return profile.segments[len(deepest_part):]
+
+    def max_bottom_time(self, source_segments: Segments, tanks: List[Tank], consumption_options: ConsumptionOptions,
+                        options: Options, tissues: Optional[Tissues] = None) -> float:
+        """
+        Calculates how long based on available gas can diver stay at depth of last segment.
+        Only the extended last segment, its ascent and consumption are calculated for each searched duration.
+
+        :param source_segments: User defined profile not ending at surface, last segment is used to prolong the dive.
+        :param tanks: The tanks used during the dive to check available gases.
+        :param consumption_options: Defines how to consume the gases.
+        :param options: Options used to calculate the ascent.
+        :param tissues: Tissues at start of the dive, None for first dive.
+        :return: Whole minutes of the total dive time until start of the ascent,
+            0 in case the duration is shorter than user defined segments.
+        """
+        probe = _BottomTimeProbe(self, source_segments, tanks, consumption_options, options, tissues)
+        context = SearchContext(
+            # choosing the step based on typical dive duration
+            estimation_step=40 * Time.ONE_MINUTE,
+            initial_value=0,
+            max_value=Time.ONE_DAY,
+            meets_condition=probe.has_reserve
+        )
+        added_duration = BinaryIntervalSearch().search(context)
+
+        # the estimated max. duration is shorter, than user defined segments
+        if added_duration == 0:
+            return 0
+
+        # Round down to minutes directly to ensure we are in range of enough value
+        total_duration = Time.to_minutes(source_segments.duration + added_duration)
+        return Precision.floor(total_duration)
+
+    def _consume(self, to_consume: GasVolumes, emergency_ascent: List[Segment], tanks: List[Tank],
+                 consumption_options: ConsumptionOptions) -> None:
+        Tanks.reset_consumption(tanks)
+        # Reserve needs to be first to be able to preserve it.
+        self._update_reserve(emergency_ascent, tanks, consumption_options)
+        remaining = self._consume_by_gases(tanks, to_consume, lambda tank: tank.reserve)
+        self._consume_by_gases(tanks, remaining, lambda _: 0)
+
+        for tank in tanks:
+            tank.consumed = Precision.ceil(tank.consumed)
+
+    def _update_reserve(self, emergency_ascent: List[Segment], tanks: List[Tank],
+                        consumption_options: ConsumptionOptions) -> None:
+        # Bottom gas = team stress rmv, deco gas = diver stress rmv
+        bottom_gas = tanks[0].gas if tanks else None
+        diver = consumption_options.diver
+
+        def reserve_rmv(segment: Segment) -> float:
+            return diver.team_stress_rmv if segment.gas.composition_equals(bottom_gas) else diver.stress_rmv
+
+        # here the consumed during emergency ascent means reserve
+        consumed = self._to_be_consumed(emergency_ascent, {}, reserve_rmv)
+
+        # add the reserve from opposite order than consumed gas
+        for index, tank in enumerate(tanks):
+            consumed_liters = consumed.get(tank.gas, 0)
+            # here we update only once, so we can directly round up
+            consumed_bars = min(Precision.ceil(consumed_liters / tank.size), tank.start_pressure)
+            minimal_reserve = consumption_options.primary_tank_reserve if index == 0 \
+                else consumption_options.stage_tank_reserve
+            tank.reserve = max(consumed_bars, minimal_reserve)
+            consumed[tank.gas] = max(consumed_liters - tank.reserve * tank.size, 0)
+
+    def _consume_by_gases(self, tanks: List[Tank], to_consume: GasVolumes,
+                          minimum: Callable[[Tank], float]) -> GasVolumes:
+        # distribute the consumed liters across all tanks with that gas starting from last one
+        # to consume stages first. This simulates open circuit procedure: First consume, what you can drop.
+        for tank in reversed(tanks):
+            remaining = to_consume.get(tank.gas, 0)
+            available_bars = max(tank.end_pressure - minimum(tank), 0)
+            really_consumed = min(remaining, available_bars * tank.size)
+            tank.consumed += really_consumed / tank.size
+            to_consume[tank.gas] = max(remaining - really_consumed, 0)
+
+        return to_consume
+
+    def _to_be_consumed(self, segments: List[Segment], to_consume: GasVolumes,
+                        get_rmv: Callable[[Segment], float]) -> GasVolumes:
+        """The only method which adds gas to consume, rmv in liters/minute."""
+        for segment in segments:
+            consumed_liters = self._consumed_by_segment(segment, Time.to_minutes(get_rmv(segment)))
+            to_consume[segment.gas] = to_consume.get(segment.gas, 0) + consumed_liters
+
+        return to_consume
+
+    def _consumed_by_segment(self, segment: Segment, rmv_seconds: float) -> float:
+        """Returns consumption in liters at segment average depth, rmv in liters/second."""
+        average_pressure = self.depth_converter.to_bar(segment.average_depth)
+        duration = Precision.round(segment.duration, 2)
+        return duration * average_pressure * rmv_seconds
+
+
+class _BottomTimeProbe:
+    """
+    Evaluates the dive extended by flat segment of given duration at the last depth.
+    Tissues and consumed gas of the user defined segments are calculated only once,
+    each probe loads only the added segment and its ascent.
+    """
+
+    def __init__(self, consumption: Consumption, source_segments: Segments, tanks: List[Tank],
+                 consumption_options: ConsumptionOptions, options: Options, tissues: Optional[Tissues]):
+        self.consumption = consumption
+        self.tanks = tanks
+        self.consumption_options = consumption_options
+        self.options = options
+        self.tissues = tissues
+        self.source_count = len(source_segments)
+        self.segments = source_segments.copy()
+        last = source_segments.last()
+        self.added = self.segments.add_flat(last.gas, 0)
+        self.params = AlgorithmParams(self.segments, Tanks.to_gases(tanks), options, tissues)
+        algorithm = consumption.algorithm
+        errors = algorithm.validate(self.segments, self.params.gases)
+
+        if errors:
+            raise ValueError(errors[0].message)
+
+        depth_converter = DepthConverterFactory(options).create()
+        context = AlgorithmContext(self.params.gases, source_segments.copy(), options, depth_converter,
+                                   self.params.start_tissues())
+        snapshots: List[PlanPrefix] = []
+        algorithm.swim_plan(context, snapshots=snapshots)
+        self.prefix = snapshots[-1]
+        rmv = consumption_options.diver.rmv
+        self.source_volumes = consumption._to_be_consumed(source_segments.items, {}, lambda _: rmv)
+        # emergency ascent starts after the added segment only if it is the deepest part of the dive
+        self.extends_deepest_part = last.end_depth == source_segments.max_depth
+        self.emergency_ascent = None if self.extends_deepest_part else \
+            consumption.emergency_ascent(source_segments.items, options, tanks, tissues)
+
+    def has_reserve(self, added_duration: int) -> bool:
+        self.added.duration = added_duration
+        algorithm = self.consumption.algorithm
+        snapshots: Optional[List[PlanPrefix]] = [] if self.extends_deepest_part else None
+        profile = algorithm.decompression(self.params, self.prefix, snapshots)
+        emergency_ascent = self.emergency_ascent
+
+        if self.extends_deepest_part:
+            emergency_ascent = self.consumption.emergency_ascent(self.segments.items, self.options, self.tanks,
+                                                                 self.tissues, snapshots[-1])
+
+        rmv = self.consumption_options.diver.rmv
+        to_consume = self.consumption._to_be_consumed(profile.segments[self.source_count:],
+                                                      dict(self.source_volumes), lambda _: rmv)
+        self.consumption._consume(to_consume, emergency_ascent, self.tanks, self.consumption_options)
+        return Tanks.have_reserve(self.tanks)
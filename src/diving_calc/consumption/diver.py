@@ -0,0 +1,30 @@
+from typing import Optional
+
+
+class Diver:
+    # liters/min
+    default_sac = 20
+
+    def __init__(self, rmv: float = default_sac, stress_rmv: Optional[float] = None):
+        """
+        :param rmv: Respiratory minute volume in liters/min.
+        :param stress_rmv: RMV in liters/min during a problem, usually 1.5x rmv for one diver only.
+        """
+        self.rmv = rmv
+        self.stress_rmv = stress_rmv or rmv * 1.5
+
+    @property
+    def team_stress_rmv(self) -> float:
+        """Gets stress RMV for two divers in liters/min, derived from stress_rmv."""
+        return self.stress_rmv * 2
+
+    @staticmethod
+    def gas_sac(rmv: float, tank_size: float) -> float:
+        """
+        Returns theoretical average consumption rate in bars/minute or bars/second based on rmv for given tank.
+        Not using compressibility, because we don't know the gas and the available pressure difference on the tank.
+
+        :param rmv: In liters/min or liters/second.
+        :param tank_size: In liters.
+        """
+        return rmv / tank_size
@@ -0,0 +1,62 @@
+from typing import List
+from diving_calc.gases.gases import Gases
+from diving_calc.gases.standard_gases import Gas, StandardGases
+
+
+class Tank:
+    def __init__(self, size: float, start_pressure: float, gas: Gas = StandardGases.air):
+        """
+        :param size: Water volume in liters.
+        :param start_pressure: Filled in bars of gas.
+        :param gas: Content of the tank.
+        """
+        self.size = size
+        self.start_pressure = start_pressure
+        self.gas = gas
+        # consumed pressure of gas in bars
+        self.consumed = 0
+        # pressure in bars, which should remain in the tank
+        self.reserve = 0
+
+    @property
+    def volume(self) -> float:
+        """Gets total volume at start pressure in liters."""
+        return self.size * self.start_pressure
+
+    @property
+    def reserve_volume(self) -> float:
+        return self.size * self.reserve
+
+    @property
+    def consumed_volume(self) -> float:
+        return self.size * self.consumed
+
+    @property
+    def end_pressure(self) -> float:
+        """Current pressure in bars, remaining gas in range 0 - start pressure."""
+        return max(self.start_pressure - self.consumed, 0)
+
+    @property
+    def has_reserve(self) -> bool:
+        """True, if remaining gas is greater or equal to reserve."""
+        return self.end_pressure >= self.reserve
+
+    def __repr__(self) -> str:
+        return f'Tank({self.size} L, {self.start_pressure} b, {self.gas})'
+
+
+class Tanks:
+    @staticmethod
+    def to_gases(tanks: List[Tank]) -> Gases:
+        """Everything except the first tank gas is considered as deco gas."""
+        return Gases(*(tank.gas for tank in tanks))
+
+    @staticmethod
+    def have_reserve(tanks: List[Tank]) -> bool:
+        return all(tank.has_reserve for tank in tanks)
+
+    @staticmethod
+    def reset_consumption(tanks: List[Tank]) -> None:
+        for tank in tanks:
+            tank.consumed = 0
+            tank.reserve = 0
@@ -0,0 +1,259 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from diving_calc.depths.segments import Segment
+from diving_calc.gases.standard_gases import Gas
+
+
+class CompactProfile:
+    """
+    Profile stored as parallel typed arrays instead of list of Segment instances.
+    Each row is one linear segment defined by start depth, end depth, duration and index of its gas in the gases table.
+    Arrays are preallocated and doubled when full, so appending is amortized O(1).
+    Rows are never modified in place, once they are visible, so prefixes share the arrays without copying.
+    """
+
+    def __init__(self, capacity: int = 16):
+        """:param capacity: Count of segments which fit into the arrays before first reallocation."""
+        capacity = max(capacity, 1)
+        self._start = np.empty(capacity)
+        self._end = np.empty(capacity)
+        self._duration = np.empty(capacity)
+        # run time in seconds at end of each segment
+        self._end_time = np.empty(capacity)
+        self._gas = np.empty(capacity, dtype=np.int16)
+        self._count = 0
+        self._max_depth = 0
+        self._gases: List[Gas] = []
+        self._gas_indexes: Dict[Gas, int] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def gases(self) -> List[Gas]:
+        """Gets copy of the gases table, gas indexes point to this list."""
+        return self._gases.copy()
+
+    @property
+    def start_depths(self) -> np.ndarray:
+        """Read only view of start depths in meters."""
+        return self._column(self._start)
+
+    @property
+    def end_depths(self) -> np.ndarray:
+        """Read only view of end depths in meters."""
+        return self._column(self._end)
+
+    @property
+    def durations(self) -> np.ndarray:
+        """Read only view of durations in seconds."""
+        return self._column(self._duration)
+
+    @property
+    def end_times(self) -> np.ndarray:
+        """Read only view of run times in seconds at end of each segment."""
+        return self._column(self._end_time)
+
+    @property
+    def gas_indexes(self) -> np.ndarray:
+        """Read only view of indexes to the gases table."""
+        return self._column(self._gas)
+
+    @property
+    def o2_fractions(self) -> np.ndarray:
+        """Oxygen fraction of the gas breathed during each segment."""
+        return np.array([gas.o2_fraction for gas in self._gases])[self.gas_indexes] if self._gases else np.empty(0)
+
+    @property
+    def he_fractions(self) -> np.ndarray:
+        """Helium fraction of the gas breathed during each segment."""
+        return np.array([gas.he_fraction for gas in self._gases])[self.gas_indexes] if self._gases else np.empty(0)
+
+    @property
+    def duration(self) -> float:
+        """Total duration of all segments in seconds."""
+        return float(self._end_time[self._count - 1]) if self._count else 0
+
+    @property
+    def max_depth(self) -> float:
+        """In meters."""
+        return self._max_depth
+
+    @property
+    def current_depth(self) -> float:
+        """Gets end depth of last segment in meters, 0 m if empty."""
+        return float(self._end[self._count - 1]) if self._count else 0
+
+    @staticmethod
+    def from_segments(segments: Iterable[Segment]) -> "CompactProfile":
+        """Copies values of all segments, doesn't fix start depths."""
+        segments = list(segments)
+        result = CompactProfile(len(segments))
+        for segment in segments:
+            result.append(segment.start_depth, segment.end_depth, segment.gas, segment.duration)
+        return result
+
+    def add(self, new_depth: float, gas: Gas, duration: float) -> None:
+        """Adds transition from current depth to new depth in meters using given gas for duration in seconds."""
+        self.append(self.current_depth, new_depth, gas, duration)
+
+    def add_flat(self, gas: Gas, duration: float) -> None:
+        """Adds continuation at current depth, used for stops or hovering."""
+        self.append(self.current_depth, self.current_depth, gas, duration)
+
+    def append(self, start_depth: float, end_depth: float, gas: Gas, duration: float) -> None:
+        """Adds segment defined by depths in meters and duration in seconds."""
+        index = self._count
+        if index == len(self._start):
+            self._reserve(2 * index)
+
+        self._start[index] = start_depth
+        self._end[index] = end_depth
+        self._duration[index] = duration
+        self._end_time[index] = self.duration + duration
+        self._gas[index] = self._gas_index(gas)
+        self._count += 1
+        self._max_depth = max(self._max_depth, end_depth)
+
+    def prefix(self, count: int) -> "CompactProfile":
+        """
+        Returns first count segments as new profile sharing the arrays with this one.
+        Both profiles can be extended independently, since appended rows are never visible to the other one.
+        """
+        count = min(max(count, 0), self._count)
+        result = CompactProfile.__new__(CompactProfile)
+        # the view is full, so first append reallocates its arrays
+        result._start = self._start[:count]
+        result._end = self._end[:count]
+        result._duration = self._duration[:count]
+        result._end_time = self._end_time[:count]
+        result._gas = self._gas[:count]
+        result._count = count
+        result._max_depth = float(result._end.max(initial=0))
+        result._gases = self._gases.copy()
+        result._gas_indexes = self._gas_indexes.copy()
+        return result
+
+    def copy(self) -> "CompactProfile":
+        """Independent copy of all segments."""
+        result = self.prefix(self._count)
+        result._reserve(max(self._count, 1))
+        return result
+
+    def segment(self, index: int) -> Segment:
+        """Creates Segment instance of the row at given index."""
+        if not -self._count <= index < self._count:
+            raise IndexError('Segment index out of range.')
+
+        index %= self._count
+        return Segment(float(self._start[index]), float(self._end[index]),
+                       self._gases[self._gas[index]], float(self._duration[index]))
+
+    def rows(self) -> Iterator[Tuple[float, float, float, Gas]]:
+        """Yields start depth, end depth, duration and gas of each segment without creating Segment instances."""
+        gases = self._gases
+        return zip(self.start_depths.tolist(), self.end_depths.tolist(), self.durations.tolist(),
+                   (gases[index] for index in self.gas_indexes.tolist()))
+
+    def to_segments(self) -> List[Segment]:
+        return [Segment(start, end, gas, duration) for start, end, duration, gas in self.rows()]
+
+    def speeds(self) -> np.ndarray:
+        """Meters per second for each segment, zero duration segments have no speed."""
+        durations = self.durations
+        with np.errstate(divide='ignore', invalid='ignore'):
+            speeds = (self.end_depths - self.start_depths) / durations
+        return np.where(durations == 0, 0, speeds)
+
+    def depth_at(self, run_time: float) -> float:
+        """
+        Finds depth in meters, at which the diver was at given run time in seconds.
+        Returns 0 m, if no segment fits the run time.
+        """
+        end_times = self.end_times
+        index = int(np.searchsorted(end_times, run_time, side='left'))
+
+        if run_time < 0 or index == self._count:
+            return 0
+
+        segment = self.segment(index)
+        start_time = float(end_times[index]) - segment.duration
+        return segment.depth_at(run_time - start_time)
+
+    def time_at(self, depth: float) -> Optional[float]:
+        """
+        Finds run time in seconds, when the diver reached given depth in meters for the first time.
+        Returns None, if the depth wasn't reached.
+        """
+        starts = self.start_depths
+        ends = self.end_depths
+        crossing = np.flatnonzero((np.minimum(starts, ends) <= depth) & (depth <= np.maximum(starts, ends)))
+
+        if len(crossing) == 0:
+            return None
+
+        segment = self.segment(int(crossing[0]))
+        start_time = float(self._end_time[crossing[0]]) - segment.duration
+        if segment.speed == 0:
+            return start_time
+
+        return start_time + (depth - segment.start_depth) / segment.speed
+
+    def average_depth(self) -> float:
+        """Calculates time weighted average depth in meters."""
+        durations = self.durations
+        total_duration = durations.sum()
+
+        if total_duration <= 0:
+            return 0
+
+        average_depths = (self.start_depths + self.end_depths) / 2
+        return float(np.dot(average_depths, durations) / total_duration)
+
+    def merge_flat(self, skip_items: int = 0) -> None:
+        """
+        Merges all neighbor segments with identical speed and gas into one.
+
+        :param skip_items: Number of items from start of the profile, which are never merged.
+        """
+        if skip_items < 0 or self._count < 2:
+            return
+
+        speeds = self.speeds()
+        gas_indexes = self.gas_indexes
+        mergeable = np.zeros(self._count, dtype=bool)
+        mergeable[1:] = (speeds[1:] == speeds[:-1]) & (gas_indexes[1:] == gas_indexes[:-1])
+        mergeable[:skip_items + 1] = False
+        kept = np.flatnonzero(~mergeable)
+        last_in_group = np.append(kept[1:] - 1, self._count - 1)
+
+        # new arrays keep the rows shared by prefixes unchanged
+        self._start = self.start_depths[kept]
+        self._end = self.end_depths[last_in_group]
+        self._duration = np.add.reduceat(self.durations, kept)
+        self._end_time = self.end_times[last_in_group]
+        self._gas = self.gas_indexes[kept]
+        self._count = len(kept)
+
+    def _column(self, values: np.ndarray) -> np.ndarray:
+        view = values[:self._count]
+        view.flags.writeable = False
+        return view
+
+    def _gas_index(self, gas: Gas) -> int:
+        index = self._gas_indexes.get(gas)
+
+        if index is None:
+            index = len(self._gases)
+            self._gases.append(gas)
+            self._gas_indexes[gas] = index
+
+        return index
+
+    def _reserve(self, capacity: int) -> None:
+        count = self._count
+        for name in ('_start', '_end', '_duration', '_end_time', '_gas'):
+            source = getattr(self, name)
+            values = np.empty(capacity, dtype=source.dtype)
+            values[:count] = source[:count]
+            setattr(self, name, values)
@@ -0,0 +1,44 @@
+from diving_calc.algorithm.options import SafetyStop
+from diving_calc.common.precision import Precision
+from diving_calc.physics.depth_converter import DepthConverter
+
+
+class DepthLevels:
+    def __init__(self, depth_converter: DepthConverter, options):
+        """
+        Generates depths of the stops during ascent.
+
+        :param depth_converter: Converter used to translate the pressure.
+        :param options: Options defining last_stop_depth, deco_stop_distance, safety_stop and minimum_auto_stop_depth.
+        """
+        self.depth_converter = depth_converter
+        self.options = options
+
+    def to_deco_stop(self, depth_pressure: float) -> float:
+        """Converts the pressure in bars to depth in meters rounded to nearest deco stop."""
+        depth = self.depth_converter.from_bar(depth_pressure)
+        return Precision.round_distance(depth, self.options.deco_stop_distance)
+
+    def next_stop(self, current_depth: float) -> float:
+        """Returns depth in meters of the next stop using deco stop distance increments, 0 m for ascent to surface."""
+        if current_depth <= self.options.last_stop_depth:
+            return 0
+
+        rounded = Precision.floor_distance(current_depth, self.options.deco_stop_distance)
+
+        if rounded != current_depth:
+            return rounded
+
+        result = current_depth - self.options.deco_stop_distance
+
+        if result <= self.options.last_stop_depth:
+            return self.options.last_stop_depth
+
+        return result
+
+    def add_safety_stop(self, current_depth: float, max_depth: float) -> bool:
+        """True, if the diver at current depth in meters should stay at safety stop."""
+        safety_stop = self.options.safety_stop
+        required = safety_stop == SafetyStop.ALWAYS or \
+            (safety_stop == SafetyStop.AUTO and max_depth > self.options.minimum_auto_stop_depth)
+        return required and current_depth == self.options.last_stop_depth
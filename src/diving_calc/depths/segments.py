@@ -0,0 +1,167 @@
+from typing import List
+from diving_calc.gases.standard_gases import Gas
+
+
+class Segment:
+    def __init__(self, start_depth: float, end_depth: float, gas: Gas, duration: float):
+        """
+        Represents linear transition between two depths breathing one gas.
+
+        :param start_depth: Depth in meters at beginning of the segment.
+        :param end_depth: Depth in meters at end of the segment.
+        :param gas: Gas breathed during the segment.
+        :param duration: Duration in seconds.
+        """
+        self.start_depth = start_depth
+        self.end_depth = end_depth
+        self.gas = gas
+        self.duration = duration
+
+    @property
+    def speed(self) -> float:
+        """Meters per second, positive for descent, negative for ascent."""
+        return Segment.speed_for(self.start_depth, self.end_depth, self.duration)
+
+    @property
+    def average_depth(self) -> float:
+        """In meters."""
+        return (self.start_depth + self.end_depth) / 2
+
+    @staticmethod
+    def speed_for(start_depth: float, end_depth: float, duration: float) -> float:
+        """Valid for both meters and bars, duration in seconds. Zero duration segments have no speed."""
+        if duration == 0:
+            return 0
+        return (end_depth - start_depth) / duration
+
+    def depth_at(self, duration: float) -> float:
+        """Returns depth in meters reached after given seconds since start of this segment."""
+        return self.start_depth + self.speed * duration
+
+    def content_equals(self, other: "Segment") -> bool:
+        return self.speed == other.speed and self.gas.composition_equals(other.gas)
+
+    def merge_from(self, other: "Segment") -> None:
+        self.duration += other.duration
+        self.end_depth = other.end_depth
+
+    def __repr__(self) -> str:
+        return f'Segment({self.start_depth}-{self.end_depth} m, {self.duration} s)'
+
+
+class Segments:
+    def __init__(self):
+        """Ordered collection of segments where each segment starts at end depth of the previous one."""
+        self._segments: List[Segment] = []
+        self._max_depth = 0
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    @property
+    def items(self) -> List[Segment]:
+        """Gets copy of managed items."""
+        return self._segments.copy()
+
+    @property
+    def max_depth(self) -> float:
+        """In meters."""
+        return self._max_depth
+
+    @property
+    def current_depth(self) -> float:
+        """Gets end depth of last segment in meters, 0 m if empty."""
+        if self._segments:
+            return self._segments[-1].end_depth
+        return 0
+
+    @property
+    def duration(self) -> float:
+        """Total duration of all segments in seconds."""
+        return Segments.duration_of(self._segments)
+
+    @staticmethod
+    def from_collection(segments: List[Segment]) -> "Segments":
+        """Deep copy of all elements, doesn't fix start depths."""
+        result = Segments()
+        for source in segments:
+            result._append(Segment(source.start_depth, source.end_depth, source.gas, source.duration))
+        return result
+
+    @staticmethod
+    def duration_of(segments: List[Segment]) -> float:
+        """Sum of all segments duration in seconds."""
+        return sum(segment.duration for segment in segments)
+
+    @staticmethod
+    def average_depth(segments: List[Segment]) -> float:
+        """Calculates time weighted average depth in meters from provided segments."""
+        cumulative_average = 0
+        total_duration = 0
+
+        # cumulative average prevents overflow for large segment durations
+        for segment in segments:
+            if segment.duration > 0:
+                cumulative_weight = segment.average_depth * segment.duration + total_duration * cumulative_average
+                total_duration += segment.duration
+                cumulative_average = cumulative_weight / total_duration
+
+        return cumulative_average
+
+    def add(self, new_depth: float, gas: Gas, duration: float) -> Segment:
+        """Adds transition from current depth to new depth in meters using given gas for duration in seconds."""
+        segment = Segment(self.current_depth, new_depth, gas, duration)
+        self._append(segment)
+        return segment
+
+    def add_flat(self, gas: Gas, duration: float) -> Segment:
+        """Adds continuation at current depth, used for stops or hovering."""
+        return self.add(self.current_depth, gas, duration)
+
+    def any(self) -> bool:
+        return len(self._segments) > 0
+
+    def last(self) -> Segment:
+        return self._segments[-1]
+
+    def copy(self) -> "Segments":
+        """Deep copy of managed items."""
+        return Segments.from_collection(self._segments)
+
+    def cut_down(self, count: int) -> None:
+        """Removes required number of segments from end of the collection."""
+        if count > 0:
+            del self._segments[-count:]
+
+    def merge_flat(self, skip_items: int = 0) -> List[Segment]:
+        """
+        Merges all neighbor segments with identical speed and gas into one.
+
+        :param skip_items: Number of items from start of the collection, which are never merged.
+        :return: Copy of managed items after the merge.
+        """
+        if skip_items < 0:
+            return self.items
+
+        removed = set()
+        for index in range(len(self._segments) - 1, skip_items, -1):
+            previous = self._segments[index - 1]
+            segment = self._segments[index]
+            if previous.content_equals(segment):
+                previous.merge_from(segment)
+                removed.add(index)
+
+        self._segments = [s for index, s in enumerate(self._segments) if index not in removed]
+        return self.items
+
+    def deepest_part(self) -> List[Segment]:
+        """Returns all segments up to the last one reaching the maximum depth."""
+        for index in range(len(self._segments) - 1, -1, -1):
+            if self._segments[index].end_depth == self._max_depth:
+                return self._segments[:index + 1]
+        return []
+
+    def _append(self, segment: Segment) -> None:
+        self._segments.append(segment)
+        if segment.end_depth > self._max_depth:
+            self._max_depth = segment.end_depth
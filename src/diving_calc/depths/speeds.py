@@ -0,0 +1,31 @@
+from diving_calc.depths.segments import Segments
+
+
+class AscentSpeeds:
+    SIX_METERS = 6
+
+    def __init__(self, options):
+        """
+        Resolves ascent speed by current depth.
+
+        :param options: Options defining ascent_speed_6m, ascent_speed_50perc_to_6m and ascent_speed_50perc in meters/minute.
+        """
+        self.options = options
+        # in meters
+        self.average_depth = 0
+
+    def mark_average_depth(self, profile: Segments) -> None:
+        """Use just before the ascent, speeds are calculated from average depth of the deepest part."""
+        self.average_depth = Segments.average_depth(profile.deepest_part())
+
+    def ascent(self, current_depth: float) -> float:
+        """Returns ascent speed in meters/minute at current depth in meters."""
+        half_to_6m = self.average_depth / 2
+
+        if current_depth > AscentSpeeds.SIX_METERS:
+            if current_depth > half_to_6m:
+                return self.options.ascent_speed_50perc
+
+            return self.options.ascent_speed_50perc_to_6m
+
+        return self.options.ascent_speed_6m
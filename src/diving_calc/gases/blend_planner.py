@@ -0,0 +1,154 @@
+from functools import lru_cache
+from itertools import combinations
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from diving_calc.gases.gas_blender import BlendStep
+from diving_calc.gases.gas_blender_batch import BlendStatus, GasBlenderBatch
+from diving_calc.gases.standard_gases import Gas
+from diving_calc.physics.compressibility import Compressibility
+
+
+class SupplyBank(NamedTuple):
+    gas: Gas
+    # in bars, cylinder can be topped from the bank only up to this pressure
+    pressure: float
+    # price of one liter of the gas at 1 bar
+    unit_price: float
+
+
+class CylinderFill(NamedTuple):
+    # in bars, gas already present in the cylinder
+    start_pressure: float
+    start_gas: Gas
+    # in bars, required pressure at the end of the fill
+    target_pressure: float
+    target_gas: Gas
+    # water volume of the cylinder in liters
+    size: float = 1
+
+
+class PlannedFill(NamedTuple):
+    fill: CylinderFill
+    # only the used banks in order of filling, empty if the fill isn't possible
+    steps: Tuple[BlendStep, ...] = ()
+    # price of the gas added by each step, calculated as amount multiplied by unit price
+    prices: Tuple[float, ...] = ()
+    # empty if the fill was planned
+    error: str = ''
+
+    @property
+    def total_price(self) -> float:
+        return sum(self.prices)
+
+
+class _Cheapest(NamedTuple):
+    """Cheapest blend of one liter cylinder, shared by all fills of the same start and target."""
+    # indexes of the used banks in order of filling
+    banks: Tuple[int, ...]
+    volumes: Tuple[float, ...]
+    pressures: Tuple[float, ...]
+    mixes: Tuple[Gas, ...]
+
+
+class BlendPlanner:
+    """
+    Finds the cheapest fill sequence from the available supply banks.
+    Topping volumes don't depend on order of the toppings, so each set of up to three banks is solved once,
+    all sets of the fill together by GasBlenderBatch. Sets of fewer banks are completed by unused pure gases.
+    Banks of each set are used from the lowest pressure, which is the only order, in which a set can reach
+    highest pressures. The banks aren't depleted by the fills.
+    """
+
+    # smaller volume in liters is considered as zero
+    tolerance = 1e-6
+    no_solution = 'No combination of the supply banks is able to blend the target mix.'
+    # pure oxygen, nitrogen and helium complete sets of fewer banks to solvable system, they are never used
+    _padding = (Gas(1, 0), Gas(0, 0), Gas(0, 1))
+
+    def __init__(self, banks: Sequence[SupplyBank], cache_size: int = 1024):
+        """
+        :param banks: Available source gases.
+        :param cache_size: Count of cached distinct start and target states.
+        """
+        for bank in banks:
+            if bank.unit_price < 0:
+                raise ValueError('unit_price must be positive number')
+
+            if bank.pressure < 0:
+                raise ValueError('pressure must be positive number')
+
+        # sorted by pressure, so each combination is already in order of filling
+        self.banks = sorted(banks, key=lambda bank: bank.pressure)
+        count = len(self.banks)
+        gases = [bank.gas for bank in self.banks] + list(BlendPlanner._padding)
+        # padding has the lowest pressure, so it is first in each combination
+        indexes = list(range(count, len(gases))) + list(range(count))
+        helium = [gas.he_fraction > 0 for gas in gases]
+        # nitrox needs two gases without helium, trimix three gases, at least one of them a bank with helium
+        pairs = [pair for pair in BlendPlanner._combinations(indexes, 2, count) if not any(helium[i] for i in pair)]
+        triples = [triple for triple in BlendPlanner._combinations(indexes, 3, count)
+                   if any(helium[i] for i in triple if i < count)]
+        self._pairs = np.array(pairs, dtype=np.intp).reshape(-1, 2)
+        self._triples = np.array(triples, dtype=np.intp).reshape(-1, 3)
+        self._fO2 = np.array([gas.o2_fraction for gas in gases])
+        self._fHe = np.array([gas.he_fraction for gas in gases])
+        # zero pressure of the padding doesn't allow to use it
+        self._pressures = np.array([bank.pressure for bank in self.banks] + [0] * len(BlendPlanner._padding))
+        self._prices = np.array([bank.unit_price for bank in self.banks] + [0] * len(BlendPlanner._padding))
+        self._cheapest = lru_cache(maxsize=cache_size)(self._search)
+
+    def plan(self, fill: CylinderFill) -> PlannedFill:
+        cheapest = self._cheapest(fill.start_pressure, fill.start_gas, fill.target_pressure, fill.target_gas)
+
+        if cheapest is None:
+            return PlannedFill(fill, error=BlendPlanner.no_solution)
+
+        steps = []
+        prices = []
+        for bank_index, volume, pressure, mix in zip(cheapest.banks, cheapest.volumes,
+                                                     cheapest.pressures, cheapest.mixes):
+            bank = self.banks[bank_index]
+            steps.append(BlendStep(bank.gas, volume * fill.size, pressure, mix))
+            prices.append(volume * fill.size * bank.unit_price)
+
+        return PlannedFill(fill, tuple(steps), tuple(prices))
+
+    def plan_queue(self, fills: Iterable[CylinderFill]) -> List[PlannedFill]:
+        """Plans all fills in order, cylinders of the same start and target state are searched only once."""
+        return [self.plan(fill) for fill in fills]
+
+    def cache_info(self):
+        return self._cheapest.cache_info()
+
+    @staticmethod
+    def _combinations(indexes: Sequence[int], size: int, count: int) -> Iterable[Tuple[int, ...]]:
+        """Combinations using at least one of the first count banks, the rest is padding."""
+        return (combo for combo in combinations(indexes, size) if any(index < count for index in combo))
+
+    def _search(self, start_pressure: float, start_gas: Gas, target_pressure: float,
+                target_gas: Gas) -> Optional[_Cheapest]:
+        start_helium = start_gas.he_fraction * Compressibility().normal_volume(start_pressure, start_gas)
+        target_helium = target_gas.he_fraction * Compressibility().normal_volume(target_pressure, target_gas)
+        # sets, which can't provide required helium or would need zero volume of some gas, are pruned
+        combos = self._triples if target_helium - start_helium > BlendPlanner.tolerance else self._pairs
+
+        if len(combos) == 0:
+            return None
+
+        solved = GasBlenderBatch.blend(start_pressure, start_gas.o2_fraction, start_gas.he_fraction,
+                                       target_pressure, target_gas.o2_fraction, target_gas.he_fraction,
+                                       self._fO2[combos], self._fHe[combos])
+        with np.errstate(invalid='ignore'):
+            used = solved.volumes > BlendPlanner.tolerance
+            reachable = ~used | (solved.pressures <= self._pressures[combos] + BlendPlanner.tolerance)
+        feasible = (solved.status == BlendStatus.OK) & reachable.all(axis=1)
+
+        if not feasible.any():
+            return None
+
+        costs = np.where(feasible, np.nansum(solved.volumes * self._prices[combos], axis=1), np.inf)
+        best = int(np.argmin(costs))
+        steps = used[best]
+        mixes = (Gas(o2, he) for o2, he in zip(solved.fO2[best][steps].tolist(), solved.fHe[best][steps].tolist()))
+        return _Cheapest(tuple(combos[best][steps].tolist()), tuple(solved.volumes[best][steps].tolist()),
+                         tuple(solved.pressures[best][steps].tolist()), tuple(mixes))
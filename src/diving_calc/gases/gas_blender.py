@@ -0,0 +1,118 @@
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from diving_calc.gases.gas_blender_batch import BlendStatus, GasBlenderBatch
+from diving_calc.gases.gas_names import GasNames
+from diving_calc.gases.standard_gases import Gas
+
+
+class FillRequest(NamedTuple):
+    # in bars, gas already present in the cylinder
+    start_pressure: float
+    start_gas: Gas
+    # in bars, required pressure at the end of the fill
+    target_pressure: float
+    target_gas: Gas
+    # gases in order of filling, three for trimix or two for gases without helium
+    toppings: Tuple[Gas, ...]
+    # water volume of the cylinder in liters
+    size: float = 1
+
+
+class BlendStep(NamedTuple):
+    # topping gas
+    gas: Gas
+    # in liters at 1 bar needed to fill the whole cylinder
+    volume: float
+    # in bars at the end of the topping
+    pressure: float
+    # content of the cylinder at the end of the topping
+    mix: Gas
+
+    @property
+    def gas_name(self) -> str:
+        return GasNames.name_for(self.gas.o2_fraction, self.gas.he_fraction)
+
+    @property
+    def mix_name(self) -> str:
+        return GasNames.name_for(self.mix.o2_fraction, self.mix.he_fraction)
+
+
+class BlendResult(NamedTuple):
+    request: FillRequest
+    # one step for each topping gas, empty if the blend failed
+    steps: Tuple[BlendStep, ...] = ()
+    # empty if the blend was calculated
+    error: str = ''
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.error
+
+    def volume_of(self, gas: Gas) -> float:
+        """Sum of liters of the gas at 1 bar used by all steps topping the gas."""
+        return sum(step.volume for step in self.steps if step.gas == gas)
+
+
+class GasBlender:
+    """
+    Plans partial pressure fills using real gas law. Any count of requests is solved together
+    by GasBlenderBatch, failed requests are reported by the result error instead of raising.
+    """
+
+    @staticmethod
+    def blend(request: FillRequest) -> BlendResult:
+        """Solves single fill, see blend_many."""
+        return GasBlender.blend_many([request])[0]
+
+    @staticmethod
+    def blend_many(requests: Sequence[FillRequest]) -> List[BlendResult]:
+        """
+        Solves all fills in one vectorized call for each count of topping gases.
+
+        :param requests: Fills to solve, each with two or three topping gases.
+        :return: Results in order of the requests.
+        """
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for index, request in enumerate(requests):
+            if len(request.toppings) not in (2, 3):
+                raise ValueError('Blending needs two or three topping gases.')
+            groups[len(request.toppings)].append(index)
+
+        results: List[Optional[BlendResult]] = [None] * len(requests)
+        for indexes in groups.values():
+            group = [requests[index] for index in indexes]
+            for index, result in zip(indexes, GasBlender._blend_group(group)):
+                results[index] = result
+
+        return results
+
+    @staticmethod
+    def _blend_group(requests: List[FillRequest]) -> List[BlendResult]:
+        def column(value) -> np.ndarray:
+            return np.fromiter((value(request) for request in requests), dtype=np.float64, count=len(requests))
+
+        toppings = [request.toppings for request in requests]
+        solved = GasBlenderBatch.blend(
+            column(lambda request: request.start_pressure),
+            column(lambda request: request.start_gas.o2_fraction),
+            column(lambda request: request.start_gas.he_fraction),
+            column(lambda request: request.target_pressure),
+            column(lambda request: request.target_gas.o2_fraction),
+            column(lambda request: request.target_gas.he_fraction),
+            np.array([[gas.o2_fraction for gas in gases] for gases in toppings]),
+            np.array([[gas.he_fraction for gas in gases] for gases in toppings]))
+
+        results = []
+        rows = zip(requests, solved.status.tolist(), solved.volumes.tolist(), solved.pressures.tolist(),
+                   solved.fO2.tolist(), solved.fHe.tolist())
+        for request, status, volumes, pressures, fO2, fHe in rows:
+            if status != BlendStatus.OK:
+                results.append(BlendResult(request, error=BlendStatus.messages[status]))
+                continue
+
+            steps = tuple(BlendStep(gas, volume * request.size, pressure, Gas(o2, he))
+                          for gas, volume, pressure, o2, he in zip(request.toppings, volumes, pressures, fO2, fHe))
+            results.append(BlendResult(request, steps))
+
+        return results
@@ -0,0 +1,143 @@
+from typing import NamedTuple
+import numpy as np
+from numpy.typing import ArrayLike
+from diving_calc.common.arrays import as_array
+from diving_calc.physics.compressibility_batch import CompressibilityBatch
+
+
+class BlendStatus:
+    OK = 0
+    # fractions out of range 0-1 or negative pressure
+    INVALID = 1
+    # composition of the topping gases doesn't allow to reach any mix, e.g. two equal gases
+    DEGENERATE = 2
+    # the target mix would need to remove some gas from the cylinder
+    IMPOSSIBLE = 3
+
+    messages = {
+        OK: '',
+        INVALID: 'Gas content needs to be in range 0-1 and pressures need to be positive.',
+        DEGENERATE: 'Cannot mix with degenerate gases.',
+        IMPOSSIBLE: 'Impossible to blend the target mix with these gases.',
+    }
+
+
+class BlendArrays(NamedTuple):
+    """Blending of n cylinders topped by k gases, all values NaN for rows, which status isn't OK."""
+    # shape (n, k), normal liters at 1 bar of each topping gas per liter of cylinder volume
+    volumes: np.ndarray
+    # shape (n, k), pressures in bars after each topping
+    pressures: np.ndarray
+    # shape (n, k), fractions of oxygen in the cylinder after each topping
+    fO2: np.ndarray
+    # shape (n, k), fractions of helium in the cylinder after each topping
+    fHe: np.ndarray
+    # shape (n,), one of BlendStatus values
+    status: np.ndarray
+
+
+class GasBlenderBatch:
+    """
+    Vectorized real gas partial pressure blending, see https://github.com/atdotde/realblender.
+    Each cylinder is topped by the topping gases in given order. Volumes of the toppings are solution
+    of linear system, where each row balances amount of oxygen, helium and nitrogen.
+    Volumes are normal volumes, so the Z-factor is applied only to the start and final pressures.
+    """
+
+    # smaller volume in liters is considered as zero
+    tolerance = 1e-9
+
+    @staticmethod
+    def blend(start_pressure: ArrayLike, start_fO2: ArrayLike, start_fHe: ArrayLike,
+              target_pressure: ArrayLike, target_fO2: ArrayLike, target_fHe: ArrayLike,
+              topping_fO2: ArrayLike, topping_fHe: ArrayLike) -> BlendArrays:
+        """
+        Solves blending of all cylinders at once.
+
+        :param start_pressure: Pressures in bars of the gas already present in cylinders, shape (n,).
+        :param start_fO2: Fractions of oxygen of the gas already present in cylinders, shape (n,).
+        :param start_fHe: Fractions of helium of the gas already present in cylinders, shape (n,).
+        :param target_pressure: Required pressures in bars, shape (n,).
+        :param target_fO2: Required fractions of oxygen, shape (n,).
+        :param target_fHe: Required fractions of helium, shape (n,).
+        :param topping_fO2: Fractions of oxygen of the topping gases in order of filling, shape (n, k) or (k,),
+            where k is 3 for trimix or 2 for gases without helium. Single cylinder may be solved for n sets of toppings.
+        :param topping_fHe: Fractions of helium of the topping gases, shape as topping_fO2.
+        """
+        rows = [np.atleast_1d(as_array(values)) for values in
+                (start_pressure, start_fO2, start_fHe, target_pressure, target_fO2, target_fHe)]
+        topping_fO2 = np.atleast_2d(as_array(topping_fO2))
+        topping_fHe = np.atleast_2d(as_array(topping_fHe))
+        shape = np.broadcast_shapes(*(values.shape for values in rows), topping_fO2.shape[:1], topping_fHe.shape[:1])
+        count = shape[0]
+        start_pressure, start_fO2, start_fHe, target_pressure, target_fO2, target_fHe = \
+            (np.broadcast_to(values, shape) for values in rows)
+        topping_fO2 = np.broadcast_to(topping_fO2, (count, topping_fO2.shape[1]))
+        topping_fHe = np.broadcast_to(topping_fHe, topping_fO2.shape)
+        toppings = topping_fO2.shape[1]
+
+        if toppings not in (2, 3):
+            raise ValueError('Blending needs two or three topping gases.')
+
+        status = np.full(count, BlendStatus.OK, dtype=np.int8)
+        valid = GasBlenderBatch._valid_mix(start_fO2, start_fHe) & \
+            GasBlenderBatch._valid_mix(target_fO2, target_fHe) & \
+            GasBlenderBatch._valid_mix(topping_fO2, topping_fHe).all(axis=1) & \
+            (start_pressure >= 0) & (target_pressure >= 0)
+        status[~valid] = BlendStatus.INVALID
+
+        if toppings == 2:
+            # pure helium balances the helium row, it has to stay unused, since it isn't available
+            topping_fO2 = np.column_stack((topping_fO2, np.zeros(count)))
+            topping_fHe = np.column_stack((topping_fHe, np.ones(count)))
+
+        # columns are the toppings, rows balance oxygen, helium and nitrogen
+        matrix = np.stack((topping_fO2, topping_fHe, 1 - topping_fO2 - topping_fHe), axis=1)
+        start_volume = CompressibilityBatch.normal_volume(start_pressure, start_fO2, start_fHe)
+        target_volume = CompressibilityBatch.normal_volume(target_pressure, target_fO2, target_fHe)
+        target_fractions = (target_fO2, target_fHe, 1 - target_fO2 - target_fHe)
+        start_fractions = (start_fO2, start_fHe, 1 - start_fO2 - start_fHe)
+        missing = np.stack([target_volume * target - start_volume * start
+                            for target, start in zip(target_fractions, start_fractions)], axis=1)
+
+        # invalid rows may contain anything, so they are replaced by singular matrix
+        determinants = np.linalg.det(np.where(valid[:, np.newaxis, np.newaxis], matrix, 1))
+        degenerate = valid & (np.abs(determinants) < GasBlenderBatch.tolerance)
+        status[degenerate] = BlendStatus.DEGENERATE
+        solvable = status == BlendStatus.OK
+
+        volumes = np.full((count, 3), np.nan)
+        if solvable.any():
+            volumes[solvable] = np.linalg.solve(matrix[solvable], missing[solvable][..., np.newaxis])[..., 0]
+
+        impossible = solvable & (volumes < -GasBlenderBatch.tolerance).any(axis=1)
+        if toppings == 2:
+            impossible |= solvable & (volumes[:, 2] > GasBlenderBatch.tolerance)
+            volumes = volumes[:, :2]
+            matrix = matrix[:, :, :2]
+
+        status[impossible] = BlendStatus.IMPOSSIBLE
+        volumes[status != BlendStatus.OK] = np.nan
+        # rounding errors may result in tiny negative volumes of not used gases
+        volumes = np.maximum(volumes, 0)
+
+        cumulative = start_volume[:, np.newaxis] + np.cumsum(volumes, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fO2 = (start_fO2 * start_volume)[:, np.newaxis] + np.cumsum(volumes * matrix[:, 0], axis=1)
+            fHe = (start_fHe * start_volume)[:, np.newaxis] + np.cumsum(volumes * matrix[:, 1], axis=1)
+            fO2 = np.where(cumulative > 0, fO2 / cumulative, 0)
+            fHe = np.where(cumulative > 0, fHe / cumulative, 0)
+
+        pressures = CompressibilityBatch.pressure(cumulative, fO2, fHe)
+        pressures = np.where(cumulative > 0, pressures, 0)
+        # the last topping ends exactly at the target
+        pressures[:, -1] = target_pressure
+        failed = status != BlendStatus.OK
+        for values in (pressures, fO2, fHe):
+            values[failed] = np.nan
+
+        return BlendArrays(volumes, pressures, fO2, fHe, status)
+
+    @staticmethod
+    def _valid_mix(fO2: np.ndarray, fHe: np.ndarray) -> np.ndarray:
+        return (fO2 >= 0) & (fO2 <= 1) & (fHe >= 0) & (fHe <= 1) & (fO2 + fHe <= 1)
@@ -0,0 +1,41 @@
+from diving_calc.gases.standard_gases import Gas
+from diving_calc.physics.depth_converter import DepthConverter
+
+
+class GasDensity:
+    """
+    Approximate gas density of oxygen, nitrogen, helium mixture.
+    https://dan.org/alert-diver/article/performance-under-pressure/
+    """
+    # In gram/liter as middle of ideal gas density of 5.2 g/L, with an absolute maximum of 6.2 g/L
+    recommended_maximum = 5.7
+    # Constants as g/l at 1 ATA
+    helium = 0.179
+    nitrogen = 1.251
+    oxygen = 1.428
+
+    @staticmethod
+    def for_gas(gas: Gas) -> float:
+        """Calculates approximate gas density of the mixture at 1 ATA."""
+        return GasDensity.for_content(gas.o2_fraction, gas.he_fraction)
+
+    @staticmethod
+    def for_content(fO2: float, fHe: float) -> float:
+        """
+        Calculates approximate gas density of oxygen, nitrogen, helium mixture at 1 ATA.
+
+        :param fO2: Fraction of oxygen in range 0-1.
+        :param fHe: Fraction of helium in range 0-1.
+        :return: Density in g/l.
+        """
+        fN2 = 1 - fO2 - fHe
+        return GasDensity.nitrogen * fN2 + GasDensity.oxygen * fO2 + GasDensity.helium * fHe
+
+
+class DensityAtDepth:
+    def __init__(self, depth_converter: DepthConverter):
+        self.depth_converter = depth_converter
+
+    def at_depth(self, gas: Gas, depth: float) -> float:
+        """Gas density in g/l of the gas at depth in meters."""
+        return GasDensity.for_gas(gas) * self.depth_converter.to_bar(depth)
@@ -0,0 +1,199 @@
+import math
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from diving_calc.gases.gas_mixtures import GasMixtures
+from diving_calc.gases.standard_gases import Gas
+from diving_calc.physics.depth_converter import DepthConverter
+
+
+class GasRange(NamedTuple):
+    gas: Gas
+    # shallowest depth in meters, at which the gas is breathable
+    ceiling: float
+    # deepest depth in meters, at which the gas can be used, usually minimum of MOD and MND
+    max_depth: float
+
+
+class GasIndex:
+    """
+    Interval index of depth ranges in which the gases can be used, answering the best gas at depth by binary search.
+    Boundaries of all ranges split the depths into levels: each boundary itself and the depths between two boundaries.
+    Each level stores its best gas, which is the gas with the highest oxygen content, for equal content the gas added
+    first. Adding or removing a gas evaluates again only the levels covered by its range.
+    """
+
+    def __init__(self, ranges: Iterable[GasRange] = ()):
+        # ascending depths of range boundaries and count of ranges using each of them
+        self._bounds: List[float] = []
+        self._usages: Dict[float, int] = {}
+        # level 2 * i + 1 is the boundary i, level 2 * i are depths between boundaries i - 1 and i
+        self._levels: List[Optional[Gas]] = [None]
+        self._ranges: Dict[Gas, GasRange] = {}
+        # order in which gases were added, used to select from gases with equal oxygen content
+        self._order: Dict[Gas, int] = {}
+        self._added = 0
+        self._switch_depths: Dict[Gas, float] = {}
+
+        for gas_range in ranges:
+            self.add(gas_range)
+
+    @staticmethod
+    def for_gases(gases: Iterable[Gas], depth_converter: DepthConverter, max_ppO2: float,
+                  max_end: float = GasMixtures.max_end, oxygen_narcotic: bool = True) -> "GasIndex":
+        """
+        Creates index of ranges between ceiling and minimum of MOD and MND of each gas.
+
+        :param depth_converter: Converter used to translate the pressures to depths.
+        :param max_ppO2: Maximum partial pressure of oxygen in bars defining the MOD.
+        :param max_end: Maximum equivalent narcotic depth in meters defining the MND.
+        :param oxygen_narcotic: True, if oxygen is considered narcotic for MND.
+        """
+        index = GasIndex()
+        for gas in gases:
+            if gas not in index:
+                index.add(GasIndex.gas_range(gas, depth_converter, max_ppO2, max_end, oxygen_narcotic))
+        return index
+
+    @staticmethod
+    def gas_range(gas: Gas, depth_converter: DepthConverter, max_ppO2: float,
+                  max_end: float = GasMixtures.max_end, oxygen_narcotic: bool = True) -> GasRange:
+        surface_pressure = depth_converter.surface_pressure
+        fO2 = gas.o2_fraction
+        mod_bars = GasMixtures.mod(max_ppO2, fO2)
+        mnd_bars = GasIndex.mnd_pressure(gas, depth_converter.to_bar(max_end), oxygen_narcotic)
+        ceiling_bars = GasMixtures.ceiling(fO2, surface_pressure)
+        # not usable at all, if the limits are lower than surface pressure
+        max_bars = max(min(mod_bars, mnd_bars), surface_pressure)
+        return GasRange(gas, depth_converter.from_bar(ceiling_bars), depth_converter.from_bar(max_bars))
+
+    @staticmethod
+    def mnd_pressure(gas: Gas, max_end_pressure: float, oxygen_narcotic: bool = True) -> float:
+        """Maximum narcotic depth in bars, infinity for gas without narcotic components, e.g. oxygen."""
+        fO2 = gas.o2_fraction if oxygen_narcotic else 0
+        if GasMixtures.narcotic_index(gas.n2_fraction, fO2) == 0:
+            return math.inf
+        return GasMixtures.mnd(max_end_pressure, gas.n2_fraction, fO2)
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def __contains__(self, gas: Gas) -> bool:
+        return gas in self._ranges
+
+    @property
+    def ranges(self) -> List[GasRange]:
+        """Ranges in order in which they were added."""
+        return sorted(self._ranges.values(), key=lambda gas_range: self._order[gas_range.gas])
+
+    def add(self, gas_range: GasRange) -> None:
+        """Adds the range, range of already added gas is replaced, but the gas keeps its order."""
+        gas = gas_range.gas
+        if gas in self._ranges:
+            order = self._order[gas]
+            self.remove(gas)
+            self._order[gas] = order
+        else:
+            self._order[gas] = self._added
+            self._added += 1
+
+        self._ranges[gas] = gas_range
+        if gas_range.ceiling <= gas_range.max_depth:
+            self._add_bound(gas_range.ceiling)
+            self._add_bound(gas_range.max_depth)
+            # the new gas can only replace the best gas of levels in its range
+            for level in self._covered(gas_range):
+                if self._is_better(gas, self._levels[level]):
+                    self._levels[level] = gas
+
+        self._update_switch_depths()
+
+    def remove(self, gas: Gas) -> None:
+        """:raises KeyError: The gas isn't in the index."""
+        gas_range = self._ranges.pop(gas)
+        if gas_range.ceiling <= gas_range.max_depth:
+            # only levels, where the removed gas was the best need new best gas
+            for level in self._covered(gas_range):
+                if self._levels[level] is gas:
+                    self._levels[level] = self._best_at(self._level_depth(level))
+            self._remove_bound(gas_range.max_depth)
+            self._remove_bound(gas_range.ceiling)
+
+        del self._order[gas]
+        self._update_switch_depths()
+
+    def best_gas(self, depth: float) -> Optional[Gas]:
+        """Gas with the highest oxygen content usable at depth in meters, None if no gas can be used there."""
+        return self._levels[self._level(depth)]
+
+    def switch_depth(self, gas: Gas) -> Optional[float]:
+        """
+        Deepest depth in meters, at which the gas becomes the best gas during ascent,
+        None if the gas is never the best gas.
+        """
+        return self._switch_depths.get(gas)
+
+    def _level(self, depth: float) -> int:
+        index = bisect_left(self._bounds, depth)
+        if index < len(self._bounds) and self._bounds[index] == depth:
+            return 2 * index + 1
+        return 2 * index
+
+    def _level_depth(self, level: int) -> float:
+        """Any depth inside the level."""
+        bounds = self._bounds
+        index = level // 2
+        if level % 2:
+            return bounds[index]
+        if index == 0:
+            return bounds[0] - 1
+        if index == len(bounds):
+            return bounds[-1] + 1
+        return (bounds[index - 1] + bounds[index]) / 2
+
+    def _covered(self, gas_range: GasRange) -> range:
+        return range(self._level(gas_range.ceiling), self._level(gas_range.max_depth) + 1)
+
+    def _is_better(self, gas: Gas, best: Optional[Gas]) -> bool:
+        if best is None or gas.o2_fraction > best.o2_fraction:
+            return True
+        return gas.o2_fraction == best.o2_fraction and self._order[gas] < self._order[best]
+
+    def _best_at(self, depth: float) -> Optional[Gas]:
+        best = None
+        for gas_range in self._ranges.values():
+            if gas_range.ceiling <= depth <= gas_range.max_depth and self._is_better(gas_range.gas, best):
+                best = gas_range.gas
+        return best
+
+    def _add_bound(self, depth: float) -> None:
+        usages = self._usages.get(depth, 0)
+        self._usages[depth] = usages + 1
+        if usages:
+            return
+
+        # splits the level containing the new boundary, both new levels inherit its best gas
+        level = self._level(depth)
+        best = self._levels[level]
+        insort(self._bounds, depth)
+        self._levels[level:level + 1] = [best, best, best]
+
+    def _remove_bound(self, depth: float) -> None:
+        self._usages[depth] -= 1
+        if self._usages[depth]:
+            return
+
+        del self._usages[depth]
+        level = self._level(depth)
+        del self._bounds[level // 2]
+        # merges the boundary with levels around, which don't differ any more, because no range ends there
+        self._levels[level - 1:level + 2] = [self._levels[level - 1]]
+
+    def _update_switch_depths(self) -> None:
+        """Upper boundary of the deepest level of each gas, levels are scanned from the deepest."""
+        switch_depths: Dict[Gas, float] = {}
+        bounds = self._bounds
+        for level in range(len(self._levels) - 1, -1, -1):
+            best = self._levels[level]
+            if best is not None and best not in switch_depths:
+                switch_depths[best] = bounds[level // 2]
+        self._switch_depths = switch_depths
@@ -0,0 +1,125 @@
+import numpy as np
+from numpy.typing import ArrayLike
+from diving_calc.common.arrays import as_array
+from diving_calc.gases.gas_mixtures import GasMixtures
+from diving_calc.physics.depth_converter import DepthConverter
+
+
+class GasMixturesBatch:
+    """
+    Vectorized version of GasMixtures working with whole arrays at once.
+    All arguments are broadcasted against each other, so e.g. depths[:, np.newaxis] with fractions[np.newaxis, :]
+    evaluates full depth x mix grid. Invalid elements (e.g. zero fraction of oxygen) result in NaN
+    instead of raising the error for the whole batch.
+    """
+
+    @staticmethod
+    def partial_pressure(abs_pressure: ArrayLike, volume_fraction: ArrayLike) -> np.ndarray:
+        """
+        Calculates the partial pressure of a gas component from the volume gas fraction and total pressure.
+
+        :param abs_pressure: The total pressures P in bars.
+        :param volume_fraction: The volume fractions of gas component measured as percentage in decimal.
+        :return: The partial pressures of gas component in bar absolute.
+        """
+        return as_array(abs_pressure) * as_array(volume_fraction)
+
+    @staticmethod
+    def mod(ppO2: ArrayLike, fO2: ArrayLike) -> np.ndarray:
+        """
+        Calculates Maximum operation depth for given mixes.
+
+        :param ppO2: Partial pressure constants.
+        :param fO2: Fractions of Oxygen in gas.
+        :return: Depths in bars, NaN for not positive fraction of oxygen.
+        """
+        fO2 = as_array(fO2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = as_array(ppO2) / fO2
+        return np.where(fO2 > 0, result, np.nan)
+
+    @staticmethod
+    def best_mix(pO2: ArrayLike, depth: ArrayLike, depth_converter: DepthConverter) -> np.ndarray:
+        """
+        Calculates best mix of nitrox gas for given depths.
+
+        :param pO2: Partial pressure constants.
+        :param depth: Current depths in meters.
+        :param depth_converter: Converter used to translate the pressure.
+        :return: Fractions of oxygen in required gas (0-1), NaN for not positive pressure.
+        """
+        bar = depth_converter.to_bar_many(depth)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = np.minimum(as_array(pO2) / bar, 1)
+        return np.where(bar > 0, result, np.nan)
+
+    @staticmethod
+    def ead(fO2: ArrayLike, depth: ArrayLike, o2_in_air: float = GasMixtures.o2_in_air) -> np.ndarray:
+        """
+        Calculates equivalent air depth for given nitrox gas mixes.
+
+        :param fO2: Fractions of Oxygen in gas mix (0-1).
+        :param depth: Current depths in bars.
+        :param o2_in_air: Theoretical/default fraction of oxygen content in air.
+        :return: Depths in bars. May return pressure lower than surface pressure!
+        """
+        fN2 = 1 - as_array(fO2)
+        nitrox_in_air = 1 - o2_in_air
+        return GasMixturesBatch.end(depth, fN2) / nitrox_in_air
+
+    @staticmethod
+    def end(current_depth: ArrayLike, fN2: ArrayLike, fO2: ArrayLike = 0) -> np.ndarray:
+        """
+        Calculates equivalent narcotic depths, see GasMixtures.end.
+
+        :param current_depth: Current depths in bars for which you want to calculate the end.
+        :param fN2: Fractions of nitrogen in gas mix (0-1).
+        :param fO2: Fractions of oxygen in gas mix (0-1).
+        :return: Depths in bars. May return pressure lower than surface pressure!
+        """
+        narc_index = GasMixturesBatch.narcotic_index(fN2, fO2)
+        return as_array(current_depth) * narc_index
+
+    @staticmethod
+    def mnd(narcotic_depth: ArrayLike, fN2: ArrayLike, fO2: ArrayLike = 0) -> np.ndarray:
+        """
+        Calculates maximum narcotic depths, see GasMixtures.mnd.
+
+        :param narcotic_depth: END in bars for which you want to calculate the mnd.
+        :param fN2: Fractions of nitrogen in gas mix (0-1).
+        :param fO2: Fractions of oxygen in gas mix (0-1).
+        :return: Depths in bars, NaN for mixes without narcotic gas.
+        """
+        narc_index = GasMixturesBatch.narcotic_index(fN2, fO2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = as_array(narcotic_depth) / narc_index
+        return np.where(narc_index > 0, result, np.nan)
+
+    @staticmethod
+    def ceiling(fO2: ArrayLike, surface_pressure: ArrayLike) -> np.ndarray:
+        """
+        Calculates minimum depths at which the gases are breathable.
+
+        :param fO2: Fractions of oxygen in gas mix (0-1).
+        :param surface_pressure: surface pressures in bars.
+        :return: Depths in bars, never lower than surface pressure. NaN for not positive fraction of oxygen.
+        """
+        fO2 = as_array(fO2)
+        surface_pressure = as_array(surface_pressure)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bars = GasMixtures.min_ppO2 / fO2 * surface_pressure
+
+        # hyperoxic gases have pressure below sea level, which can't be converted to depth
+        result = np.maximum(bars, surface_pressure)
+        return np.where(fO2 > 0, result, np.nan)
+
+    @staticmethod
+    def narcotic_index(fN2: ArrayLike, fO2: ArrayLike = 0) -> np.ndarray:
+        """
+        Helium has a narcotic factor of 0 while N2 and O2 have a narcotic factor of 1
+
+        :param fN2: Fractions of nitrogen in gas mix (0-1).
+        :param fO2: Fractions of oxygen in gas mix (0-1).
+        :return: Narcotic indexes.
+        """
+        return as_array(fO2) + as_array(fN2)
@@ -1,8 +1,12 @@
+from functools import lru_cache
+
+
 class GasNames:
     air_name = 'Air'
     oxygen_name = 'Oxygen'
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def name_for(fO2: float, fHe: float = 0) -> str:
         simple_O2_in_air = 21
         percent_O2 = round(fO2 * 100)
@@ -0,0 +1,97 @@
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from diving_calc.algorithm.options import Options
+from diving_calc.calculators.nitrox_calculator import NitroxCalculator
+from diving_calc.common.precision import Precision
+from diving_calc.gases.gas_density import GasDensity
+from diving_calc.gases.gas_mixtures import GasMixtures
+from diving_calc.gases.standard_gases import Gas
+from diving_calc.physics.depth_converter import DepthConverter
+
+
+class GasLimits(NamedTuple):
+    """Constants of one gas derived from the options, depths in meters calculated using simple depth converter."""
+    # maximum operational depth for max_ppO2, rounded down to two decimals
+    mod: float
+    # maximum operational depth for max_deco_ppO2
+    deco_mod: float
+    # maximum narcotic depth for max_end, not rounded
+    mnd: float
+    # minimum depth, at which the gas is breathable
+    ceiling: float
+    # recommended switch depth rounded to deco stops
+    switch_depth: float
+    # in g/l at 1 ATA
+    density: float
+
+
+class GasToxicity:
+    """Combines all gas limits into one service."""
+
+    # for gas toxicity only always use simple to be aligned with what people expect
+    depth_converter = DepthConverter.simple()
+
+    def __init__(self, options: Optional[Options] = None):
+        """
+        :param options: The original instance is used, so later changes of the options are reflected.
+        """
+        self.options = options or Options()
+        self.nitrox_calculator = NitroxCalculator(self.depth_converter)
+
+    def limits(self, gas: Gas) -> GasLimits:
+        """All limits of the gas, cached for each gas and current values of the options."""
+        options = self.options
+        return GasToxicity._limits(gas, options.max_ppO2, options.max_deco_ppO2, options.max_end,
+                                   options.oxygen_narcotic, options.deco_stop_distance)
+
+    def mod_for_gas(self, gas: Gas) -> float:
+        """Returns maximum operational depth in meters."""
+        return self.limits(gas).mod
+
+    def mnd_for_gas(self, gas: Gas) -> float:
+        """Returns maximum narcotic depth in meters rounded to two decimals."""
+        return Precision.round(self.limits(gas).mnd, 2)
+
+    def switch_depth(self, gas: Gas) -> float:
+        """Returns maximum depth in meters at which gas switch to this mixture can happen."""
+        return self.limits(gas).switch_depth
+
+    def max_depth(self, gas: Gas) -> float:
+        """Returns maximum depth in meters at which this gas can be used, minimum of mod and mnd."""
+        return min(self.mnd_for_gas(gas), self.mod_for_gas(gas))
+
+    def best_nitrox_mix(self, max_depth: float) -> float:
+        """
+        Returns best mix oxygen content in percents.
+
+        :param max_depth: Required depth in meters.
+        """
+        o2 = self.nitrox_calculator.best_mix(self.options.max_ppO2, max_depth)
+        return Precision.round(o2)
+
+    @staticmethod
+    def cache_info():
+        return GasToxicity._limits.cache_info()
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _limits(gas: Gas, max_ppO2: float, max_deco_ppO2: float, max_end: float,
+                oxygen_narcotic: bool, deco_stop_distance: float) -> GasLimits:
+        converter = GasToxicity.depth_converter
+        fO2 = gas.o2_fraction
+        mod_bars = GasMixtures.mod(max_ppO2, fO2)
+        deco_mod_bars = GasMixtures.mod(max_deco_ppO2, fO2)
+        narcotic_fO2 = fO2 if oxygen_narcotic else 0
+        mnd_bars = GasMixtures.mnd(converter.to_bar(max_end), 1 - fO2 - gas.he_fraction, narcotic_fO2)
+        ceiling_bars = GasMixtures.ceiling(fO2, converter.surface_pressure)
+        deco_mod = converter.from_bar(deco_mod_bars)
+        # rounded the same way as the reference nitrox calculator
+        mod = Precision.floor(Precision.fix(converter.from_bar(mod_bars)), 2)
+        return GasLimits(
+            mod=mod,
+            deco_mod=deco_mod,
+            mnd=converter.from_bar(mnd_bars),
+            ceiling=converter.from_bar(ceiling_bars),
+            switch_depth=Precision.round_distance(deco_mod, deco_stop_distance),
+            density=GasDensity.for_gas(gas)
+        )
@@ -0,0 +1,89 @@
+from typing import List, Optional
+from diving_calc.depths.depth_levels import DepthLevels
+from diving_calc.gases.gas_index import GasIndex, GasRange
+from diving_calc.gases.gas_mixtures import GasMixtures
+from diving_calc.gases.standard_gases import Gas
+from diving_calc.physics.depth_converter import DepthConverter
+
+
+class Gases:
+    def __init__(self, *gases: Gas):
+        """Gases available during the dive, the first one is expected to be the bottom gas."""
+        self._items: List[Gas] = list(gases)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def all(self) -> List[Gas]:
+        return self._items.copy()
+
+    @property
+    def has_bottom_gas(self) -> bool:
+        return len(self._items) >= 1
+
+    def add(self, gas: Gas) -> None:
+        self._items.append(gas)
+
+    def is_registered(self, gas: Gas) -> bool:
+        return gas in self._items
+
+
+class OCGasSource:
+    def __init__(self, gases: Gases, options):
+        """
+        Selects gases available in open circuit during the ascent.
+
+        :param gases: Available gases.
+        :param options: Options defining max_deco_ppO2, max_end, oxygen_narcotic and depth levels.
+        """
+        self.gases = gases
+        self.options = options
+        # gas switch depths are handled from user perspective not from pressure point of view
+        self.depth_converter = DepthConverter.simple()
+        self.depth_levels = DepthLevels(self.depth_converter, options)
+        self._index: Optional[GasIndex] = None
+        self._index_key = None
+        # count of gases already added to the index
+        self._indexed = 0
+
+    def best_gas(self, current_depth: float, current_gas: Optional[Gas]) -> Optional[Gas]:
+        """
+        Finds better gas to switch to at current depth in meters, returns current gas if no better gas was found.
+        Better gas is breathable at current depth and has higher O2, because during decompression we offgas both He and N2.
+        """
+        found = self.index().best_gas(current_depth)
+
+        if found is None or (current_gas is not None and found.o2_fraction <= current_gas.o2_fraction):
+            return current_gas
+
+        return found
+
+    def index(self) -> GasIndex:
+        """Index of the gases, gases added since last call are added to the index, changed options create new one."""
+        options = self.options
+        key = (options.max_deco_ppO2, options.max_end, options.oxygen_narcotic, options.deco_stop_distance)
+
+        if self._index is None or key != self._index_key:
+            self._index = GasIndex()
+            self._index_key = key
+            self._indexed = 0
+
+        # gases are only appended
+        if len(self.gases) != self._indexed:
+            gases = self.gases.all
+            for gas in gases[self._indexed:]:
+                if gas not in self._index:
+                    self._index.add(self._range(gas))
+            self._indexed = len(gases)
+
+        return self._index
+
+    def _range(self, gas: Gas) -> GasRange:
+        mod_pressure = GasMixtures.mod(self.options.max_deco_ppO2, gas.o2_fraction)
+        # e.g. oxygen at 6 m wouldn't be best for 6 m without rounding
+        mod = self.depth_levels.to_deco_stop(mod_pressure)
+        max_end_pressure = self.depth_converter.to_bar(self.options.max_end)
+        mnd = self.depth_converter.from_bar(GasIndex.mnd_pressure(gas, max_end_pressure, self.options.oxygen_narcotic))
+        # only oxygen content is relevant for decompression, gas ceiling is covered by higher O2 content
+        return GasRange(gas, 0, min(mod, mnd))
@@ -1,10 +1,59 @@
 import re
-from typing import Optional, Dict
+from functools import lru_cache
+from typing import ClassVar, Dict, Optional, Tuple
 
 class Gas:
-    def __init__(self, o2_fraction: float, he_fraction: float):
-        self.o2_fraction = o2_fraction
-        self.he_fraction = he_fraction
+    """
+    Immutable gas mixture. Instances are interned by content rounded to 0.1 %,
+    so equal mixtures share the same instance and can be cheaply used as dictionary keys.
+    """
+    __slots__ = ('o2_fraction', 'he_fraction', 'n2_fraction', '_key')
+
+    # 0.1 % resolution keeps air (20.9 % O2) distinguishable from EAN21
+    _resolution = 1000
+    _interned: ClassVar[Dict[Tuple[int, int], "Gas"]] = {}
+
+    def __new__(cls, o2_fraction: float, he_fraction: float) -> "Gas":
+        key = (round(o2_fraction * cls._resolution), round(he_fraction * cls._resolution))
+        gas = cls._interned.get(key)
+
+        if gas is None:
+            gas = super().__new__(cls)
+            object.__setattr__(gas, '_key', key)
+            object.__setattr__(gas, 'o2_fraction', key[0] / cls._resolution)
+            object.__setattr__(gas, 'he_fraction', key[1] / cls._resolution)
+            # Nitrogen fraction in range 0 - 1, the rest of the mix.
+            object.__setattr__(gas, 'n2_fraction', 1 - gas.o2_fraction - gas.he_fraction)
+            gas = cls._interned.setdefault(key, gas)
+
+        return gas
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"Gas is immutable, can't set '{name}'.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Gas is immutable, can't delete '{name}'.")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Gas):
+            return NotImplemented
+        return self._key == other._key
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __reduce__(self):
+        # unpickled and copied gases are interned too
+        return Gas, (self.o2_fraction, self.he_fraction)
+
+    def __repr__(self) -> str:
+        return f'Gas({self.o2_fraction}, {self.he_fraction})'
+
+    def composition_equals(self, other: Optional["Gas"]) -> bool:
+        """True if the other gas has the same content, even it is different instance."""
+        return other is not None and \
+            self.o2_fraction == other.o2_fraction and \
+            self.he_fraction == other.he_fraction
 
 class GasNames:
     air_name = 'Air'
@@ -50,6 +99,9 @@ class StandardGases:
         'Trimix 10/70': trimix1070,
     }
 
+    # Case folded names for constant time lookup
+    _names_index: Dict[str, Gas] = dict(zip(map(str.casefold, _gas_map), _gas_map.values()))
+
     @staticmethod
     def nitrox_names() -> list[str]:
         """Gets names of all predefined gases with 0 % helium (nitrox) only."""
@@ -63,13 +115,16 @@ class StandardGases:
     @staticmethod
     def by_name(name: str) -> Optional[Gas]:
         """Case insensitive search. If nothing found returns None."""
-        found_key = next(
-            (k for k in StandardGases._gas_map if k.lower() == name.lower()), None
-        )
+        gas = StandardGases._names_index.get(name.casefold())
+
+        if gas is not None:
+            return gas
 
-        if found_key:
-            return StandardGases._gas_map[found_key]
+        return StandardGases._parse_name(name)
 
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _parse_name(name: str) -> Optional[Gas]:
         match = StandardGases.names_regex.match(name)
 
         if match:
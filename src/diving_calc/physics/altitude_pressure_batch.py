@@ -0,0 +1,136 @@
+import math
+import numpy as np
+from numpy.typing import ArrayLike
+from diving_calc.common.arrays import as_array
+from diving_calc.physics.pressure_converter import AltitudePressure, PressureConverter
+
+
+class AltitudePressureBatch:
+    """Vectorized version of AltitudePressure evaluating the exact barometric formula, all values in pascals."""
+
+    @staticmethod
+    def pressure(altitude: ArrayLike) -> np.ndarray:
+        """Calculates pressures in pascals at given altitudes in meters."""
+        base = AltitudePressure.TEMPERATURE / \
+            (AltitudePressure.TEMPERATURE + AltitudePressure.LAPSE_RATE * as_array(altitude))
+        return AltitudePressure.STANDARD_PASCALS * np.power(base, AltitudePressure.EXPONENT)
+
+    @staticmethod
+    def altitude(pressure: ArrayLike) -> np.ndarray:
+        """Returns altitudes in meters for pressures in pascals, 0 m for pressures above standard pressure."""
+        pressure = as_array(pressure)
+        base = np.power(pressure / AltitudePressure.STANDARD_PASCALS, AltitudePressure.INVERTED_EXPONENT)
+        result = (AltitudePressure.TEMPERATURE / base - AltitudePressure.TEMPERATURE) / AltitudePressure.LAPSE_RATE
+        return np.where(pressure >= AltitudePressure.STANDARD_PASCALS, 0.0, result)
+
+
+class AltitudeTable:
+    """
+    Precomputed linear interpolation of the barometric formula in both directions over range of altitudes.
+    Distance of the nodes is derived from the second derivative of the formula, which bounds the interpolation error
+    by h^2/8 * max|f''|, so the error of each conversion is never higher than the requested tolerance.
+    Values outside of the range are calculated by the exact formula.
+    """
+
+    def __init__(self, min_altitude: float = 0, max_altitude: float = 5000,
+                 pressure_tolerance: float = 1e-6, altitude_tolerance: float = 0.01):
+        """
+        :param min_altitude: Lowest altitude in meters above sea level covered by the table.
+        :param max_altitude: Highest altitude in meters above sea level covered by the table.
+        :param pressure_tolerance: Maximum error of interpolated pressures in bars.
+        :param altitude_tolerance: Maximum error of interpolated altitudes in meters.
+        """
+        if min_altitude < 0 or max_altitude <= min_altitude:
+            raise ValueError('Altitude range needs to be positive and not empty.')
+
+        if pressure_tolerance <= 0 or altitude_tolerance <= 0:
+            raise ValueError('Tolerance needs to be positive number.')
+
+        self.min_altitude = min_altitude
+        self.max_altitude = max_altitude
+        self.pressure_tolerance = pressure_tolerance
+        self.altitude_tolerance = altitude_tolerance
+
+        # pressure decreases with altitude and its second derivative is highest at the lowest altitude
+        pressure_curvature = PressureConverter.pascal_to_bar(AltitudeTable._pressure_curvature(min_altitude))
+        self._altitudes = AltitudeTable._nodes(min_altitude, max_altitude, pressure_curvature, pressure_tolerance)
+        self._pressures = PressureConverter.pascal_to_bar(AltitudePressureBatch.pressure(self._altitudes))
+
+        # the inverse table needs increasing nodes, so it starts at the highest altitude
+        low_pressure = float(self._pressures[-1])
+        high_pressure = float(self._pressures[0])
+        altitude_curvature = max(AltitudeTable._altitude_curvature(low_pressure),
+                                 AltitudeTable._altitude_curvature(high_pressure))
+        self._inverse_pressures = AltitudeTable._nodes(low_pressure, high_pressure, altitude_curvature,
+                                                       altitude_tolerance)
+        self._inverse_altitudes = AltitudePressureBatch.altitude(
+            PressureConverter.bar_to_pascal(self._inverse_pressures))
+        # both ends exactly, so the range check of the inverse table matches the altitude range
+        self._inverse_altitudes[[0, -1]] = (max_altitude, min_altitude)
+        # differences between neighbor nodes, so the lookup reads each table only once
+        self._pressure_slopes = np.diff(self._pressures)
+        self._altitude_slopes = np.diff(self._inverse_altitudes)
+
+    @property
+    def size(self) -> int:
+        """Count of nodes of both tables."""
+        return len(self._altitudes) + len(self._inverse_pressures)
+
+    def to_pressure(self, altitude: ArrayLike) -> np.ndarray:
+        """Converts altitudes in meters to pressures in bars."""
+        altitude = as_array(altitude)
+        result = AltitudeTable._interpolate(altitude, self._altitudes, self._pressures, self._pressure_slopes)
+        outside = (altitude < self.min_altitude) | (altitude > self.max_altitude)
+
+        if outside.any():
+            exact = PressureConverter.pascal_to_bar(AltitudePressureBatch.pressure(altitude[outside]))
+            result = np.asarray(result)
+            result[outside] = exact
+
+        return result
+
+    def to_altitude(self, pressure: ArrayLike) -> np.ndarray:
+        """Converts pressures in bars to altitudes in meters."""
+        pressure = as_array(pressure)
+        result = AltitudeTable._interpolate(pressure, self._inverse_pressures, self._inverse_altitudes,
+                                              self._altitude_slopes)
+        outside = (pressure < self._inverse_pressures[0]) | (pressure > self._inverse_pressures[-1])
+
+        if outside.any():
+            exact = AltitudePressureBatch.altitude(PressureConverter.bar_to_pascal(pressure[outside]))
+            result = np.asarray(result)
+            result[outside] = exact
+
+        return result
+
+    @staticmethod
+    def _interpolate(values: np.ndarray, nodes: np.ndarray, table: np.ndarray, slopes: np.ndarray) -> np.ndarray:
+        """Nodes are equidistant, so the node index is calculated directly instead of searching for it."""
+        positions = (values - nodes[0]) * ((len(nodes) - 1) / (nodes[-1] - nodes[0]))
+        indexes = np.clip(positions.astype(np.intp), 0, len(nodes) - 2)
+        return table[indexes] + slopes[indexes] * (positions - indexes)
+
+    @staticmethod
+    def _nodes(start: float, end: float, curvature: float, tolerance: float) -> np.ndarray:
+        step = math.sqrt(8 * tolerance / curvature) if curvature > 0 else end - start
+        count = max(math.ceil((end - start) / step), 1) + 1
+        return np.linspace(start, end, count)
+
+    @staticmethod
+    def _pressure_curvature(altitude: float) -> float:
+        """Absolute second derivative of pressure in pascals by altitude in meters."""
+        temperature = AltitudePressure.TEMPERATURE
+        lapse_rate = AltitudePressure.LAPSE_RATE
+        exponent = AltitudePressure.EXPONENT
+        base = temperature / (temperature + lapse_rate * altitude)
+        return abs(AltitudePressure.STANDARD_PASCALS * exponent * (exponent + 1) * lapse_rate ** 2 *
+                   base ** (exponent + 2) / temperature ** 2)
+
+    @staticmethod
+    def _altitude_curvature(pressure: float) -> float:
+        """Absolute second derivative of altitude in meters by pressure in bars."""
+        inverted = AltitudePressure.INVERTED_EXPONENT
+        standard = AltitudePressure.STANDARD_PRESSURE
+        ratio = pressure / standard
+        return abs(AltitudePressure.TEMPERATURE * inverted * (inverted + 1) * ratio ** (-inverted - 2) /
+                   (AltitudePressure.LAPSE_RATE * standard ** 2))
@@ -0,0 +1,97 @@
+from functools import lru_cache
+from typing import NamedTuple
+import numpy as np
+from diving_calc.gases.standard_gases import Gas
+
+
+class ZPolynomial(NamedTuple):
+    """Z-factor of one gas mixture as polynomial Z(p) = 1 + c1 * p + c2 * p^2 + c3 * p^3."""
+    c1: float
+    c2: float
+    c3: float
+
+    def z_factor(self, pressure: float) -> float:
+        return 1 + pressure * (self.c1 + pressure * (self.c2 + pressure * self.c3))
+
+    def derivative(self, pressure: float) -> float:
+        return self.c1 + pressure * (2 * self.c2 + pressure * 3 * self.c3)
+
+
+class Compressibility:
+    """
+    Real gas compression calculator. Does not use Gas ideal law, instead uses Z-factor.
+    See also https://www.divegearexpress.com/library/articles/calculating-scuba-cylinder-capacities
+    Formulas reused from https://github.com/atdotde/realblender.
+    The same formula is also used in Subsurface.
+    The formulas work in range 0-500 b.
+    Original source does not mention, at which temperature the constants were collected.
+    """
+
+    # doesn't need to be altitude pressure, since its effect is negligible.
+    normal_pressure = 1
+    # coefficients of p, p^2 and p^3 in virial of each gas
+    o2_coefficients = np.array([-7.18092073703e-4, 2.81852572808e-6, -1.50290620492e-9])
+    n2_coefficients = np.array([-2.19260353292e-4, 2.92844845532e-6, -2.07613482075e-9])
+    he_coefficients = np.array([4.87320026468e-4, -8.83632921053e-8, 5.33304543646e-11])
+
+    # precision of the found pressure in bars
+    tolerance = 0.000001
+    # Newton solver converges in few iterations in range 0-500 b, the limit only prevents endless loop
+    max_iterations = 32
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def polynomial(gas: Gas) -> ZPolynomial:
+        """
+        Z-factor of the mixture is weighted sum of the gases virials, i.e. cubic polynomial of pressure.
+        Coefficients are calculated only once for each gas.
+        """
+        coefficients = gas.o2_fraction * Compressibility.o2_coefficients + \
+            gas.he_fraction * Compressibility.he_coefficients + \
+            gas.n2_fraction * Compressibility.n2_coefficients
+        return ZPolynomial(*coefficients.tolist())
+
+    def z_factor(self, gas_pressure: float, gas: Gas) -> float:
+        """
+        Calculates compressibility Z-factor for given gas mixture at given pressure.
+        See also https://www.divegearexpress.com/library/articles/zfactors-for-scuba
+
+        :param gas_pressure: Gas pressure in bar.
+        :param gas: Not empty gas mixture.
+        """
+        return Compressibility.polynomial(gas).z_factor(gas_pressure)
+
+    def normal_volume(self, gas_pressure: float, gas: Gas) -> float:
+        """
+        Calculates normal volume in liters for given gas mixture at 1 bar.
+
+        :param gas_pressure: Current gas pressure in bar.
+        :param gas: Not empty gas mixture.
+        """
+        polynomial = Compressibility.polynomial(gas)
+        return gas_pressure * polynomial.z_factor(self.normal_pressure) / polynomial.z_factor(gas_pressure)
+
+    def pressure(self, gas: Gas, volume: float) -> float:
+        """
+        Finds current gas pressure for given gas volume with precision of 0.000001 b.
+        Solves normal_z * p - z(p) * volume = 0 using Newton method.
+
+        :param gas: Not empty gas mixture.
+        :param volume: Gas volume in liters.
+        :raises ValueError: If the pressure wasn't found, e.g. for volumes far out of range 0-500 b.
+        """
+        polynomial = Compressibility.polynomial(gas)
+        normal_z = polynomial.z_factor(self.normal_pressure)
+        found_pressure = volume
+
+        for _ in range(self.max_iterations):
+            difference = normal_z * found_pressure - polynomial.z_factor(found_pressure) * volume
+            slope = normal_z - polynomial.derivative(found_pressure) * volume
+            step = difference / slope
+            found_pressure -= step
+
+            if abs(step) <= self.tolerance:
+                return found_pressure
+
+        raise ValueError(f'Pressure of {volume} l of gas not found.')
+
@@ -0,0 +1,74 @@
+import numpy as np
+from numpy.typing import ArrayLike
+from diving_calc.common.arrays import as_array
+from diving_calc.physics.compressibility import Compressibility
+
+
+class CompressibilityBatch:
+    """
+    Vectorized version of Compressibility evaluating many cylinders at once.
+    All arguments are broadcasted against each other, not solvable elements result in NaN.
+    """
+
+    @staticmethod
+    def coefficients(fO2: ArrayLike, fHe: ArrayLike) -> np.ndarray:
+        """Returns Z-factor polynomial coefficients with shape (..., 3) for given mixtures."""
+        fO2 = as_array(fO2)[..., np.newaxis]
+        fHe = as_array(fHe)[..., np.newaxis]
+        fN2 = 1 - fO2 - fHe
+        return fO2 * Compressibility.o2_coefficients + fHe * Compressibility.he_coefficients + \
+            fN2 * Compressibility.n2_coefficients
+
+    @staticmethod
+    def z_factor(gas_pressure: ArrayLike, fO2: ArrayLike, fHe: ArrayLike) -> np.ndarray:
+        """
+        :param gas_pressure: Gas pressures in bar.
+        :param fO2: Fractions of oxygen (0-1).
+        :param fHe: Fractions of helium (0-1).
+        """
+        coefficients = CompressibilityBatch.coefficients(fO2, fHe)
+        return CompressibilityBatch._evaluate(coefficients, as_array(gas_pressure))
+
+    @staticmethod
+    def normal_volume(gas_pressure: ArrayLike, fO2: ArrayLike, fHe: ArrayLike) -> np.ndarray:
+        """Calculates normal volumes in liters at 1 bar, see Compressibility.normal_volume."""
+        coefficients = CompressibilityBatch.coefficients(fO2, fHe)
+        gas_pressure = as_array(gas_pressure)
+        normal_z = CompressibilityBatch._evaluate(coefficients, Compressibility.normal_pressure)
+        return gas_pressure * normal_z / CompressibilityBatch._evaluate(coefficients, gas_pressure)
+
+    @staticmethod
+    def pressure(volume: ArrayLike, fO2: ArrayLike, fHe: ArrayLike) -> np.ndarray:
+        """
+        Finds gas pressures in bars for given gas volumes, see Compressibility.pressure.
+        All elements are solved together by fixed count of Newton iterations, until all of them converge.
+
+        :param volume: Gas volumes in liters.
+        :param fO2: Fractions of oxygen (0-1).
+        :param fHe: Fractions of helium (0-1).
+        :return: Pressures in bars, NaN if not found.
+        """
+        coefficients = CompressibilityBatch.coefficients(fO2, fHe)
+        volume = as_array(volume)
+        normal_z = CompressibilityBatch._evaluate(coefficients, Compressibility.normal_pressure)
+        c1, c2, c3 = np.moveaxis(coefficients, -1, 0)
+        found = np.broadcast_to(volume, np.broadcast_shapes(volume.shape, normal_z.shape)).copy()
+        converged = np.zeros(found.shape, dtype=bool)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            for _ in range(Compressibility.max_iterations):
+                z = 1 + found * (c1 + found * (c2 + found * c3))
+                derivative = c1 + found * (2 * c2 + found * 3 * c3)
+                step = (normal_z * found - z * volume) / (normal_z - derivative * volume)
+                found -= np.where(converged, 0, step)
+                converged |= np.abs(step) <= Compressibility.tolerance
+
+                if converged.all():
+                    break
+
+        return np.where(converged & np.isfinite(found), found, np.nan)
+
+    @staticmethod
+    def _evaluate(coefficients: np.ndarray, pressure) -> np.ndarray:
+        c1, c2, c3 = np.moveaxis(coefficients, -1, 0)
+        return 1 + pressure * (c1 + pressure * (c2 + pressure * c3))
@@ -1,7 +1,22 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict, namedtuple
 from enum import Enum
 from math import pow
+from typing import TYPE_CHECKING, Optional
 from diving_calc.physics.pressure_converter import Density, Gravity, AltitudePressure, PressureConverter, Salinity
 
+# NumPy is imported only by the bulk conversions, so scalar conversions start fast
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import ArrayLike
+
+# Supported policies for pressures lower than surface pressure in bulk conversion from bars to depth
+class BelowSurface:
+    RAISE = 1  # the whole conversion fails with ValueError
+    CLIP = 2  # converted to 0 m
+    NAN = 3  # converted to NaN
+
 class DepthOptions:
     def __init__(self, altitude: float, salinity: Salinity):
         """Defines depth calculation options."""
@@ -14,21 +29,30 @@ class DepthConverterFactory:
         self.options = options
 
     def create(self):
-        """Creates a new instance of depth converter based on provided salinity."""
-        if self.options.salinity == Salinity.SALT:
-            return DepthConverter.for_salt_water(self.options.altitude)
-        elif self.options.salinity == Salinity.BRACKISH:
-            return DepthConverter.for_brackish_water(self.options.altitude)
-        else:
-            return DepthConverter.for_fresh_water(self.options.altitude)
+        """Returns shared instance of depth converter based on provided salinity and altitude."""
+        return shared_converters.get(self.options.salinity, self.options.altitude)
 
 class DepthConverter:
+    """Converts depth in meters to absolute pressure in bars and back. Instances are immutable, so they can be shared."""
+    __slots__ = ('_density', '_gravity', '_surface_pressure', '_bars_per_meter', '_meters_per_bar')
+
     def __init__(self, density: float, altitude: float):
         """Initializes depth converter with density and altitude."""
-        self.density = density
-        self._gravity = Gravity.STANDARD
         pressure_in_pascals = AltitudePressure.pressure(altitude)
-        self._surface_pressure = PressureConverter.pascal_to_bar(pressure_in_pascals)
+        self._initialize(density, Gravity.STANDARD, PressureConverter.pascal_to_bar(pressure_in_pascals))
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"DepthConverter is immutable, can't set '{name}'.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"DepthConverter is immutable, can't delete '{name}'.")
+
+    def __reduce__(self):
+        return DepthConverter._create, (self._density, self._gravity, self._surface_pressure)
+
+    @property
+    def density(self) -> float:
+        return self._density
 
     @property
     def surface_pressure(self) -> float:
@@ -36,34 +60,165 @@ class DepthConverter:
 
     @staticmethod
     def for_salt_water(altitude: float = 0) -> "DepthConverter":
-        return DepthConverter(Density.SALT, altitude)
+        return shared_converters.get(Salinity.SALT, altitude)
 
     @staticmethod
     def for_brackish_water(altitude: float = 0) -> "DepthConverter":
-        return DepthConverter(Density.BRACKISH, altitude)
+        return shared_converters.get(Salinity.BRACKISH, altitude)
 
     @staticmethod
     def for_fresh_water(altitude: float = 0) -> "DepthConverter":
-        return DepthConverter(Density.FRESH, altitude)
+        return shared_converters.get(Salinity.FRESH, altitude)
 
     @staticmethod
     def simple() -> "DepthConverter":
         """Creates a depth converter configured for training calculations."""
-        converter = DepthConverter(Density.FRESH, 0)
-        converter._surface_pressure = 1
-        converter._gravity = 10
-        return converter
+        return DepthConverter._create(Density.FRESH, 10, 1)
 
     def to_bar(self, depth: float) -> float:
         """Calculates absolute pressure (in bars) for given depth in meters."""
-        weight_density = self.density * self._gravity
-        return PressureConverter.pascal_to_bar(depth * weight_density) + self._surface_pressure
+        return depth * self._bars_per_meter + self._surface_pressure
 
     def from_bar(self, bars: float) -> float:
         """Calculates depth (in meters) from given atmospheric pressure in bars."""
         if bars < self._surface_pressure:
             raise ValueError("Lower pressure than altitude isn't convertible to depth.")
 
-        weight_density = self.density * self._gravity
-        pressure = PressureConverter.bar_to_pascal(bars - self._surface_pressure)
-        return pressure / weight_density
+        return (bars - self._surface_pressure) * self._meters_per_bar
+
+    def to_bar_many(self, depths: ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Calculates absolute pressures (in bars) for all given depths in meters at once.
+
+        :param depths: Depths in meters as sequence, array.array, memoryview or NumPy array.
+        :param out: Optional preallocated float array to store the result in.
+        :return: Pressures in bars.
+        """
+        import numpy as np
+        from diving_calc.common.arrays import as_array
+
+        depths = as_array(depths)
+        # scalar result of the ufunc can't be used as output of the next one
+        if out is None:
+            out = np.empty_like(depths)
+
+        result = np.multiply(depths, self._bars_per_meter, out=out)
+        return np.add(result, self._surface_pressure, out=result)
+
+    def from_bar_many(self, bars: ArrayLike, below_surface: int = BelowSurface.RAISE,
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Calculates depths (in meters) for all given atmospheric pressures in bars at once.
+
+        :param bars: Pressures in bars as sequence, array.array, memoryview or NumPy array.
+        :param below_surface: BelowSurface policy applied to pressures lower than surface pressure.
+        :param out: Optional preallocated float array to store the result in.
+        :return: Depths in meters.
+        """
+        import numpy as np
+        from diving_calc.common.arrays import as_array
+
+        bars = as_array(bars)
+        below = bars < self._surface_pressure
+
+        if below_surface == BelowSurface.RAISE and below.any():
+            raise ValueError("Lower pressure than altitude isn't convertible to depth.")
+
+        if out is None:
+            out = np.empty_like(bars)
+
+        result = np.subtract(bars, self._surface_pressure, out=out)
+        result = np.multiply(result, self._meters_per_bar, out=result)
+
+        if below_surface == BelowSurface.CLIP:
+            result[below] = 0
+        elif below_surface == BelowSurface.NAN:
+            result[below] = np.nan
+
+        return result
+
+    @staticmethod
+    def _create(density: float, gravity: float, surface_pressure: float) -> "DepthConverter":
+        converter = object.__new__(DepthConverter)
+        converter._initialize(density, gravity, surface_pressure)
+        return converter
+
+    def _initialize(self, density: float, gravity: float, surface_pressure: float) -> None:
+        """The only place setting the fields, later changes are rejected."""
+        # conversion is affine, so only the slope needs to be calculated once
+        bars_per_meter = PressureConverter.pascal_to_bar(density * gravity)
+        for name, value in (('_density', density), ('_gravity', gravity), ('_surface_pressure', surface_pressure),
+                            ('_bars_per_meter', bars_per_meter), ('_meters_per_bar', 1 / bars_per_meter)):
+            object.__setattr__(self, name, value)
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+class DepthConverterRegistry:
+    """
+    Thread safe bounded LRU cache of depth converters keyed by salinity and altitude.
+    Altitude is rounded to altitude_step meters, so the barometric formula is evaluated only once per site.
+    """
+    _densities = {
+        Salinity.SALT: Density.SALT,
+        Salinity.BRACKISH: Density.BRACKISH,
+        Salinity.FRESH: Density.FRESH,
+    }
+
+    def __init__(self, maxsize: int = 64, altitude_step: float = 1):
+        if maxsize < 1:
+            raise ValueError("Registry needs to hold at least one converter.")
+
+        if altitude_step <= 0:
+            raise ValueError("Altitude step needs to be positive number.")
+
+        self.maxsize = maxsize
+        self.altitude_step = altitude_step
+        self._converters: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def quantize(self, altitude: float) -> float:
+        """Rounds the altitude in meters to the registry altitude step."""
+        return round(altitude / self.altitude_step) * self.altitude_step
+
+    def get(self, salinity: Salinity, altitude: float = 0) -> DepthConverter:
+        """Returns shared converter for given salinity and altitude, creates new one only if not cached yet."""
+        # unknown salinity falls back to fresh water the same way as the factory always did
+        density = self._densities.get(salinity, Density.FRESH)
+        quantized = self.quantize(altitude)
+        key = (density, quantized)
+
+        with self._lock:
+            converter = self._converters.get(key)
+
+            if converter is not None:
+                self._converters.move_to_end(key)
+                self._hits += 1
+                return converter
+
+            self._misses += 1
+            converter = DepthConverter(density, quantized)
+            self._converters[key] = converter
+
+            if len(self._converters) > self.maxsize:
+                self._converters.popitem(last=False)
+
+            return converter
+
+    def info(self) -> CacheInfo:
+        """Returns hit/miss statistics in the same shape as functools.lru_cache."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._converters))
+
+    def clear(self) -> None:
+        """Removes all cached converters and resets the statistics."""
+        with self._lock:
+            self._converters.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+# Registry shared by the factory and for_*_water constructors
+shared_converters = DepthConverterRegistry()
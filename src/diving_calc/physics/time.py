@@ -0,0 +1,24 @@
+class Time:
+    # One second as base unit of decompression calculation
+    ONE_SECOND = 1
+    ONE_MINUTE = 60
+    ONE_HOUR = ONE_MINUTE * 60
+    # Maximum deco stop duration
+    ONE_DAY = ONE_HOUR * 24
+    # Default duration of the safety stop
+    SAFETY_STOP_DURATION = ONE_MINUTE * 3
+
+    @staticmethod
+    def to_seconds(minutes: float) -> float:
+        """Converts duration in minutes to seconds."""
+        return minutes * Time.ONE_MINUTE
+
+    @staticmethod
+    def to_minutes(seconds: float) -> float:
+        """Converts duration in seconds to minutes."""
+        return seconds / Time.ONE_MINUTE
+
+    @staticmethod
+    def to_hours(seconds: float) -> float:
+        """Converts duration in seconds to hours."""
+        return seconds / Time.ONE_HOUR
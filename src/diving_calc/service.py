@@ -0,0 +1,329 @@
+import asyncio
+import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlsplit
+import numpy as np
+from diving_calc.calculators.altitude_batch_calculator import AltitudeBatchCalculator
+from diving_calc.calculators.nitrox_batch_calculator import NitroxBatchCalculator
+from diving_calc.gases.standard_gases import StandardGases
+from diving_calc.physics.depth_converter import shared_converters
+from diving_calc.physics.pressure_converter import Salinity
+
+_salinities = {
+    'fresh': Salinity.FRESH,
+    'brackish': Salinity.BRACKISH,
+    'salt': Salinity.SALT,
+}
+
+_reasons = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+
+
+class ServiceOverloaded(Exception):
+    """Too many requests are waiting for the calculation."""
+
+
+class Operation(NamedTuple):
+    # names of the request parameters passed to the calculation in this order
+    parameters: Tuple[str, ...]
+    # True, if the result depends on salinity and altitude of the dive site
+    water: bool
+    # calculates whole batch, receives the water key and one array per parameter
+    calculate: Callable[..., np.ndarray]
+
+
+@lru_cache(maxsize=64)
+def nitrox_calculator(water: Tuple[int, float]) -> NitroxBatchCalculator:
+    """Calculators are shared by all requests to the same dive site, converters come from the shared registry."""
+    return NitroxBatchCalculator(shared_converters.get(*water))
+
+
+_altitude_calculator = AltitudeBatchCalculator()
+
+OPERATIONS: Dict[str, Operation] = {
+    'mod': Operation(('ppo2', 'o2'), True, lambda water, ppO2, o2: nitrox_calculator(water).mod(ppO2, o2)),
+    'ead': Operation(('depth', 'o2'), True, lambda water, depth, o2: nitrox_calculator(water).ead(o2, depth)),
+    'best_mix': Operation(('depth', 'ppo2'), True,
+                          lambda water, depth, ppO2: nitrox_calculator(water).best_mix(ppO2, depth)),
+    'partial_pressure': Operation(('depth', 'o2'), True,
+                                  lambda water, depth, o2: nitrox_calculator(water).partial_pressure(o2, depth)),
+    'altitude': Operation(('pressure',), False, lambda water, pressure: _altitude_calculator.to_altitude(pressure)),
+    'pressure': Operation(('altitude',), False, lambda water, altitude: _altitude_calculator.to_pressure(altitude)),
+}
+
+
+class _Pending(NamedTuple):
+    values: Tuple[float, ...]
+    future: asyncio.Future
+
+
+class RequestBatcher:
+    """
+    Coalesces concurrent requests of the same operation and dive site into one vectorized calculation.
+    First request of the batch waits at most the batch window for others, full batch is calculated immediately.
+    Batches are calculated by the executor, so the event loop keeps accepting requests meanwhile.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor, max_batch: int = 1024, batch_window: float = 0.001,
+                 max_pending: int = 10000):
+        """
+        :param executor: Executor calculating the batches.
+        :param max_batch: Maximum count of requests calculated at once.
+        :param batch_window: Seconds to wait for other requests after first request of the batch.
+        :param max_pending: Maximum count of requests waiting for result, new requests are rejected above it.
+        """
+        if max_batch < 1 or max_pending < 1:
+            raise ValueError('Batch and count of pending requests need to be at least 1.')
+
+        self.executor = executor
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.max_pending = max_pending
+        # count of requests not answered yet
+        self.pending = 0
+        self.batches = 0
+        self._waiting: Dict[Tuple[str, Optional[Tuple[int, float]]], List[_Pending]] = {}
+
+    async def submit(self, operation: str, water: Optional[Tuple[int, float]], values: Tuple[float, ...]) -> float:
+        if self.pending >= self.max_pending:
+            raise ServiceOverloaded(f'More than {self.max_pending} requests are waiting.')
+
+        loop = asyncio.get_running_loop()
+        key = (operation, water)
+        future = loop.create_future()
+        waiting = self._waiting.get(key)
+
+        if waiting is None:
+            waiting = self._waiting[key] = []
+            loop.call_later(self.batch_window, self._flush, key, waiting)
+
+        waiting.append(_Pending(values, future))
+        self.pending += 1
+
+        if len(waiting) >= self.max_batch:
+            self._flush(key, waiting)
+
+        try:
+            return await future
+        finally:
+            self.pending -= 1
+
+    def _flush(self, key, waiting: List[_Pending]) -> None:
+        # the batch may be already flushed, because it was full before the window elapsed
+        if self._waiting.get(key) is not waiting:
+            return
+
+        del self._waiting[key]
+        self.batches += 1
+        operation, water = key
+        columns = [np.fromiter(column, dtype=np.float64, count=len(waiting))
+                   for column in zip(*(request.values for request in waiting))]
+        calculation = asyncio.get_running_loop().run_in_executor(
+            self.executor, RequestBatcher._calculate, operation, water, columns)
+        calculation.add_done_callback(lambda done: RequestBatcher._resolve(done, waiting))
+
+    @staticmethod
+    def _calculate(operation: str, water, columns: Sequence[np.ndarray]) -> List[float]:
+        return OPERATIONS[operation].calculate(water, *columns).tolist()
+
+    @staticmethod
+    def _resolve(done: asyncio.Future, waiting: List[_Pending]) -> None:
+        if done.cancelled():
+            # the executor was shut down
+            for request in waiting:
+                request.future.cancel()
+            return
+
+        error = done.exception()
+        results = done.result() if error is None else [None] * len(waiting)
+
+        for request, result in zip(waiting, results):
+            if request.future.done():
+                continue
+            if error is not None:
+                request.future.set_exception(error)
+            else:
+                request.future.set_result(result)
+
+
+class CalculationService:
+    """
+    Local HTTP service answering the same calculations as the command line, e.g. GET /mod?ppo2=1.4&o2=32
+    or POST /mod with JSON object of the parameters. Each response is one JSON object.
+    Connections are kept alive, so each client pays the connection only once.
+    """
+    max_request_size = 65536
+
+    def __init__(self, workers: Optional[int] = None, max_batch: int = 1024, batch_window: float = 0.001,
+                 max_pending: int = 10000):
+        """
+        :param workers: Count of threads calculating the batches, default count of CPUs.
+        :param max_batch: Maximum count of requests calculated at once.
+        :param batch_window: Seconds to wait for other requests after first request of the batch.
+        :param max_pending: Requests waiting above this count are answered by 503 Service Unavailable.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix='diving-calc')
+        self.batcher = RequestBatcher(self.executor, max_batch, batch_window, max_pending)
+
+    async def calculate(self, operation: str, parameters: Dict[str, object]) -> Dict[str, object]:
+        """
+        :param operation: One of OPERATIONS or 'gas'.
+        :param parameters: Request parameters, numbers may be also passed as strings.
+        :raises KeyError: Unknown operation.
+        :raises ValueError: Missing or invalid parameter.
+        :raises ServiceOverloaded: Too many requests are waiting.
+        """
+        if operation == 'gas':
+            return CalculationService._gas(parameters)
+
+        definition = OPERATIONS[operation]
+        values = tuple(CalculationService._number(parameters, name) for name in definition.parameters)
+        water = CalculationService._water(parameters) if definition.water else None
+        result = await self.batcher.submit(operation, water, values)
+
+        if math.isnan(result):
+            raise ValueError('Parameters are out of range of the calculation.')
+
+        return {operation: result}
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8080) -> asyncio.Server:
+        return await asyncio.start_server(self.handle, host, port, limit=self.max_request_size)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answers requests of one connection in order until the client closes it."""
+        try:
+            while True:
+                try:
+                    request = await CalculationService._read_request(reader)
+                except ValueError:
+                    await CalculationService._write(writer, 400, {'error': 'Malformed request.'}, False)
+                    break
+
+                if request is None:
+                    break
+
+                try:
+                    status, body, keep_alive = await self._respond(*request)
+                except Exception:
+                    # the connection may be in unknown state, so it isn't reused
+                    status, body, keep_alive = 500, {'error': 'Calculation failed.'}, False
+
+                await CalculationService._write(writer, status, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _write(writer: asyncio.StreamWriter, status: int, body: Dict[str, object], keep_alive: bool) -> None:
+        payload = json.dumps(body).encode()
+        writer.write(b'HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n%s\r\n' % (
+            status, _reasons[status].encode(), len(payload), b'' if keep_alive else b'Connection: close\r\n') + payload)
+        await writer.drain()
+
+    async def _respond(self, method: str, target: str, headers: Dict[str, str],
+                       body: bytes) -> Tuple[int, Dict[str, object], bool]:
+        keep_alive = headers.get('connection', '').lower() != 'close'
+        if len(body) > self.max_request_size:
+            return 413, {'error': 'Request is too large.'}, False
+
+        url = urlsplit(target)
+        operation = url.path.strip('/').replace('-', '_')
+        if operation != 'gas' and operation not in OPERATIONS:
+            return 404, {'error': f"Unknown calculation '{operation}'."}, keep_alive
+
+        try:
+            if method == 'GET':
+                parameters: Dict[str, object] = dict(parse_qsl(url.query))
+            elif method == 'POST':
+                parameters = json.loads(body or b'{}')
+                if not isinstance(parameters, dict):
+                    raise ValueError('Request body needs to be JSON object.')
+            else:
+                return 405, {'error': f"Method {method} isn't supported."}, keep_alive
+
+            return 200, await self.calculate(operation, parameters), keep_alive
+        except ValueError as error:
+            return 400, {'error': str(error)}, keep_alive
+        except ServiceOverloaded as error:
+            return 503, {'error': str(error)}, keep_alive
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        """Returns method, target, headers with lower case names and body, None if the connection was closed."""
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+
+        method, target, _ = request_line.decode('latin-1').split(' ', 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length', 0))
+        body = await reader.readexactly(min(length, CalculationService.max_request_size + 1)) if length else b''
+        return method, target, headers, body
+
+    @staticmethod
+    def _number(parameters: Dict[str, object], name: str) -> float:
+        if name not in parameters:
+            raise ValueError(f"Missing parameter '{name}'.")
+
+        try:
+            value = float(parameters[name])
+        except (TypeError, ValueError):
+            raise ValueError(f"Parameter '{name}' needs to be number.")
+
+        if not math.isfinite(value):
+            raise ValueError(f"Parameter '{name}' needs to be finite number.")
+
+        return value
+
+    @staticmethod
+    def _water(parameters: Dict[str, object]) -> Tuple[int, float]:
+        salinity = _salinities.get(str(parameters.get('salinity', 'salt')))
+        if salinity is None:
+            raise ValueError(f"Salinity needs to be one of {', '.join(_salinities)}.")
+
+        altitude = CalculationService._number(parameters, 'altitude') if 'altitude' in parameters else 0
+        # the same key as the converter registry, so nearby sites share the batch
+        return salinity, shared_converters.quantize(altitude)
+
+    @staticmethod
+    def _gas(parameters: Dict[str, object]) -> Dict[str, object]:
+        name = str(parameters.get('name', ''))
+        gas = StandardGases.by_name(name)
+        if gas is None:
+            raise ValueError(f"Unknown gas '{name}'")
+
+        return {'name': name, 'o2': gas.o2_fraction * 100, 'he': gas.he_fraction * 100, 'n2': gas.n2_fraction * 100}
+
+
+async def serve_forever(service: CalculationService, host: str, port: int) -> None:
+    server = await service.serve(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
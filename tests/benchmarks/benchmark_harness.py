@@ -0,0 +1,151 @@
+import gc
+import json
+import os
+import statistics
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+
+class Measurement(NamedTuple):
+    """Statistics of one benchmark, all durations in milliseconds per single call of the action."""
+    name: str
+    rounds: int
+    iterations: int
+    min: float
+    median: float
+    mean: float
+    stdev: float
+
+
+class Regression(NamedTuple):
+    name: str
+    # median durations in milliseconds
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+class Benchmark(NamedTuple):
+    name: str
+    action: Callable[[], object]
+    # count of calls measured together in one round, used for actions too fast to be timed alone
+    iterations: int = 1
+    # optional maximum median duration in milliseconds
+    budget: Optional[float] = None
+
+
+class BenchmarkSuite:
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """
+        Repeatedly measures registered actions.
+
+        :param clock: Source of the current time in seconds.
+        """
+        self.clock = clock
+        self.benchmarks: Dict[str, Benchmark] = {}
+
+    def add(self, name: str, action: Callable[[], object], iterations: int = 1,
+            budget: Optional[float] = None) -> None:
+        if name in self.benchmarks:
+            raise ValueError(f"Benchmark '{name}' is already registered.")
+
+        if iterations < 1:
+            raise ValueError("Benchmark needs to run at least one iteration.")
+
+        self.benchmarks[name] = Benchmark(name, action, iterations, budget)
+
+    def run(self, rounds: int = 10, warmup: int = 2, names: Optional[Iterable[str]] = None) -> List[Measurement]:
+        """
+        Measures the benchmarks in order of registration.
+
+        :param rounds: Count of measured rounds of each benchmark.
+        :param warmup: Count of not measured rounds run before, to fill caches and lazy initializations.
+        :param names: Names of benchmarks to run, by default all registered.
+        """
+        selected = self.benchmarks.values() if names is None else [self.benchmarks[name] for name in names]
+        return [self.measure(benchmark, rounds, warmup) for benchmark in selected]
+
+    def measure(self, benchmark: Benchmark, rounds: int = 10, warmup: int = 2) -> Measurement:
+        if rounds < 1:
+            raise ValueError("Benchmark needs to run at least one round.")
+
+        for _ in range(warmup):
+            self._round(benchmark)
+
+        # garbage collection pauses would be attributed to random rounds
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            durations = [self._round(benchmark) * 1000 / benchmark.iterations for _ in range(rounds)]
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        stdev = statistics.stdev(durations) if rounds > 1 else 0.0
+        return Measurement(benchmark.name, rounds, benchmark.iterations, min(durations),
+                           statistics.median(durations), statistics.fmean(durations), stdev)
+
+    def over_budget(self, measurements: Iterable[Measurement]) -> List[Measurement]:
+        """Returns measurements, which median exceeds budget of their benchmark."""
+        return [measurement for measurement in measurements
+                if (budget := self.benchmarks[measurement.name].budget) is not None and measurement.median > budget]
+
+    def _round(self, benchmark: Benchmark) -> float:
+        action = benchmark.action
+        start = self.clock()
+        for _ in range(benchmark.iterations):
+            action()
+        return self.clock() - start
+
+
+class Baseline:
+    """Stored measurements used to detect performance regressions."""
+
+    @staticmethod
+    def save(path: str, measurements: Iterable[Measurement]) -> None:
+        content = {measurement.name: measurement._asdict() for measurement in measurements}
+        with open(path, 'w') as file:
+            json.dump(content, file, indent=2, sort_keys=True)
+            file.write('\n')
+
+    @staticmethod
+    def add(path: str, measurements: Iterable[Measurement]) -> List[str]:
+        """
+        Stores only measurements of benchmarks missing in the baseline, stored entries are kept unchanged.
+
+        :return: Names of the added benchmarks.
+        """
+        stored = Baseline.load(path) if os.path.exists(path) else {}
+        added = [measurement for measurement in measurements if measurement.name not in stored]
+        stored.update((measurement.name, measurement) for measurement in added)
+        Baseline.save(path, stored.values())
+        return [measurement.name for measurement in added]
+
+    @staticmethod
+    def load(path: str) -> Dict[str, Measurement]:
+        with open(path) as file:
+            content = json.load(file)
+        return {name: Measurement(**values) for name, values in content.items()}
+
+    @staticmethod
+    def compare(measurements: Iterable[Measurement], baseline: Dict[str, Measurement],
+                tolerance: float = 0.25) -> List[Regression]:
+        """
+        Returns benchmarks, which median is slower than the baseline by more than the tolerance.
+        Benchmarks missing in the baseline are ignored.
+
+        :param measurements: Current measurements.
+        :param baseline: Stored measurements by name.
+        :param tolerance: Allowed relative slowdown, e.g. 0.25 for 25 %.
+        """
+        regressions = []
+        for measurement in measurements:
+            stored = baseline.get(measurement.name)
+
+            if stored is not None and measurement.median > stored.median * (1 + tolerance):
+                regressions.append(Regression(measurement.name, stored.median, measurement.median))
+
+        return regressions
@@ -0,0 +1,239 @@
+import os
+import subprocess
+import sys
+import numpy as np
+import diving_calc
+from benchmark_harness import BenchmarkSuite
+from diving_calc.algorithm.batch_planner import BatchPlanner, PlanGrid
+from diving_calc.algorithm.buhlmann_algorithm import AlgorithmParams, BuhlmannAlgorithm
+from diving_calc.algorithm.log_replay import LogReplay
+from diving_calc.algorithm.options import Options, SafetyStop
+from diving_calc.algorithm.plan_cache import PlanCache
+from diving_calc.algorithm.profile_analyzer import ProfileAnalyzer
+from diving_calc.algorithm.profile_events import ProfileEvents
+from diving_calc.calculators.altitude_batch_calculator import AltitudeBatchCalculator
+from diving_calc.calculators.altitude_calculator import AltitudeCalculator
+from diving_calc.calculators.cns_calculator import CnsCalculator
+from diving_calc.calculators.nitrox_batch_calculator import NitroxBatchCalculator
+from diving_calc.calculators.nitrox_calculator import NitroxCalculator
+from diving_calc.calculators.oxygen_toxicity_batch import OxygenToxicityBatch
+from diving_calc.consumption.consumption import Consumption, ConsumptionOptions
+from diving_calc.consumption.diver import Diver
+from diving_calc.consumption.tanks import Tank
+from diving_calc.depths.compact_profile import CompactProfile
+from diving_calc.depths.segments import Segment, Segments
+from diving_calc.gases.blend_planner import BlendPlanner, CylinderFill, SupplyBank
+from diving_calc.gases.gas_blender_batch import GasBlenderBatch
+from diving_calc.gases.gas_index import GasIndex
+from diving_calc.gases.gas_mixtures import GasMixtures
+from diving_calc.gases.gas_mixtures_batch import GasMixturesBatch
+from diving_calc.gases.gases import Gases
+from diving_calc.gases.standard_gases import Gas, StandardGases
+from diving_calc.physics.altitude_pressure_batch import AltitudeTable
+from diving_calc.physics.compressibility import Compressibility
+from diving_calc.physics.compressibility_batch import CompressibilityBatch
+from diving_calc.physics.depth_converter import DepthConverter
+from diving_calc.physics.pressure_converter import Salinity
+from diving_calc.physics.time import Time
+
+# Budgets in milliseconds taken from the reference performanceTests.spec.ts
+DECOMPRESSION_BUDGET = 150
+NO_DECO_LIMIT_BUDGET = 50
+MAX_BOTTOM_TIME_BUDGET = 1000
+# Whole process of single command line calculation including start of the interpreter
+CLI_COLD_START_BUDGET = 100
+
+
+def cli_cold_start_action():
+    source = os.path.dirname(os.path.dirname(diving_calc.__file__))
+    environment = dict(os.environ, PYTHONPATH=source)
+    command = [sys.executable, '-m', 'diving_calc.cli', 'mod', '--ppo2', '1.4', '--o2', '32']
+    return lambda: subprocess.run(command, env=environment, check=True, stdout=subprocess.DEVNULL)
+
+
+def create_options(gf_low: float, gf_high: float, salinity: Salinity) -> Options:
+    """Same options as the reference OptionExtensions.createOptions."""
+    options = Options(gf_low, gf_high, 1.4, 1.6, salinity)
+    options.ascent_speed_6m = 10
+    options.ascent_speed_50perc_to_6m = 10
+    options.ascent_speed_50perc = 10
+    options.descent_speed = 20
+    options.gas_switch_duration = 1
+    return options
+
+
+def decompression_params() -> AlgorithmParams:
+    options = create_options(0.4, 0.85, Salinity.SALT)
+    options.safety_stop = SafetyStop.ALWAYS
+    options.round_stops_to_minutes = True
+    options.deco_stop_distance = 3
+    options.altitude = 0
+
+    gases = Gases(StandardGases.trimix1260, StandardGases.trimix3525, Gas(0.5, 0.2), StandardGases.oxygen)
+    segments = Segments()
+    segments.add(10, StandardGases.trimix3525, 60)
+    segments.add(75, StandardGases.trimix1260, 5 * 60)
+    segments.add_flat(StandardGases.trimix1260, 5 * 60)
+    return AlgorithmParams.for_multilevel_dive(segments, gases, options)
+
+
+def no_deco_limit_params() -> AlgorithmParams:
+    options = create_options(1, 1, Salinity.FRESH)
+    return AlgorithmParams.for_simple_dive(6, StandardGases.air, options)
+
+
+def max_bottom_time_action():
+    options = create_options(0.4, 0.85, Salinity.FRESH)
+    options.safety_stop = SafetyStop.ALWAYS
+    options.problem_solving_duration = 2
+    consumption = Consumption(DepthConverter.for_fresh_water())
+    consumption_options = ConsumptionOptions(Diver(20), Consumption.default_primary_reserve, 0)
+    tanks = [Tank(24, 200, StandardGases.air)]
+    segments = Segments()
+    segments.add(5, StandardGases.air, 60)
+    segments.add_flat(StandardGases.air, 10 * 60)
+    return lambda: consumption.max_bottom_time(segments, tanks, consumption_options, options)
+
+
+def replay_samples(count: int = 3600):
+    """Square dive to 30 m sampled each second."""
+    times = np.arange(count, dtype=float)
+    depths = np.minimum(np.minimum(times / 6, 30), (count - times) / 6)
+    return list(zip(times.tolist(), depths.tolist(), [None] * count))
+
+
+def weekly_otu_action(recorded: CompactProfile, converter: DepthConverter):
+    """Two logged dives a day for a week of ten divers."""
+    divers, days, dives_per_day = 10, 7, 2
+    profiles = [recorded] * (divers * days * dives_per_day)
+    diver_indexes = np.repeat(np.arange(divers), days * dives_per_day)
+    day_indexes = np.tile(np.repeat(np.arange(days), dives_per_day), divers)
+    toxicity = OxygenToxicityBatch(converter)
+    return lambda: OxygenToxicityBatch.daily_totals(toxicity.for_profiles(profiles).otu, diver_indexes, day_indexes)
+
+
+def profile_catalog_action(converter: DepthConverter):
+    """Square dives with gas switch during ascent for each depth and bottom gas."""
+    catalog = []
+    for depth in range(10, 91):
+        for gas in (StandardGases.air, StandardGases.ean32, StandardGases.trimix2135, StandardGases.trimix1845,
+                    StandardGases.trimix1070):
+            catalog.append([
+                Segment(0, depth, gas, depth * 3),
+                Segment(depth, depth, gas, 20 * 60),
+                Segment(depth, 21, gas, (depth - 21) * 6),
+                Segment(21, 21, StandardGases.ean50, 600),
+                Segment(21, 6, StandardGases.ean50, 90),
+                Segment(6, 6, StandardGases.oxygen, 600),
+                Segment(6, 0, StandardGases.oxygen, 36),
+            ])
+    analyzer = ProfileAnalyzer(create_options(0.4, 0.85, Salinity.SALT), converter)
+    return lambda: analyzer.analyze_many(catalog)
+
+
+def profile_events_edit_action():
+    """Keystroke edit of one stop in the middle of a long multilevel profile."""
+    segments = []
+    for level in range(150):
+        depth = 20 + level % 10
+        segments.append(Segment(segments[-1].end_depth if segments else 0, depth, StandardGases.ean32, 30))
+        segments.append(Segment(depth, depth, StandardGases.ean32, 120))
+    events = ProfileEvents.from_profile(segments, create_options(0.4, 0.85, Salinity.SALT))
+    edited = len(segments) // 2 + 1
+    durations = iter(range(60, 10 ** 9))
+    return lambda: events.update(edited, Segment(segments[edited].start_depth, segments[edited].end_depth,
+                                                 StandardGases.ean32, next(durations)))
+
+
+def create_suite() -> BenchmarkSuite:
+    suite = BenchmarkSuite()
+    converter = DepthConverter.for_salt_water()
+    nitrox = NitroxCalculator(converter)
+    nitrox_batch = NitroxBatchCalculator(converter)
+    depths = np.linspace(0, 100, 10_000)
+    fractions = np.linspace(0.21, 1, 10_000)
+    bars = converter.to_bar_many(depths)
+
+    # scalar paths, too fast to be timed alone
+    suite.add('gas_mixtures.mod', lambda: GasMixtures.mod(1.4, 0.32), iterations=1000)
+    suite.add('gas_mixtures.end', lambda: GasMixtures.end(5, 0.45, 0.18), iterations=1000)
+    suite.add('nitrox_calculator.ead', lambda: nitrox.ead(32, 30), iterations=1000)
+    suite.add('nitrox_calculator.best_mix', lambda: nitrox.best_mix(1.4, 30), iterations=1000)
+    suite.add('depth_converter.to_bar', lambda: converter.to_bar(30), iterations=1000)
+    suite.add('depth_converter.from_bar', lambda: converter.from_bar(4), iterations=1000)
+    suite.add('depth_converter.for_salt_water', lambda: DepthConverter.for_salt_water(300), iterations=1000)
+    suite.add('altitude_calculator.theoretical_depth',
+              lambda: AltitudeCalculator(20, 1500).theoretical_depth, iterations=1000)
+    compressibility = Compressibility()
+    suite.add('compressibility.pressure', lambda: compressibility.pressure(StandardGases.trimix1845, 232),
+              iterations=1000)
+
+    # batch paths, 10 000 elements each
+    suite.add('gas_mixtures_batch.mod', lambda: GasMixturesBatch.mod(1.4, fractions), iterations=10)
+    suite.add('nitrox_batch_calculator.ead', lambda: nitrox_batch.ead(32, depths), iterations=10)
+    suite.add('depth_converter.to_bar_many', lambda: converter.to_bar_many(depths), iterations=10)
+    suite.add('depth_converter.from_bar_many', lambda: converter.from_bar_many(bars), iterations=10)
+    volumes = depths * 5
+    suite.add('compressibility_batch.pressure', lambda: CompressibilityBatch.pressure(volumes, fractions, 0),
+              iterations=10)
+    start_pressures = depths / 2
+    targets_he = fractions * 0.5
+    # 500 lake sites, depth grid each meter up to 60 m
+    sites = np.linspace(0, 4000, 500)
+    site_depths = np.arange(1, 61)
+    exact_altitude = AltitudeBatchCalculator()
+    table_altitude = AltitudeBatchCalculator(AltitudeTable(0, 5000))
+    suite.add('altitude_batch_calculator.exact_500_sites',
+              lambda: exact_altitude.depth_grid(sites, site_depths), iterations=10)
+    suite.add('altitude_batch_calculator.table_500_sites',
+              lambda: table_altitude.depth_grid(sites, site_depths), iterations=10)
+    suite.add('gas_blender_batch.blend',
+              lambda: GasBlenderBatch.blend(start_pressures, 0.21, 0, 220, 0.21, targets_he, [1, 0, 0.209], [0, 1, 0]))
+
+    # planners
+    algorithm = BuhlmannAlgorithm()
+    deco_params = decompression_params()
+    ndl_params = no_deco_limit_params()
+    suite.add('buhlmann.decompression', lambda: algorithm.decompression(deco_params),
+              budget=DECOMPRESSION_BUDGET)
+    suite.add('buhlmann.no_deco_limit', lambda: algorithm.no_deco_limit(ndl_params), budget=NO_DECO_LIMIT_BUDGET)
+    cache = PlanCache()
+    suite.add('plan_cache.decompression_hit', lambda: cache.decompression(deco_params), iterations=100)
+
+    suite.add('consumption.max_bottom_time', max_bottom_time_action(), budget=MAX_BOTTOM_TIME_BUDGET)
+
+    table = PlanGrid([12, 18, 24, 30, 36], [10, 20, 30, 40], ['Air', 'EAN32'])
+    table_options = create_options(0.4, 0.85, Salinity.SALT)
+    suite.add('batch_planner.table_40_plans', lambda: list(BatchPlanner(table_options, workers=1).plan(table)))
+
+    banks = [SupplyBank(StandardGases.oxygen, 200, 0.01), SupplyBank(Gas(0, 1), 200, 0.05),
+             SupplyBank(StandardGases.air, 300, 0.002), SupplyBank(StandardGases.ean32, 230, 0.004),
+             SupplyBank(StandardGases.ean50, 200, 0.006)]
+    fills = [CylinderFill(start, StandardGases.air, 220, StandardGases.by_name(name), 12)
+             for name in StandardGases.all_names() for start in (0, 30, 50)] * 10
+    suite.add('blend_planner.queue_390_fills', lambda: BlendPlanner(banks).plan_queue(fills))
+
+    samples = replay_samples()
+    replay = LogReplay(create_options(0.4, 0.85, Salinity.SALT))
+    suite.add('log_replay.hour_by_seconds', lambda: sum(1 for _ in replay.replay(samples)))
+
+    # the recorded log has one segment per second
+    recorded = replay.record(samples)
+    segments = recorded.to_segments()
+    cns = CnsCalculator(converter)
+    suite.add('log_replay.record_hour', lambda: replay.record(samples))
+    suite.add('cns_calculator.segments_hour', lambda: cns.calculate_for_profile(segments))
+    suite.add('cns_calculator.compact_profile_hour', lambda: cns.calculate_for_compact_profile(recorded), iterations=10)
+    suite.add('oxygen_toxicity_batch.weekly_otu_140_logs', weekly_otu_action(recorded, converter))
+    suite.add('compact_profile.depth_at', lambda: recorded.depth_at(1800.5), iterations=1000)
+    suite.add('profile_analyzer.catalog_405_plans', profile_catalog_action(converter))
+    suite.add('profile_events.edit_300_segments', profile_events_edit_action(), iterations=100)
+    loaded = algorithm.decompression(deco_params).tissues
+    suite.add('buhlmann.surface_interval_36_hours',
+              lambda: BuhlmannAlgorithm.apply_surface_interval(loaded, 0, Time.ONE_HOUR * 36), iterations=1000)
+    catalog = GasIndex.for_gases([StandardGases.by_name(name) for name in StandardGases.all_names()],
+                                 converter, 1.6)
+    stops = [depth / 10 for depth in range(0, 1000)]
+    suite.add('gas_index.best_gas_1000_depths', lambda: [catalog.best_gas(depth) for depth in stops], iterations=10)
+    suite.add('cli.cold_start_mod', cli_cold_start_action(), budget=CLI_COLD_START_BUDGET)
+    return suite
@@ -0,0 +1,113 @@
+"""
+Measures throughput and latency of the calculation service on localhost.
+
+    PYTHONPATH=src python tests/benchmarks/load_generator.py --connections 64 --requests 200
+
+Without --port the service is started in this process with given --workers,
+otherwise already running service (diving-calc serve) is measured.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import List, NamedTuple, Optional
+from diving_calc.service import CalculationService
+
+
+class LoadResult(NamedTuple):
+    requests: int
+    errors: int
+    # in seconds
+    elapsed: float
+    # latencies in milliseconds
+    median: float
+    p99: float
+
+    @property
+    def throughput(self) -> float:
+        """Requests per second."""
+        return self.requests / self.elapsed
+
+
+def random_target(generator: random.Random) -> str:
+    """Mix of the calculations asked by booking and fill station systems."""
+    depth = generator.randint(5, 60)
+    o2 = generator.randint(21, 40)
+    return generator.choice([
+        f'/mod?ppo2=1.4&o2={o2}',
+        f'/ead?depth={depth}&o2={o2}',
+        f'/best_mix?depth={depth}&ppo2=1.4',
+        f'/partial_pressure?depth={depth}&o2={o2}&salinity=fresh&altitude=400',
+        f'/pressure?altitude={generator.randint(0, 3000)}',
+    ])
+
+
+async def client(host: str, port: int, requests: int, seed: int, latencies: List[float]) -> int:
+    """Sends the requests one after another over single kept alive connection, returns count of errors."""
+    generator = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    errors = 0
+
+    try:
+        for _ in range(requests):
+            started = time.perf_counter()
+            writer.write(f'GET {random_target(generator)} HTTP/1.1\r\nHost: {host}\r\n\r\n'.encode())
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) != b'\r\n':
+                name, _, value = line.partition(b':')
+                if name.lower() == b'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += status != 200
+    finally:
+        writer.close()
+
+    return errors
+
+
+async def generate_load(host: str, port: int, connections: int, requests: int) -> LoadResult:
+    latencies: List[float] = []
+    started = time.perf_counter()
+    errors = await asyncio.gather(*(client(host, port, requests, seed, latencies) for seed in range(connections)))
+    elapsed = time.perf_counter() - started
+    percentiles = statistics.quantiles(latencies, n=100)
+    return LoadResult(len(latencies), sum(errors), elapsed, statistics.median(latencies), percentiles[98])
+
+
+async def measure(host: str, port: Optional[int], connections: int, requests: int, workers: Optional[int],
+                  batch_window: float) -> LoadResult:
+    if port is not None:
+        return await generate_load(host, port, connections, requests)
+
+    service = CalculationService(workers, batch_window=batch_window)
+    server = await service.serve(host, 0)
+    try:
+        local_port = server.sockets[0].getsockname()[1]
+        return await generate_load(host, local_port, connections, requests)
+    finally:
+        server.close()
+        service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None, help='Port of running service, default starts own one.')
+    parser.add_argument('--connections', type=int, default=64, help='Count of concurrent clients.')
+    parser.add_argument('--requests', type=int, default=200, help='Count of requests sent by each client.')
+    parser.add_argument('--workers', type=int, default=None, help='Workers of the started service.')
+    parser.add_argument('--batch-window', type=float, default=1, help='Batch window of the started service in ms.')
+    args = parser.parse_args()
+
+    result = asyncio.run(measure(args.host, args.port, args.connections, args.requests, args.workers,
+                                 args.batch_window / 1000))
+    print(f'{result.requests} requests, {result.errors} errors in {result.elapsed:.2f} s')
+    print(f'throughput {result.throughput:.0f} requests/s, median {result.median:.2f} ms, p99 {result.p99:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Runs the benchmark suite and compares it with the stored baseline.
+
+    PYTHONPATH=src python tests/benchmarks/run_benchmarks.py            # print the measurements
+    PYTHONPATH=src python tests/benchmarks/run_benchmarks.py --add      # store only new benchmarks
+    PYTHONPATH=src python tests/benchmarks/run_benchmarks.py --save     # store new baseline
+    PYTHONPATH=src python tests/benchmarks/run_benchmarks.py --compare  # fail on regression
+
+Baseline is machine specific, store it again after moving to different hardware.
+New benchmarks are added by --add, so the stored measurements of the others stay comparable.
+Budgets of selected benchmarks are also checked by pytest -m benchmark.
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional
+from benchmark_harness import Baseline
+from benchmark_suite import create_suite
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Measures performance of the diving calculations.')
+    parser.add_argument('names', nargs='*', help='Names of benchmarks to run, default all.')
+    parser.add_argument('--rounds', type=int, default=10, help='Count of measured rounds.')
+    parser.add_argument('--warmup', type=int, default=2, help='Count of not measured rounds.')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Path to the baseline JSON file.')
+    parser.add_argument('--save', action='store_true', help='Stores the measurements as new baseline.')
+    parser.add_argument('--add', action='store_true', help='Stores only benchmarks missing in the baseline.')
+    parser.add_argument('--compare', action='store_true', help='Fails, if slower than the baseline.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative slowdown, default 0.25.')
+    args = parser.parse_args(argv)
+
+    suite = create_suite()
+    measurements = suite.run(args.rounds, args.warmup, args.names or None)
+
+    print(f"{'benchmark':40} {'median ms':>12} {'min ms':>12} {'stdev ms':>12}")
+    for measurement in measurements:
+        print(f'{measurement.name:40} {measurement.median:12.4f} {measurement.min:12.4f} {measurement.stdev:12.4f}')
+
+    failed = False
+    for measurement in suite.over_budget(measurements):
+        budget = suite.benchmarks[measurement.name].budget
+        print(f'{measurement.name}: {measurement.median:.2f} ms exceeds budget {budget} ms')
+        failed = True
+
+    if args.compare:
+        for regression in Baseline.compare(measurements, Baseline.load(args.baseline), args.tolerance):
+            print(f'{regression.name}: {regression.current:.4f} ms is {regression.ratio:.2f}x '
+                  f'slower than baseline {regression.baseline:.4f} ms')
+            failed = True
+
+    if args.save:
+        Baseline.save(args.baseline, measurements)
+    elif args.add:
+        for name in Baseline.add(args.baseline, measurements):
+            print(f'{name}: added to baseline')
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
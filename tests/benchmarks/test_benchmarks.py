@@ -0,0 +1,83 @@
+import json
+import pytest
+from benchmark_harness import Baseline, BenchmarkSuite, Measurement
+from benchmark_suite import create_suite
+
+
+class FakeClock:
+    def __init__(self, step: float):
+        self.step = step
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+@pytest.fixture(scope='module')
+def suite() -> BenchmarkSuite:
+    return create_suite()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('name', ['buhlmann.decompression', 'buhlmann.no_deco_limit'])
+def test_planner_fits_reference_budget(suite, name):
+    # timing depends on the machine, so it runs only on request by pytest -m benchmark
+    measurements = suite.run(rounds=3, warmup=1, names=[name])
+    assert suite.over_budget(measurements) == []
+
+
+def test_statistics_per_single_call():
+    calls = []
+    suite = BenchmarkSuite(clock=FakeClock(0.004))
+    suite.add('action', lambda: calls.append(1), iterations=2)
+    measurement, = suite.run(rounds=5, warmup=3)
+    assert len(calls) == 16
+    assert measurement.median == pytest.approx(2)
+    assert measurement.stdev == pytest.approx(0)
+
+
+def test_duplicate_benchmark_rejected():
+    suite = BenchmarkSuite()
+    suite.add('action', lambda: None)
+    with pytest.raises(ValueError):
+        suite.add('action', lambda: None)
+
+
+def test_over_budget_reported():
+    suite = BenchmarkSuite(clock=FakeClock(0.1))
+    suite.add('slow', lambda: None, budget=50)
+    suite.add('unlimited', lambda: None)
+    measurements = suite.run(rounds=1, warmup=0)
+    assert [measurement.name for measurement in suite.over_budget(measurements)] == ['slow']
+
+
+def test_baseline_round_trip(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    measurement = Measurement('plan', 3, 1, 1.0, 2.0, 2.0, 0.5)
+    Baseline.save(path, [measurement])
+    assert Baseline.load(path) == {'plan': measurement}
+    with open(path) as file:
+        assert json.load(file)['plan']['median'] == 2.0
+
+
+def test_add_keeps_stored_measurements(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    Baseline.save(path, [Measurement('plan', 3, 1, 1.0, 2.0, 2.0, 0.5)])
+    current = [Measurement('plan', 3, 1, 9.0, 9.0, 9.0, 0), Measurement('new', 3, 1, 1.0, 1.0, 1.0, 0)]
+    assert Baseline.add(path, current) == ['new']
+    assert Baseline.load(path) == {'plan': Measurement('plan', 3, 1, 1.0, 2.0, 2.0, 0.5), 'new': current[1]}
+
+
+def test_compare_reports_only_regressions_over_tolerance():
+    baseline = {
+        'fast': Measurement('fast', 3, 1, 1.0, 1.0, 1.0, 0),
+        'slow': Measurement('slow', 3, 1, 1.0, 1.0, 1.0, 0),
+    }
+    current = [
+        Measurement('fast', 3, 1, 1.0, 1.2, 1.2, 0),
+        Measurement('slow', 3, 1, 1.0, 1.5, 1.5, 0),
+        Measurement('new', 3, 1, 1.0, 9.0, 9.0, 0),
+    ]
+    regressions = Baseline.compare(current, baseline, tolerance=0.25)
+    assert [(regression.name, regression.ratio) for regression in regressions] == [('slow', 1.5)]
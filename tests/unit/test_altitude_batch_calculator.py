@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from diving_calc.calculators.altitude_batch_calculator import AltitudeBatchCalculator
+from diving_calc.calculators.altitude_calculator import AltitudeCalculator
+from diving_calc.physics.altitude_pressure_batch import AltitudePressureBatch, AltitudeTable
+from diving_calc.physics.pressure_converter import PressureConverter
+
+altitudes = np.array([0, 300, 1500, 3200, 4800])
+depths = np.array([10, 20, 42])
+
+
+def exact_pressure(altitude):
+    return PressureConverter.pascal_to_bar(AltitudePressureBatch.pressure(altitude))
+
+
+def test_exact_theoretical_depths_match_scalar():
+    result = AltitudeBatchCalculator().depth_grid(altitudes, depths)
+    expected = [[AltitudeCalculator(depth, altitude).theoretical_depth for depth in depths] for altitude in altitudes]
+    assert result.shape == (5, 3)
+    assert result == pytest.approx(np.array(expected), abs=1e-12)
+
+def test_exact_altitudes_match_scalar():
+    pressures = np.array([1.1, 1.01325, 0.95, 0.6])
+    expected = [AltitudeCalculator().to_altitude(pressure) for pressure in pressures]
+    assert AltitudeBatchCalculator().to_altitude(pressures) == pytest.approx(expected, abs=1e-9)
+
+@pytest.mark.parametrize("pressure_tolerance", [1e-4, 1e-6, 1e-8])
+def test_interpolated_pressure_within_tolerance(pressure_tolerance):
+    table = AltitudeTable(0, 5000, pressure_tolerance=pressure_tolerance)
+    samples = np.random.default_rng(3).uniform(0, 5000, 50_000)
+    assert np.abs(table.to_pressure(samples) - exact_pressure(samples)).max() <= pressure_tolerance
+
+@pytest.mark.parametrize("altitude_tolerance", [1, 0.01, 1e-4])
+def test_interpolated_altitude_within_tolerance(altitude_tolerance):
+    table = AltitudeTable(200, 4000, altitude_tolerance=altitude_tolerance)
+    pressures = exact_pressure(np.random.default_rng(5).uniform(200, 4000, 50_000))
+    exact = AltitudePressureBatch.altitude(PressureConverter.bar_to_pascal(pressures))
+    assert np.abs(table.to_altitude(pressures) - exact).max() <= altitude_tolerance
+
+def test_lower_tolerance_needs_more_nodes():
+    assert AltitudeTable(pressure_tolerance=1e-8).size > AltitudeTable(pressure_tolerance=1e-6).size
+
+def test_values_outside_of_table_use_exact_formula():
+    table = AltitudeTable(500, 1000)
+    outside = np.array([0, 200, 1200, 6000])
+    assert table.to_pressure(outside) == pytest.approx(exact_pressure(outside), abs=1e-12)
+    pressures = exact_pressure(outside)
+    assert table.to_altitude(pressures) == pytest.approx(outside, abs=1e-6)
+
+def test_table_theoretical_depths_close_to_exact():
+    calculator = AltitudeBatchCalculator(AltitudeTable(0, 5000, pressure_tolerance=1e-7))
+    exact = AltitudeBatchCalculator().depth_grid(altitudes, depths)
+    assert calculator.depth_grid(altitudes, depths) == pytest.approx(exact, abs=1e-5)
+
+@pytest.mark.parametrize("min_altitude, max_altitude", [(-10, 100), (100, 100)])
+def test_table_rejects_invalid_range(min_altitude, max_altitude):
+    with pytest.raises(ValueError):
+        AltitudeTable(min_altitude, max_altitude)
@@ -0,0 +1,55 @@
+import pytest
+from diving_calc.algorithm.batch_planner import BatchPlanner, PlanGrid, PlanTask, TablePlanner
+from diving_calc.algorithm.options import Options
+
+
+def create_grid() -> PlanGrid:
+    return PlanGrid([12, 30, 60], [20, 40], ['Air', 'EAN32'])
+
+
+def test_grid_enumerates_all_cells_ordered_by_gas_depth_and_time():
+    tasks = list(create_grid().tasks())
+    assert len(tasks) == len(create_grid()) == 12
+    assert [task.index for task in tasks] == list(range(12))
+    assert tasks[0] == PlanTask(0, 12, 20, 'Air')
+    assert tasks[1] == PlanTask(1, 12, 40, 'Air')
+    assert tasks[6] == PlanTask(6, 12, 20, 'EAN32')
+
+def test_grid_rejects_unknown_gas():
+    with pytest.raises(ValueError):
+        PlanGrid([12], [20], ['Helium'])
+
+def test_standard_grid_covers_depths_in_steps():
+    grid = PlanGrid.standard([10], 3, 60, 3)
+    assert grid.depths[0] == 3
+    assert grid.depths[-1] == 60
+    assert len(grid.depths) == 20
+
+def test_table_planner_calculates_row():
+    row = TablePlanner(Options()).plan(PlanTask(0, 30, 20, 'Air'))
+    assert not row.error
+    assert row.runtime > 20
+    assert row.deco > 0
+    assert row.gas_use > 20 * 20 * 4
+
+def test_table_planner_reports_not_breathable_gas():
+    row = TablePlanner(Options()).plan(PlanTask(0, 60, 20, 'EAN32'))
+    assert row.error == 'Gas is not breathable at depth.'
+
+def test_table_planner_reports_too_short_bottom_time():
+    row = TablePlanner(Options()).plan(PlanTask(0, 40, 1, 'Air'))
+    assert row.error == 'Bottom time is shorter than descent.'
+
+def test_process_pool_returns_the_same_rows_in_order():
+    grid = create_grid()
+    expected = list(BatchPlanner(Options(), workers=1).plan(grid))
+    rows = list(BatchPlanner(Options(), workers=2, chunk_size=2).plan(grid))
+    assert rows == expected
+
+def test_completed_tasks_are_skipped():
+    rows = list(BatchPlanner(Options(), workers=1).plan(create_grid(), completed={0, 1, 5}))
+    assert [row.index for row in rows] == [2, 3, 4, 6, 7, 8, 9, 10, 11]
+
+def test_chunks_split_tasks():
+    chunks = list(BatchPlanner.chunks(range(5), 2))
+    assert chunks == [[0, 1], [2, 3], [4]]
@@ -0,0 +1,29 @@
+import pytest
+from diving_calc.common.binary_interval_search import BinaryIntervalSearch, SearchContext
+
+
+@pytest.mark.parametrize("limit", [0, 1, 59, 60, 61, 1234, 3599])
+def test_finds_highest_value_meeting_condition(limit):
+    context = SearchContext(60, 0, 3600, lambda value: value <= limit)
+    assert BinaryIntervalSearch().search(context) == limit
+
+def test_condition_not_met_at_all_returns_initial_value():
+    context = SearchContext(10, 5, 100, lambda value: False)
+    assert BinaryIntervalSearch().search(context) == 5
+
+def test_counts_evaluations_of_last_search():
+    evaluated = []
+    search = BinaryIntervalSearch()
+    context = SearchContext(60, 0, 3600, lambda value: evaluated.append(value) or value <= 1000)
+    search.search(context)
+    assert search.evaluations == len(evaluated)
+    # 18 estimation steps followed by halving of the 60 seconds interval
+    assert search.evaluations < 30
+
+def test_max_value_smaller_than_initial_value_raises():
+    with pytest.raises(ValueError):
+        BinaryIntervalSearch().search(SearchContext(1, 10, 5, lambda value: True))
+
+def test_step_larger_than_range_raises():
+    with pytest.raises(ValueError):
+        BinaryIntervalSearch().search(SearchContext(20, 0, 10, lambda value: True))
@@ -0,0 +1,76 @@
+import pytest
+from diving_calc.gases.blend_planner import BlendPlanner, CylinderFill, SupplyBank
+from diving_calc.gases.standard_gases import Gas, StandardGases
+
+helium = Gas(0, 1)
+
+
+@pytest.fixture
+def banks():
+    return [
+        SupplyBank(StandardGases.oxygen, 200, 0.01),
+        SupplyBank(helium, 200, 0.05),
+        SupplyBank(StandardGases.air, 300, 0.002),
+        SupplyBank(StandardGases.ean32, 230, 0.004),
+        SupplyBank(StandardGases.ean50, 200, 0.006),
+    ]
+
+
+def test_cheapest_nitrox_uses_oxygen_and_air(banks):
+    planned = BlendPlanner(banks).plan(CylinderFill(50, StandardGases.air, 220, StandardGases.ean32, 12))
+    assert [step.gas for step in planned.steps] == [StandardGases.oxygen, StandardGases.air]
+    assert planned.steps[-1].pressure == 220
+    assert planned.steps[-1].mix == StandardGases.ean32
+    assert planned.total_price == pytest.approx(sum(step.volume * price for step, price in
+                                                    zip(planned.steps, (0.01, 0.002))))
+
+
+def test_cheap_premix_used_alone(banks):
+    banks[3] = SupplyBank(StandardGases.ean32, 230, 0.001)
+    planned = BlendPlanner(banks).plan(CylinderFill(0, StandardGases.air, 220, StandardGases.ean32))
+    assert [step.gas for step in planned.steps] == [StandardGases.ean32]
+
+
+def test_single_bank_tops_up_the_same_mix():
+    planned = BlendPlanner([SupplyBank(StandardGases.air, 300, 0.002)]).plan(
+        CylinderFill(50, StandardGases.air, 200, StandardGases.air, 12))
+    assert planned.error == ''
+    assert [step.gas for step in planned.steps] == [StandardGases.air]
+    assert planned.steps[0].pressure == 200
+
+
+def test_trimix_from_two_banks():
+    trimix = Gas(0.16, 0.5)
+    banks = [SupplyBank(helium, 200, 0.05), SupplyBank(StandardGases.ean32, 230, 0.004)]
+    planned = BlendPlanner(banks).plan(CylinderFill(0, StandardGases.air, 200, trimix))
+    assert [step.gas for step in planned.steps] == [helium, StandardGases.ean32]
+    assert planned.steps[-1].mix == trimix
+
+
+def test_trimix_filled_from_lowest_bank_pressure(banks):
+    planned = BlendPlanner(banks).plan(CylinderFill(0, StandardGases.air, 200, StandardGases.trimix2135))
+    assert [step.gas for step in planned.steps] == [StandardGases.oxygen, helium, StandardGases.air]
+    assert [step.mix_name for step in planned.steps][-1] == 'Helitrox 21/35'
+    assert all(step.pressure <= bank.pressure for step, bank in zip(planned.steps, [banks[0], banks[1], banks[2]]))
+
+
+def test_bank_pressure_limits_the_fill(banks):
+    planned = BlendPlanner(banks).plan(CylinderFill(0, StandardGases.air, 220, StandardGases.oxygen))
+    assert planned.error == BlendPlanner.no_solution
+    assert planned.steps == ()
+    assert planned.total_price == 0
+
+
+def test_queue_searches_each_state_once(banks):
+    planner = BlendPlanner(banks)
+    fills = [CylinderFill(30, StandardGases.air, 220, StandardGases.by_name(name), size)
+             for name in StandardGases.all_names() for size in (7, 12, 15)]
+    planned = planner.plan_queue(fills)
+    assert len(planned) == len(fills)
+    assert planner.cache_info().misses == len(StandardGases.all_names())
+    assert planned[1].total_price == pytest.approx(planned[0].total_price * 12 / 7)
+
+
+def test_negative_price_rejected():
+    with pytest.raises(ValueError, match='unit_price must be positive number'):
+        BlendPlanner([SupplyBank(StandardGases.air, 200, -1)])
@@ -0,0 +1,161 @@
+import math
+import pytest
+from diving_calc.algorithm.buhlmann_algorithm import AlgorithmParams, BuhlmannAlgorithm
+from diving_calc.algorithm.calculated_profile import EventType
+from diving_calc.algorithm.options import Options, SafetyStop
+from diving_calc.depths.segments import Segments
+from diving_calc.gases.gases import Gases
+from diving_calc.gases.standard_gases import Gas, StandardGases
+from diving_calc.physics.pressure_converter import Salinity
+
+
+def create_options(**overrides) -> Options:
+    options = Options(0.4, 0.85, 1.4, 1.6, Salinity.SALT)
+    options.ascent_speed_6m = 10
+    options.ascent_speed_50perc_to_6m = 10
+    options.ascent_speed_50perc = 10
+    options.descent_speed = 20
+    options.gas_switch_duration = 1
+    options.safety_stop = SafetyStop.ALWAYS
+    options.round_stops_to_minutes = True
+    for name, value in overrides.items():
+        setattr(options, name, value)
+    return options
+
+def bottom_segments(depth: float, gas: Gas, descent: float, bottom: float) -> Segments:
+    segments = Segments()
+    segments.add(depth, gas, descent)
+    segments.add_flat(gas, bottom)
+    return segments
+
+def calculate_plan(gases: Gases, segments: Segments, options: Options) -> str:
+    params = AlgorithmParams.for_multilevel_dive(segments, gases, options)
+    profile = BuhlmannAlgorithm().decompression(params)
+    return ' '.join(f'{s.start_depth:g},{s.end_depth:g},{round(s.duration):g};' for s in profile.segments)
+
+
+@pytest.mark.parametrize("salinity, expected", [
+    (Salinity.SALT, '0,40,120; 40,40,480; 40,3,222; 3,3,46; 3,0,18;'),
+    (Salinity.BRACKISH, '0,40,120; 40,40,480; 40,3,222; 3,3,38; 3,0,18;'),
+    (Salinity.FRESH, '0,40,120; 40,40,480; 40,3,222; 3,3,22; 3,0,18;'),
+])
+def test_stops_by_seconds_depend_on_salinity(salinity, expected):
+    options = create_options(salinity=salinity, round_stops_to_minutes=False, safety_stop=SafetyStop.NEVER)
+    segments = bottom_segments(40, StandardGases.air, 120, 480)
+    assert calculate_plan(Gases(StandardGases.air), segments, options) == expected
+
+def test_altitude_adds_deeper_stops():
+    options = create_options(altitude=1000, round_stops_to_minutes=False, safety_stop=SafetyStop.NEVER)
+    segments = bottom_segments(40, StandardGases.air, 120, 480)
+    expected = '0,40,120; 40,40,480; 40,6,204; 6,6,22; 6,3,18; 3,3,68; 3,0,18;'
+    assert calculate_plan(Gases(StandardGases.air), segments, options) == expected
+
+def test_air_decompression_rounded_to_minutes():
+    segments = bottom_segments(30, StandardGases.air, 90, 1410)
+    expected = '0,30,90; 30,30,1410; 30,9,126; 9,9,60; 9,6,18; 6,6,180; 6,3,18; 3,3,420; 3,0,18;'
+    assert calculate_plan(Gases(StandardGases.air), segments, create_options()) == expected
+
+def test_switches_to_deco_gases():
+    gases = Gases(StandardGases.air, StandardGases.ean50, StandardGases.oxygen)
+    segments = bottom_segments(30, StandardGases.air, 90, 510)
+    expected = '0,30,90; 30,30,510; 30,21,54; 21,21,60; 21,6,90; 6,6,60; 6,3,18; 3,3,180; 3,0,18;'
+    assert calculate_plan(gases, segments, create_options()) == expected
+
+def test_trimix_multilevel_with_travel_gas():
+    bottom_gas = StandardGases.trimix1260
+    gases = Gases(bottom_gas, StandardGases.trimix3525, Gas(0.5, 0.2), StandardGases.oxygen)
+    segments = Segments()
+    segments.add(10, StandardGases.trimix3525, 60)
+    segments.add(75, bottom_gas, 300)
+    segments.add_flat(bottom_gas, 300)
+    expected = '0,10,60; 10,75,300; 75,75,300; 75,36,234; 36,36,60; 36,21,90; 21,21,60; 21,18,18; ' \
+               '18,18,60; 18,15,18; 15,15,60; 15,12,18; 12,12,120; 12,9,18; 9,9,180; 9,6,18; 6,6,240; ' \
+               '6,3,18; 3,3,600; 3,0,18;'
+    assert calculate_plan(gases, segments, create_options()) == expected
+
+def test_no_deco_dive_adds_safety_stop():
+    segments = bottom_segments(30, StandardGases.ean32, 120, 600)
+    expected = '0,30,120; 30,30,600; 30,3,162; 3,3,180; 3,0,18;'
+    assert calculate_plan(Gases(StandardGases.ean32), segments, create_options()) == expected
+
+def test_user_defined_ascent_is_kept():
+    segments = bottom_segments(10, StandardGases.air, 60, 600)
+    segments.add(0, StandardGases.air, 60)
+    expected = '0,10,60; 10,10,600; 10,0,60;'
+    assert calculate_plan(Gases(StandardGases.air), segments, create_options()) == expected
+
+def test_not_registered_gas_is_error():
+    segments = bottom_segments(30, StandardGases.ean32, 120, 600)
+    params = AlgorithmParams.for_multilevel_dive(segments, Gases(StandardGases.air), create_options())
+    profile = BuhlmannAlgorithm().decompression(params)
+    assert not profile.was_calculated
+    assert profile.errors[0].type == EventType.ERROR
+
+def test_final_tissues_are_returned():
+    params = AlgorithmParams.for_simple_dive(30, StandardGases.air, create_options())
+    profile = BuhlmannAlgorithm().decompression(params)
+    assert profile.was_calculated
+    assert profile.tissues.p_n2[0] > 0.75
+
+
+@pytest.mark.parametrize("depth, expected", [
+    (10, 473), (12, 195), (15, 94), (18, 61), (21, 43), (24, 30), (27, 23),
+    (30, 17), (33, 14), (36, 11), (39, 9), (42, 9), (100, 5),
+])
+def test_no_deco_limit_fresh_water(depth, expected):
+    options = create_options(gf_low=1, gf_high=1, max_ppO2=1.6, max_deco_ppO2=1.6, salinity=Salinity.FRESH)
+    params = AlgorithmParams.for_simple_dive(depth, StandardGases.air, options)
+    assert BuhlmannAlgorithm().no_deco_limit(params) == expected
+
+@pytest.mark.parametrize("depth, expected", [
+    (10, 268), (15, 72), (21, 30), (30, 13), (39, 7), (100, 4),
+])
+def test_no_deco_limit_with_gradient_factors(depth, expected):
+    options = create_options(max_ppO2=1.6, max_deco_ppO2=1.6, salinity=Salinity.FRESH)
+    params = AlgorithmParams.for_simple_dive(depth, StandardGases.air, options)
+    assert BuhlmannAlgorithm().no_deco_limit(params) == expected
+
+def test_no_deco_limit_at_surface_is_infinite():
+    params = AlgorithmParams.for_simple_dive(0, StandardGases.air, create_options(gf_low=1, gf_high=1))
+    assert BuhlmannAlgorithm().no_deco_limit(params) == math.inf
+
+def test_no_deco_limit_of_saturated_shallow_dive_is_infinite():
+    segments = bottom_segments(6, StandardGases.air, 60, 1440 * 60)
+    params = AlgorithmParams.for_multilevel_dive(segments, Gases(StandardGases.air), create_options(gf_low=1, gf_high=1))
+    assert BuhlmannAlgorithm().no_deco_limit(params) == math.inf
+
+@pytest.mark.parametrize("depth", [3, 5, 8])
+def test_no_deco_limit_of_shallow_trimix_dive_is_infinite(depth):
+    options = create_options(gf_low=1, gf_high=1, salinity=Salinity.FRESH)
+    params = AlgorithmParams.for_simple_dive(depth, StandardGases.trimix1845, options)
+    assert BuhlmannAlgorithm().no_deco_limit(params) == math.inf
+
+@pytest.mark.parametrize("last_level_duration", [5, 40])
+def test_no_deco_limit_of_multilevel_dive(last_level_duration):
+    segments = bottom_segments(40, StandardGases.air, 120, 300)
+    segments.add(20, StandardGases.air, 120)
+    segments.add_flat(StandardGases.air, last_level_duration * 60)
+    options = create_options(gf_low=1, gf_high=1, salinity=Salinity.FRESH)
+    params = AlgorithmParams.for_multilevel_dive(segments, Gases(StandardGases.air), options)
+    assert BuhlmannAlgorithm().no_deco_limit(params) == 39
+
+def test_no_deco_limit_on_air_is_solved_analytically():
+    options = create_options(gf_low=1, gf_high=1, salinity=Salinity.FRESH)
+    params = AlgorithmParams.for_simple_dive(30, StandardGases.air, options)
+    result = BuhlmannAlgorithm().no_deco_limit_result(params)
+    assert result.closed_form
+    assert result.tissue_loads <= 3
+
+def test_no_deco_limit_on_trimix_is_searched():
+    options = create_options(gf_low=1, gf_high=1, salinity=Salinity.FRESH)
+    params = AlgorithmParams.for_simple_dive(30, StandardGases.trimix1845, options)
+    result = BuhlmannAlgorithm().no_deco_limit_result(params)
+    assert not result.closed_form
+    assert 0 < result.minutes < math.inf
+    assert result.tissue_loads < 20
+
+def test_profile_reports_tissue_loads():
+    segments = bottom_segments(30, StandardGases.air, 90, 1410)
+    params = AlgorithmParams.for_multilevel_dive(segments, Gases(StandardGases.air), create_options())
+    profile = BuhlmannAlgorithm().decompression(params)
+    assert len(profile.segments) < profile.tissue_loads < 100
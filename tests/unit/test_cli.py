@@ -0,0 +1,88 @@
+import io
+import os
+import subprocess
+import sys
+import json
+import argparse
+import pytest
+from diving_calc.cli import completed_rows, main, parse_range
+
+
+def test_parse_range_is_inclusive():
+    assert parse_range('12:18:3') == [12, 15, 18]
+
+def test_parse_range_accepts_list():
+    assert parse_range('10,25') == [10, 25]
+
+def test_parse_range_rejects_invalid_step():
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_range('12:18:0')
+
+def test_batch_writes_json_lines():
+    stdout = io.StringIO()
+    main(['batch', '--depths', '15,30', '--times', '20', '--gases', 'Air', '--workers', '1'], stdout)
+    rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [row['depth'] for row in rows] == [15, 30]
+    assert rows[1]['deco'] > 0
+
+def test_batch_resumes_interrupted_output(tmp_path):
+    output = tmp_path / 'table.jsonl'
+    arguments = ['batch', '--depths', '15,30,40', '--times', '20', '--gases', 'Air', '--workers', '1',
+                 '--output', str(output)]
+    main(arguments)
+    lines = output.read_text().splitlines(keepends=True)
+    # interrupted while writing the third row
+    output.write_text(lines[0] + lines[1][:10])
+
+    assert completed_rows(str(output)) == {0}
+    main(arguments + ['--resume'])
+    assert output.read_text().splitlines(keepends=True) == lines
+
+def run(arguments):
+    stdout = io.StringIO()
+    code = main(arguments, stdout)
+    return code, json.loads(stdout.getvalue())
+
+def test_mod_prints_json():
+    assert run(['mod', '--ppo2', '1.4', '--o2', '32']) == (0, {'mod': pytest.approx(33.28, abs=0.01)})
+
+def test_ead_in_fresh_water_at_altitude():
+    code, row = run(['ead', '--depth', '30', '--o2', '32', '--salinity', 'fresh', '--altitude', '1000'])
+    assert row['ead'] == pytest.approx(24.50, abs=0.01)
+
+def test_theoretical_depth_at_altitude():
+    assert run(['theoretical-depth', '--depth', '20', '--altitude', '300']) == \
+        (0, {'theoretical_depth': pytest.approx(20.73, abs=0.01)})
+
+def test_end_of_trimix():
+    assert run(['end', '--depth', '40', '--gas', '21/35'])[1]['end'] == pytest.approx(22.49, abs=0.01)
+
+def test_mnd_of_nitrox_equals_max_end():
+    assert run(['mnd', '--gas', 'EAN32', '--max-end', '40'])[1]['mnd'] == pytest.approx(40)
+
+def test_unknown_gas_reported_as_error():
+    assert run(['gas', 'Heliox']) == (1, {'error': "Unknown gas 'Heliox'"})
+
+def test_queries_answer_each_line(tmp_path):
+    queries = tmp_path / 'queries.txt'
+    queries.write_text('gas EAN32\n\nmod --ppo2 1.4\nceiling --gas 10/70\n')
+    stdout = io.StringIO()
+    assert main(['queries', '--input', str(queries)], stdout) == 1
+    rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert rows[0] == {'name': 'EAN32', 'o2': 32, 'he': 0, 'n2': 68}
+    assert 'error' in rows[1]
+    assert rows[2]['ceiling'] == pytest.approx(8.03, abs=0.01)
+
+def test_query_help_answered_by_error(tmp_path):
+    queries = tmp_path / 'queries.txt'
+    queries.write_text('mod --help\n--help\ngas Air\n')
+    stdout = io.StringIO()
+    assert main(['queries', '--input', str(queries)], stdout) == 1
+    rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert ['error' in row for row in rows] == [True, True, False]
+
+def test_calculations_do_not_import_numpy():
+    code = "import sys; from diving_calc.cli import main; main(['mnd', '--gas', '18/45']); " \
+           "sys.exit('numpy' in sys.modules)"
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    assert subprocess.run([sys.executable, '-c', code], env=environment, capture_output=True).returncode == 0
@@ -0,0 +1,73 @@
+import math
+import pytest
+from diving_calc.calculators.cns_calculator import CnsCalculator
+from diving_calc.depths.compact_profile import CompactProfile
+from diving_calc.depths.segments import Segment
+from diving_calc.gases.standard_gases import StandardGases
+from diving_calc.physics.depth_converter import DepthConverter
+
+calculator = CnsCalculator(DepthConverter.simple())
+ean32_fO2 = 0.32
+profile = [
+    Segment(0, 36.576, StandardGases.ean32, 180),
+    Segment(36.576, 36.576, StandardGases.ean32, 22 * 60),
+    Segment(36.576, 0, StandardGases.ean32, 30 * 60),
+]
+
+
+def test_empty_profile_has_no_cns():
+    assert calculator.calculate_for_profile([]) == pytest.approx(0)
+
+@pytest.mark.parametrize("start_depth, end_depth, duration, expected", [
+    (1, 1, 22, 0),
+    (36.576, 36.576, 0, 0),
+    (1, 2, 22, 0),
+    (70, 70, 22, 9609.7649171),
+    (70, 80, 22, 46159.655563),
+])
+def test_segment_cns(start_depth, end_depth, duration, expected):
+    assert calculator.calculate(ean32_fO2, start_depth, end_depth, duration) == pytest.approx(expected, abs=1e-6)
+
+def test_profile_cns_is_sum_of_segments():
+    assert calculator.calculate_for_profile(profile) == pytest.approx(26.8005612, abs=1e-6)
+
+def test_applies_depth_converter():
+    salt_calculator = CnsCalculator(DepthConverter.for_salt_water())
+    assert salt_calculator.calculate_for_profile(profile) == pytest.approx(27.65157, abs=1e-5)
+
+def test_compact_profile_cns_equals_segments_cns():
+    compact = CompactProfile.from_segments(profile)
+    assert calculator.calculate_for_compact_profile(compact) == pytest.approx(26.8005612, abs=1e-6)
+
+def test_empty_compact_profile_has_no_cns():
+    assert calculator.calculate_for_compact_profile(CompactProfile()) == pytest.approx(0)
+
+@pytest.mark.parametrize("start_depth, end_depth", [
+    (36.576, 36.576),
+    (1, 2),
+])
+def test_integrated_flat_or_low_segment_equals_average(start_depth, end_depth):
+    expected = calculator.calculate(ean32_fO2, start_depth, end_depth, 600)
+    assert calculator.calculate_integrated(ean32_fO2, start_depth, end_depth, 600) == pytest.approx(expected)
+
+def test_integrated_segment_matches_numeric_integration():
+    steps = 10_000
+    numeric = sum(calculator.calculate(ean32_fO2, 80 * index / steps, 80 * (index + 1) / steps, 600 / steps)
+                  for index in range(steps))
+    assert calculator.calculate_integrated(ean32_fO2, 0, 80, 600) == pytest.approx(numeric, rel=1e-6)
+    assert calculator.calculate_integrated(ean32_fO2, 80, 0, 600) == pytest.approx(numeric, rel=1e-6)
+
+@pytest.mark.parametrize("ppO2, expected", [
+    (0.5, math.inf),
+    (0.55, 720 * 60),
+    (1.4, 150 * 60),
+    (1.4000000001, 150 * 60),
+    (1.41, 120 * 60),
+    (1.6, 45 * 60),
+    (1.61, 0),
+])
+def test_noaa_limit(ppO2, expected):
+    assert CnsCalculator.noaa_limit(ppO2) == expected
+
+def test_noaa_cns_of_full_limit():
+    assert calculator.calculate_noaa(0.5, 22, 22, 45 * 60) == pytest.approx(100)
@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+from diving_calc.algorithm.buhlmann_algorithm import AlgorithmParams, BuhlmannAlgorithm
+from diving_calc.algorithm.options import Options
+from diving_calc.depths.compact_profile import CompactProfile
+from diving_calc.depths.segments import Segments
+from diving_calc.gases.gases import Gases
+from diving_calc.gases.standard_gases import StandardGases
+
+air = StandardGases.air
+ean50 = StandardGases.ean50
+
+
+def square_profile() -> CompactProfile:
+    profile = CompactProfile(capacity=1)
+    profile.add(30, air, 120)
+    profile.add_flat(air, 600)
+    profile.add(6, air, 240)
+    profile.add_flat(ean50, 180)
+    profile.add(0, ean50, 60)
+    return profile
+
+
+def test_append_grows_arrays():
+    profile = square_profile()
+    assert len(profile) == 5
+    assert profile.end_times.tolist() == [120, 720, 960, 1140, 1200]
+    assert profile.duration == 1200
+    assert profile.max_depth == 30
+    assert profile.current_depth == 0
+    assert profile.gas_indexes.tolist() == [0, 0, 0, 1, 1]
+    assert profile.o2_fractions.tolist() == [0.209, 0.209, 0.209, 0.5, 0.5]
+
+def test_columns_are_read_only():
+    with pytest.raises(ValueError):
+        square_profile().durations[0] = 1
+
+def test_empty_profile():
+    profile = CompactProfile()
+    assert profile.duration == 0
+    assert profile.current_depth == 0
+    assert profile.average_depth() == 0
+    assert profile.depth_at(10) == 0
+    assert profile.time_at(10) is None
+
+def test_segments_round_trip():
+    segments = Segments()
+    segments.add(20, air, 60)
+    segments.add_flat(air, 600)
+    segments.add(0, ean50, 120)
+    profile = CompactProfile.from_segments(segments.items)
+    restored = profile.to_segments()
+    assert [(s.start_depth, s.end_depth, s.gas, s.duration) for s in restored] == \
+        [(s.start_depth, s.end_depth, s.gas, s.duration) for s in segments.items]
+    assert profile.segment(-1).gas == ean50
+
+def test_segment_index_out_of_range():
+    with pytest.raises(IndexError):
+        square_profile().segment(5)
+
+def test_prefix_shares_rows_and_grows_independently():
+    profile = square_profile()
+    prefix = profile.prefix(2)
+    assert np.shares_memory(prefix.start_depths, profile.start_depths)
+    assert prefix.duration == 720
+    prefix.add(40, air, 60)
+    profile.add_flat(air, 10)
+    assert prefix.end_depths.tolist() == [30, 30, 40]
+    assert profile.end_depths.tolist() == [30, 30, 6, 6, 0, 0]
+    assert prefix.max_depth == 40
+    assert profile.max_depth == 30
+
+@pytest.mark.parametrize("run_time, expected", [
+    (0, 0),
+    (60, 15),
+    (120, 30),
+    (400, 30),
+    (840, 18),
+    (1200, 0),
+    (1201, 0),
+    (-1, 0),
+])
+def test_depth_at(run_time, expected):
+    assert square_profile().depth_at(run_time) == pytest.approx(expected)
+
+@pytest.mark.parametrize("depth, expected", [
+    (15, 60),
+    (30, 120),
+    (35, None),
+])
+def test_time_at(depth, expected):
+    assert square_profile().time_at(depth) == expected
+
+def test_average_depth_weighted_by_duration():
+    segments = Segments.from_collection(square_profile().to_segments())
+    assert square_profile().average_depth() == pytest.approx(Segments.average_depth(segments.items))
+
+def test_merge_flat_joins_same_speed_and_gas():
+    profile = CompactProfile()
+    profile.add(10, air, 60)
+    profile.add(20, air, 60)
+    profile.add_flat(air, 60)
+    profile.add_flat(air, 60)
+    profile.add_flat(ean50, 60)
+    prefix = profile.prefix(5)
+    profile.merge_flat()
+    assert profile.end_depths.tolist() == [20, 20, 20]
+    assert profile.durations.tolist() == [120, 120, 60]
+    assert profile.end_times.tolist() == [120, 240, 300]
+    assert len(prefix) == 5
+
+def test_merge_flat_keeps_skipped_items():
+    profile = CompactProfile()
+    profile.add(10, air, 60)
+    profile.add_flat(air, 60)
+    profile.add_flat(air, 60)
+    profile.merge_flat(2)
+    assert profile.durations.tolist() == [60, 60, 60]
+    profile.merge_flat(1)
+    assert profile.durations.tolist() == [60, 120]
+
+def test_planner_consumes_compact_profile():
+    profile = CompactProfile()
+    profile.add(30, air, 120)
+    profile.add_flat(air, 1200)
+    options = Options()
+    params = AlgorithmParams.for_compact_profile(profile, Gases(air), options)
+    calculated = BuhlmannAlgorithm().decompression(params)
+    assert len(profile) == 2
+    assert calculated.segments[1].duration == 1200
+    assert calculated.was_calculated
+
+def test_compact_profile_params_match_segments_after_surface_interval():
+    profile = CompactProfile()
+    profile.add(30, air, 120)
+    profile.add_flat(air, 1200)
+    options = Options()
+    first = AlgorithmParams.for_compact_profile(profile, Gases(air), options)
+    tissues = BuhlmannAlgorithm().decompression(first).tissues
+    compact = AlgorithmParams.for_compact_profile(profile, Gases(air), options, tissues, 3600)
+    segments = AlgorithmParams.for_multilevel_dive(Segments.from_collection(profile.to_segments()), Gases(air),
+                                                   options, tissues, 3600)
+    assert compact.surface_interval == 3600
+    assert BuhlmannAlgorithm().no_deco_limit(compact) == BuhlmannAlgorithm().no_deco_limit(segments)
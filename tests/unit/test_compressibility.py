@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from diving_calc.gases.standard_gases import Gas, StandardGases
+from diving_calc.physics.compressibility import Compressibility
+from diving_calc.physics.compressibility_batch import CompressibilityBatch
+
+helium = Gas(0, 1)
+
+
+@pytest.fixture
+def sut():
+    return Compressibility()
+
+
+@pytest.mark.parametrize("pressure, gas, expected", [
+    (200, StandardGases.trimix2525, 192.05390841),
+    (50, StandardGases.air, 50.44588538),
+    (100, helium, 95.47529425),
+    (1, StandardGases.air, 1),
+])
+def test_normal_volume(sut, pressure, gas, expected):
+    assert sut.normal_volume(pressure, gas) == pytest.approx(expected, abs=1e-8)
+
+
+@pytest.mark.parametrize("gas, volume, expected", [
+    (StandardGases.trimix2525, 192.05390841, 200),
+    (StandardGases.air, 50.44588538, 50),
+    (helium, 95.47529425, 100),
+    (StandardGases.air, 1, 1),
+])
+def test_pressure(sut, gas, volume, expected):
+    assert sut.pressure(gas, volume) == pytest.approx(expected, abs=1e-5)
+
+
+@pytest.mark.parametrize("pressure, gas, expected", [
+    (207, StandardGases.air, 1.04017669),
+    (207, StandardGases.oxygen, 0.95879556),
+    (207, helium, 1.09756199),
+    (207, StandardGases.trimix1845, 1.05930748),
+    (232, StandardGases.trimix1845, 1.07288297),
+])
+def test_z_factor(sut, pressure, gas, expected):
+    assert sut.z_factor(pressure, gas) == pytest.approx(expected, abs=1e-8)
+
+
+def test_pressure_inverts_normal_volume_up_to_500_bars(sut):
+    for pressure in range(0, 501, 25):
+        volume = sut.normal_volume(pressure, StandardGases.trimix1070)
+        assert sut.pressure(StandardGases.trimix1070, volume) == pytest.approx(pressure, abs=1e-6)
+
+
+def test_pressure_iterations_are_bounded(sut):
+    sut.max_iterations = 1
+    with pytest.raises(ValueError):
+        sut.pressure(StandardGases.oxygen, 400)
+
+
+def test_batch_matches_scalar(sut):
+    gases = [StandardGases.air, StandardGases.oxygen, StandardGases.trimix1845, helium]
+    fO2 = [gas.o2_fraction for gas in gases]
+    fHe = [gas.he_fraction for gas in gases]
+    pressures = np.array([50, 207, 232, 300])
+    volumes = CompressibilityBatch.normal_volume(pressures, fO2, fHe)
+    assert CompressibilityBatch.z_factor(pressures, fO2, fHe) == \
+        pytest.approx([sut.z_factor(p, gas) for p, gas in zip(pressures, gases)], abs=1e-12)
+    assert volumes == pytest.approx([sut.normal_volume(p, gas) for p, gas in zip(pressures, gases)], abs=1e-9)
+    assert CompressibilityBatch.pressure(volumes, fO2, fHe) == pytest.approx(pressures, abs=1e-6)
+
+
+def test_batch_broadcasts_pressures_and_mixes():
+    pressures = np.linspace(0, 300, 7)[:, np.newaxis]
+    result = CompressibilityBatch.normal_volume(pressures, [0.209, 0.32], 0)
+    assert result.shape == (7, 2)
+
+
+def test_batch_not_solvable_is_nan():
+    result = CompressibilityBatch.pressure([200, np.nan], 1, 0)
+    assert result[0] == pytest.approx(Compressibility().pressure(StandardGases.oxygen, 200))
+    assert np.isnan(result[1])
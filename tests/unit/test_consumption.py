@@ -0,0 +1,168 @@
+import pytest
+from diving_calc.algorithm.options import Options, SafetyStop
+from diving_calc.consumption.consumption import Consumption, ConsumptionOptions
+from diving_calc.consumption.diver import Diver
+from diving_calc.consumption.tanks import Tank
+from diving_calc.depths.segments import Segment, Segments
+from diving_calc.gases.standard_gases import StandardGases
+from diving_calc.physics.depth_converter import DepthConverter
+from diving_calc.physics.pressure_converter import Salinity
+from diving_calc.physics.time import Time
+
+consumption = Consumption(DepthConverter.for_fresh_water())
+consumption_options = ConsumptionOptions(Diver(20), Consumption.default_primary_reserve, 0)
+
+
+def create_options(gf_low: float, gf_high: float, safety_stop: int) -> Options:
+    options = Options(gf_low, gf_high, 1.4, 1.6, Salinity.FRESH)
+    options.ascent_speed_6m = 10
+    options.ascent_speed_50perc_to_6m = 10
+    options.ascent_speed_50perc = 10
+    options.descent_speed = 20
+    options.gas_switch_duration = 1
+    options.safety_stop = safety_stop
+    options.problem_solving_duration = 2
+    return options
+
+def bottom_segments(depth: float, descent: float, bottom: float) -> Segments:
+    segments = Segments()
+    segments.add(depth, StandardGases.air, descent * Time.ONE_MINUTE)
+    segments.add_flat(StandardGases.air, bottom * Time.ONE_MINUTE)
+    return segments
+
+def air_and_ean50(air_pressure: float, ean50_pressure: float):
+    return [Tank(20, air_pressure, StandardGases.air), Tank(10, ean50_pressure, StandardGases.ean50)]
+
+
+@pytest.mark.parametrize("depth, descent, bottom, expected", [
+    (30, 0.5, 10.5, 17),
+    (30, 0.5, 23, 0),
+])
+def test_max_bottom_time_of_single_tank(depth, descent, bottom, expected):
+    tanks = [Tank(15, 200)]
+    options = create_options(0.4, 0.85, SafetyStop.ALWAYS)
+    segments = bottom_segments(depth, descent, bottom)
+    assert consumption.max_bottom_time(segments, tanks, consumption_options, options) == expected
+
+@pytest.mark.parametrize("air_pressure, ean50_pressure, expected", [
+    (200, 200, 27),
+    (85, 95, 5),
+])
+def test_max_bottom_time_uses_all_tanks(air_pressure, ean50_pressure, expected):
+    tanks = air_and_ean50(air_pressure, ean50_pressure)
+    options = create_options(0.4, 0.85, SafetyStop.ALWAYS)
+    segments = bottom_segments(40, 2, 1)
+    assert consumption.max_bottom_time(segments, tanks, consumption_options, options) == expected
+
+def test_max_bottom_time_of_multilevel_dive():
+    segments = bottom_segments(20, 1, 10)
+    segments.add_flat(StandardGases.air, 10 * Time.ONE_MINUTE)
+    options = create_options(0.4, 0.85, SafetyStop.ALWAYS)
+    assert consumption.max_bottom_time(segments, [Tank(24, 200)], consumption_options, options) == 50
+
+def test_max_bottom_time_of_profile_ending_at_surface():
+    segments = bottom_segments(10, 10, 10)
+    segments.add(0, StandardGases.air, 10 * Time.ONE_MINUTE)
+    options = create_options(0.4, 0.85, SafetyStop.ALWAYS)
+    assert consumption.max_bottom_time(segments, [Tank(24, 200)], consumption_options, options) == 181
+
+def test_max_bottom_time_keeps_source_segments():
+    segments = bottom_segments(30, 0.5, 10.5)
+    options = create_options(0.4, 0.85, SafetyStop.ALWAYS)
+    consumption.max_bottom_time(segments, [Tank(15, 200)], consumption_options, options)
+    assert len(segments) == 2
+    assert segments.duration == 11 * Time.ONE_MINUTE
+
+def test_max_bottom_time_with_unregistered_gas_raises():
+    segments = bottom_segments(30, 0.5, 10.5)
+    options = create_options(0.4, 0.85, SafetyStop.ALWAYS)
+    tanks = [Tank(15, 200, StandardGases.ean32)]
+    with pytest.raises(ValueError):
+        consumption.max_bottom_time(segments, tanks, consumption_options, options)
+
+@pytest.mark.parametrize("tank_size, duration, expected", [
+    (36, 1, 30),
+    (20, 10, 42),
+])
+def test_rock_bottom_reserve(tank_size, duration, expected):
+    tank = Tank(tank_size, 200)
+    profile = [
+        Segment(0, 20, tank.gas, Time.ONE_MINUTE),
+        Segment(20, 20, tank.gas, duration * Time.ONE_MINUTE),
+        Segment(20, 0, tank.gas, 4 * Time.ONE_MINUTE)
+    ]
+    options = create_options(1, 1, SafetyStop.ALWAYS)
+    consumption.consume_from_tanks(profile, options, [tank], consumption_options)
+    assert tank.reserve == expected
+
+def test_consumed_gas_is_subtracted_from_start_pressure():
+    tank = Tank(10, 200)
+    profile = [
+        Segment(0, 20, tank.gas, Time.ONE_MINUTE),
+        Segment(20, 20, tank.gas, 10 * Time.ONE_MINUTE),
+        Segment(20, 0, tank.gas, 2 * Time.ONE_MINUTE)
+    ]
+    consumption.consume_from_tanks(profile, create_options(1, 1, SafetyStop.NEVER), [tank], consumption_options)
+    assert tank.consumed == 72
+    assert tank.end_pressure == 128
+
+def test_both_tanks_are_consumed_with_reserve():
+    air_tank, ean50_tank = tanks = air_and_ean50(200, 200)
+    profile = [
+        Segment(0, 30, air_tank.gas, 2 * Time.ONE_MINUTE),
+        Segment(30, 30, air_tank.gas, 10 * Time.ONE_MINUTE),
+        Segment(30, 20, air_tank.gas, 2 * Time.ONE_MINUTE),
+        Segment(20, 20, ean50_tank.gas, Time.ONE_MINUTE),
+        Segment(20, 0, ean50_tank.gas, Time.ONE_MINUTE)
+    ]
+    consumption.consume_from_tanks(profile, create_options(1, 1, SafetyStop.NEVER), tanks, consumption_options)
+    assert (air_tank.consumed, ean50_tank.consumed) == (52, 10)
+    assert (air_tank.reserve, ean50_tank.reserve) == (34, 23)
+
+def test_stages_are_consumed_first():
+    air_tank = Tank(20, 200)
+    ean50_tank = Tank(10, 200, StandardGases.ean50)
+    air_tank2 = Tank(10, 200)
+    profile = [
+        Segment(0, 30, air_tank.gas, 2 * Time.ONE_MINUTE),
+        Segment(30, 30, air_tank.gas, 10 * Time.ONE_MINUTE),
+        Segment(30, 20, air_tank.gas, 2 * Time.ONE_MINUTE),
+        Segment(20, 20, ean50_tank.gas, Time.ONE_MINUTE),
+        Segment(20, 0, ean50_tank.gas, Time.ONE_MINUTE)
+    ]
+    tanks = [air_tank, ean50_tank, air_tank2]
+    consumption.consume_from_tanks(profile, create_options(1, 1, SafetyStop.NEVER), tanks, consumption_options)
+    assert [tank.consumed for tank in tanks] == [0, 10, 103]
+
+def test_not_used_tank_has_only_reserve():
+    air_tank = Tank(10, 200)
+    ean50_tank = Tank(10, 100, StandardGases.ean50)
+    profile = [
+        Segment(0, 20, air_tank.gas, Time.ONE_MINUTE),
+        Segment(20, 20, air_tank.gas, 10 * Time.ONE_MINUTE),
+        Segment(20, 0, air_tank.gas, 2 * Time.ONE_MINUTE)
+    ]
+    tanks = [air_tank, ean50_tank]
+    consumption.consume_from_tanks(profile, create_options(1, 1, SafetyStop.NEVER), tanks, consumption_options)
+    assert (air_tank.consumed, ean50_tank.consumed) == (72, 0)
+    assert (air_tank.reserve, ean50_tank.reserve) == (36, 21)
+
+def test_last_deepest_point_is_used_for_emergency_ascent():
+    gas = StandardGases.air
+    profile = [
+        Segment(0, 30, gas, 3 * Time.ONE_MINUTE),
+        Segment(30, 30, gas, 10 * Time.ONE_MINUTE),
+        Segment(30, 10, gas, Time.ONE_MINUTE),
+        Segment(10, 10, gas, 10 * Time.ONE_MINUTE),
+        Segment(10, 20, gas, Time.ONE_MINUTE),
+        Segment(20, 20, gas, 10 * Time.ONE_MINUTE),
+        Segment(20, 0, gas, 3 * Time.ONE_MINUTE)
+    ]
+    tank = Tank(20, 200)
+    consumption.consume_from_tanks(profile, create_options(1, 1, SafetyStop.NEVER), [tank], consumption_options)
+    assert tank.reserve == 47
+
+def test_short_profile_raises():
+    profile = [Segment(0, 20, StandardGases.air, Time.ONE_MINUTE)]
+    with pytest.raises(ValueError):
+        consumption.consume_from_tanks(profile, Options(), [Tank(10, 200)], consumption_options)
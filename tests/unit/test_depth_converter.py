@@ -1,5 +1,11 @@
+import array
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pytest
-from diving_calc.physics.depth_converter import DepthConverter, DepthConverterFactory, DepthOptions, Salinity
+from diving_calc.physics.depth_converter import (
+    BelowSurface, DepthConverter, DepthConverterFactory, DepthConverterRegistry, DepthOptions, Salinity
+)
+from diving_calc.physics.pressure_converter import Density
 
 
 
@@ -42,3 +48,111 @@ def test_depth_converter_from_bar_saline():
     depth = converter.from_bar(2)  # Should correspond to ~10m depth
     assert depth == pytest.approx(9.76, abs=1e-2)
 
+
+def test_depth_converter_to_bar_many_matches_scalar():
+    converter = DepthConverter.for_salt_water(altitude=500)
+    depths = [0, 3.5, 10, 42]
+    result = converter.to_bar_many(depths)
+    assert result == pytest.approx([converter.to_bar(d) for d in depths])
+
+def test_depth_converter_many_accept_scalars():
+    converter = DepthConverter.for_salt_water(altitude=0)
+    assert converter.to_bar_many(10) == pytest.approx(converter.to_bar(10))
+    assert converter.from_bar_many(2.0) == pytest.approx(converter.from_bar(2.0))
+    assert converter.from_bar_many(0.5, BelowSurface.CLIP) == 0
+    assert np.isnan(converter.from_bar_many(0.5, BelowSurface.NAN))
+
+@pytest.mark.parametrize("source", [
+    lambda values: values,
+    lambda values: array.array('d', values),
+    lambda values: memoryview(array.array('d', values)),
+    lambda values: np.array(values),
+])
+def test_depth_converter_from_bar_many_sources(source):
+    converter = DepthConverter.for_fresh_water(altitude=0)
+    bars = [1.01325, 1.993, 2.5]
+    result = converter.from_bar_many(source(bars))
+    assert result == pytest.approx([converter.from_bar(b) for b in bars])
+
+def test_depth_converter_from_bar_many_raises_below_surface():
+    converter = DepthConverter.for_fresh_water(altitude=0)
+    with pytest.raises(ValueError, match="Lower pressure than altitude isn't convertible to depth."):
+        converter.from_bar_many([2, 0.5])
+
+def test_depth_converter_from_bar_many_clips_below_surface():
+    converter = DepthConverter.for_fresh_water(altitude=0)
+    result = converter.from_bar_many([0.5, 1.993], BelowSurface.CLIP)
+    assert result == pytest.approx([0, 10], abs=1e-2)
+
+def test_depth_converter_from_bar_many_nan_below_surface():
+    converter = DepthConverter.for_fresh_water(altitude=0)
+    result = converter.from_bar_many([0.5, 1.993], BelowSurface.NAN)
+    assert np.isnan(result[0])
+    assert result[1] == pytest.approx(10, abs=1e-2)
+
+def test_depth_converter_many_into_preallocated_output():
+    converter = DepthConverter.for_salt_water(altitude=0)
+    depths = np.linspace(0, 60, 5 * 3600)
+    out = np.empty_like(depths)
+    bars = converter.to_bar_many(depths, out=out)
+    assert bars is out
+    assert converter.from_bar_many(bars) == pytest.approx(depths)
+
+def test_depth_converter_simple_coefficients():
+    converter = DepthConverter.simple()
+    assert converter.to_bar(10) == pytest.approx(2)
+    assert converter.from_bar(4) == pytest.approx(30)
+
+def test_registry_reuses_converter():
+    registry = DepthConverterRegistry()
+    first = registry.get(Salinity.SALT, 300)
+    second = registry.get(Salinity.SALT, 300)
+    assert first is second
+    assert registry.info() == (1, 1, registry.maxsize, 1)
+
+def test_registry_quantizes_altitude():
+    registry = DepthConverterRegistry(altitude_step=10)
+    converter = registry.get(Salinity.FRESH, 1003)
+    assert registry.get(Salinity.FRESH, 998) is converter
+    assert converter.surface_pressure == pytest.approx(DepthConverter(Density.FRESH, 1000).surface_pressure)
+
+def test_registry_distinguishes_salinity():
+    registry = DepthConverterRegistry()
+    assert registry.get(Salinity.FRESH, 0).density == Density.FRESH
+    assert registry.get(Salinity.SALT, 0).density == Density.SALT
+
+def test_registry_evicts_least_recently_used():
+    registry = DepthConverterRegistry(maxsize=2)
+    salt = registry.get(Salinity.SALT, 0)
+    registry.get(Salinity.FRESH, 0)
+    registry.get(Salinity.SALT, 0)
+    registry.get(Salinity.BRACKISH, 0)
+    assert registry.info().currsize == 2
+    assert registry.get(Salinity.SALT, 0) is salt
+    assert registry.info().misses == 3
+
+def test_registry_is_thread_safe():
+    registry = DepthConverterRegistry()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        found = list(executor.map(lambda _: registry.get(Salinity.BRACKISH, 700), range(200)))
+    assert all(converter is found[0] for converter in found)
+    assert registry.info().misses == 1
+
+def test_factory_returns_shared_converter():
+    options = DepthOptions(altitude=250, salinity=Salinity.SALT)
+    assert DepthConverterFactory(options).create() is DepthConverter.for_salt_water(250)
+
+def test_converter_is_immutable():
+    converter = DepthConverter.simple()
+    with pytest.raises(AttributeError):
+        converter._surface_pressure = 2
+    with pytest.raises(AttributeError):
+        converter.anything = 1
+    assert converter.to_bar(10) == pytest.approx(2)
+
+def test_pickled_converter_converts_the_same():
+    import pickle
+    converter = DepthConverter.for_fresh_water(1000)
+    restored = pickle.loads(pickle.dumps(converter))
+    assert restored.to_bar(30) == converter.to_bar(30)
+    assert restored.from_bar(2) == converter.from_bar(2)
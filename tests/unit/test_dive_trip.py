@@ -0,0 +1,105 @@
+import math
+import pickle
+import numpy as np
+import pytest
+from diving_calc.algorithm.buhlmann_algorithm import BuhlmannAlgorithm
+from diving_calc.algorithm.dive_trip import DiveTrip
+from diving_calc.algorithm.options import Options
+from diving_calc.algorithm.tissues import Tissues
+from diving_calc.depths.segments import Segments
+from diving_calc.gases.gases import Gases
+from diving_calc.gases.standard_gases import StandardGases
+from diving_calc.physics.time import Time
+
+options = Options(1, 1, 1.6, 1.6)
+stable_tissues = Tissues.create_at(0)
+
+
+def trimix_dive(depth: float = 40):
+    segments = Segments()
+    segments.add(depth, StandardGases.trimix1845, Time.ONE_MINUTE * 2)
+    segments.add_flat(StandardGases.trimix1845, Time.ONE_MINUTE * 60)
+    return segments, Gases(StandardGases.trimix1845), options
+
+def dive_on_trimix() -> Tissues:
+    return DiveTrip().dive(*trimix_dive()).tissues
+
+def rest(tissues: Tissues, altitude: float, duration: float) -> Tissues:
+    return BuhlmannAlgorithm.apply_surface_interval(tissues, altitude, duration)
+
+
+def test_surface_interval_not_applied_for_zero_duration():
+    loaded = dive_on_trimix()
+    assert rest(loaded, 0, 0).pressures == pytest.approx(loaded.pressures)
+
+def test_infinite_surface_interval_resets_to_stable_tissues():
+    assert rest(dive_on_trimix(), 0, math.inf).pressures == pytest.approx(stable_tissues.pressures, abs=1e-8)
+
+def test_surface_interval_does_not_change_not_loaded_tissues():
+    assert rest(stable_tissues, 0, Time.ONE_MINUTE * 10).pressures == pytest.approx(stable_tissues.pressures)
+
+def test_surface_interval_adapts_to_higher_altitude():
+    rested = rest(stable_tissues, 1000, Time.ONE_MINUTE * 10)
+    assert np.all(rested.p_n2 < stable_tissues.p_n2)
+    assert np.all(rested.p_n2 > 0)
+    assert np.all(rested.p_he == 0)
+
+def test_surface_interval_adapts_to_lower_altitude():
+    source = rest(stable_tissues, 1000, Time.ONE_MINUTE * 120)
+    rested = rest(stable_tissues, 500, Time.ONE_MINUTE * 10)
+    assert np.all(source.p_n2 < rested.p_n2)
+
+def test_surface_interval_reduces_helium():
+    loaded = dive_on_trimix()
+    rested = rest(loaded, 0, Time.ONE_MINUTE * 10)
+    assert np.all(rested.p_he < loaded.p_he)
+    assert np.all(rested.p_he > 0)
+
+def test_tissues_come_back_after_one_and_half_day():
+    rested = rest(dive_on_trimix(), 0, Time.ONE_HOUR * 36)
+    assert rested.pressures == pytest.approx(stable_tissues.pressures, abs=5e-3)
+
+@pytest.mark.parametrize("altitude, duration", [(-1, 0), (0, -1)])
+def test_surface_interval_rejects_negative_values(altitude, duration):
+    with pytest.raises(ValueError):
+        rest(stable_tissues, altitude, duration)
+
+def test_repetitive_dive_ends_with_different_tissues():
+    trip = DiveTrip()
+    first = trip.dive(*trimix_dive()).tissues
+    second = trip.dive(*trimix_dive(), surface_interval=Time.ONE_MINUTE * 5).tissues
+    assert not np.allclose(first.pressures, second.pressures)
+
+def test_first_dive_ignores_surface_interval():
+    first = DiveTrip().dive(*trimix_dive(), surface_interval=Time.ONE_MINUTE * 5).tissues
+    assert first.pressures == pytest.approx(dive_on_trimix().pressures)
+
+def test_no_deco_limits_are_lower_for_repetitive_dive():
+    trip = DiveTrip()
+    first_limits = [trip.no_deco_limit(*trimix_dive(depth)) for depth in range(12, 45, 3)]
+    trip.dive(*trimix_dive())
+    second_limits = [trip.no_deco_limit(*trimix_dive(depth), surface_interval=Time.ONE_MINUTE * 10)
+                     for depth in range(12, 45, 3)]
+    assert all(first > second for first, second in zip(first_limits, second_limits))
+
+def test_resumed_trip_continues_with_the_same_tissues():
+    trip = DiveTrip()
+    trip.dive(*trimix_dive())
+    snapshot = trip.snapshot()
+    assert len(snapshot) == 256
+    resumed = DiveTrip.resume(snapshot)
+    expected = trip.dive(*trimix_dive(), surface_interval=Time.ONE_HOUR)
+    resumed.dive(*trimix_dive(), surface_interval=Time.ONE_HOUR)
+    assert resumed.tissues.pressures == pytest.approx(expected.tissues.pressures)
+
+def test_empty_trip_snapshot():
+    assert DiveTrip.resume(DiveTrip().snapshot()).tissues is None
+
+def test_tissues_snapshot_round_trip():
+    loaded = dive_on_trimix()
+    assert np.array_equal(Tissues.from_bytes(loaded.to_bytes()).pressures, loaded.pressures)
+    assert np.array_equal(pickle.loads(pickle.dumps(loaded)).pressures, loaded.pressures)
+
+def test_tissues_snapshot_rejects_wrong_size():
+    with pytest.raises(ValueError):
+        Tissues.from_bytes(bytes(8))
@@ -0,0 +1,58 @@
+import pytest
+from diving_calc.gases.gas_blender import FillRequest, GasBlender
+from diving_calc.gases.gas_blender_batch import BlendStatus
+from diving_calc.gases.standard_gases import Gas, StandardGases
+
+helium = Gas(0, 1)
+air21 = Gas(0.21, 0)
+
+
+def test_blend_trimix_from_empty_cylinder():
+    request = FillRequest(0, air21, 200, StandardGases.trimix2525, (StandardGases.oxygen, helium, air21))
+    result = GasBlender.blend(request)
+    assert result.succeeded
+    assert [round(step.volume, 1) for step in result.steps] == [22.5, 48.0, 121.6]
+    assert [round(step.pressure, 1) for step in result.steps] == [22.2, 71.3, 200]
+    assert [step.mix_name for step in result.steps] == ['Oxygen', 'Helitrox 32/68', 'Helitrox 25/25']
+
+
+def test_blend_nitrox_tops_existing_gas():
+    request = FillRequest(50, air21, 200, StandardGases.ean32, (StandardGases.oxygen, air21))
+    result = GasBlender.blend(request)
+    assert [round(step.volume, 1) for step in result.steps] == [27.2, 117.5]
+    assert [round(step.pressure, 1) for step in result.steps] == [76.1, 200]
+    assert [step.mix_name for step in result.steps] == ['EAN49', 'EAN32']
+    assert [step.gas_name for step in result.steps] == ['Oxygen', 'Air']
+
+
+def test_volumes_scale_with_cylinder_size():
+    request = FillRequest(50, air21, 200, StandardGases.ean32, (StandardGases.oxygen, air21), size=12)
+    result = GasBlender.blend(request)
+    assert result.volume_of(StandardGases.oxygen) == pytest.approx(27.16364578 * 12)
+
+
+def test_failed_blends_reported_per_request():
+    toppings = (StandardGases.oxygen, air21)
+    requests = [
+        FillRequest(50, air21, 200, StandardGases.ean32, toppings),
+        FillRequest(50, air21, 200, Gas(0.18, 0), toppings),
+        FillRequest(50, air21, 200, StandardGases.ean32, (air21, air21)),
+        FillRequest(0, air21, 200, StandardGases.trimix2525, (StandardGases.oxygen, helium, air21)),
+        FillRequest(-1, air21, 200, StandardGases.ean32, toppings),
+    ]
+    results = GasBlender.blend_many(requests)
+    assert [result.error for result in results] == [
+        '', BlendStatus.messages[BlendStatus.IMPOSSIBLE], BlendStatus.messages[BlendStatus.DEGENERATE],
+        '', BlendStatus.messages[BlendStatus.INVALID]]
+    assert [result.request for result in results] == requests
+    assert results[1].steps == ()
+
+
+def test_nitrox_toppings_cant_blend_trimix():
+    request = FillRequest(0, air21, 200, StandardGases.trimix2525, (StandardGases.oxygen, air21))
+    assert GasBlender.blend(request).error == BlendStatus.messages[BlendStatus.IMPOSSIBLE]
+
+
+def test_wrong_count_of_toppings_raises():
+    with pytest.raises(ValueError):
+        GasBlender.blend(FillRequest(0, air21, 200, StandardGases.ean32, (StandardGases.oxygen,)))
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from diving_calc.gases.gas_blender_batch import BlendStatus, GasBlenderBatch
+from diving_calc.physics.compressibility_batch import CompressibilityBatch
+
+
+def test_blend_many_trimix_cylinders():
+    targets_O2 = np.array([0.21, 0.18, 0.15, 0.12])
+    targets_He = np.array([0.35, 0.45, 0.55, 0.6])
+    result = GasBlenderBatch.blend(30, 0.21, 0.35, 220, targets_O2, targets_He, [1, 0, 0.209], [0, 1, 0])
+    assert (result.status == BlendStatus.OK).all()
+    assert result.volumes.shape == (4, 3)
+    assert result.fO2[:, -1] == pytest.approx(targets_O2)
+    assert result.fHe[:, -1] == pytest.approx(targets_He)
+    assert (np.diff(result.pressures, axis=1) >= 0).all()
+
+
+def test_blended_volume_fills_target_pressure():
+    result = GasBlenderBatch.blend(50, 0.21, 0, 200, 0.32, 0, [1, 0.21], [0, 0])
+    start = CompressibilityBatch.normal_volume(50, 0.21, 0)
+    final = CompressibilityBatch.normal_volume(200, 0.32, 0)
+    assert start + result.volumes.sum() == pytest.approx(final)
+
+
+def test_failed_rows_are_nan():
+    result = GasBlenderBatch.blend([50, 50, 250], 0.21, 0, 200, [0.32, 1.2, 0.32], 0, [1, 0.21], [0, 0])
+    assert result.status.tolist() == [BlendStatus.OK, BlendStatus.INVALID, BlendStatus.IMPOSSIBLE]
+    assert np.isnan(result.volumes[1:]).all()
+    assert np.isnan(result.pressures[1:]).all()
+
+
+def test_unsupported_count_of_toppings():
+    with pytest.raises(ValueError):
+        GasBlenderBatch.blend(0, 0.21, 0, 200, 0.32, 0, [1], [0])
@@ -0,0 +1,18 @@
+import pytest
+from diving_calc.gases.gas_density import DensityAtDepth, GasDensity
+from diving_calc.gases.standard_gases import StandardGases
+from diving_calc.physics.depth_converter import DepthConverter
+
+
+@pytest.mark.parametrize("fO2, fHe, expected", [
+    (0.21, 0, 1.28817),
+    (0.32, 0, 1.30764),
+    (1, 0, 1.428),
+    (0.18, 0.45, 0.80046),
+])
+def test_density_at_one_ata(fO2, fHe, expected):
+    assert GasDensity.for_content(fO2, fHe) == pytest.approx(expected, abs=1e-5)
+
+def test_air_density_at_30_m():
+    density = DensityAtDepth(DepthConverter.for_fresh_water()).at_depth(StandardGases.air, 30)
+    assert density == pytest.approx(5.094, abs=1e-3)
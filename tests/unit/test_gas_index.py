@@ -0,0 +1,114 @@
+import random
+import pytest
+from diving_calc.algorithm.options import Options
+from diving_calc.gases.gas_index import GasIndex, GasRange
+from diving_calc.gases.gas_mixtures import GasMixtures
+from diving_calc.gases.gases import Gases, OCGasSource
+from diving_calc.gases.standard_gases import Gas, StandardGases
+from diving_calc.physics.depth_converter import DepthConverter
+
+simple = DepthConverter.simple()
+
+
+def deco_index() -> GasIndex:
+    gases = [StandardGases.trimix1845, StandardGases.ean50, StandardGases.oxygen]
+    return GasIndex.for_gases(gases, simple, 1.6)
+
+
+def test_best_gas_has_highest_oxygen():
+    index = deco_index()
+    assert index.best_gas(40) is StandardGases.trimix1845
+    assert index.best_gas(21) is StandardGases.ean50
+    assert index.best_gas(6) is StandardGases.oxygen
+    assert index.best_gas(0) is StandardGases.oxygen
+
+def test_no_gas_below_maximum_depth():
+    assert deco_index().best_gas(100) is None
+
+def test_hypoxic_gas_not_usable_above_ceiling():
+    index = GasIndex.for_gases([StandardGases.trimix1070], simple, 1.4)
+    assert index.best_gas(5) is None
+    assert index.best_gas(10) is StandardGases.trimix1070
+
+def test_switch_depths_rounded_by_limits():
+    index = deco_index()
+    assert index.switch_depth(StandardGases.ean50) == pytest.approx(22)
+    assert index.switch_depth(StandardGases.oxygen) == pytest.approx(6)
+    assert index.switch_depth(StandardGases.trimix1845) == pytest.approx(index.ranges[0].max_depth)
+
+def test_never_best_gas_has_no_switch_depth():
+    index = GasIndex([GasRange(StandardGases.ean32, 0, 30), GasRange(StandardGases.air, 0, 20)])
+    assert index.switch_depth(StandardGases.air) is None
+
+def test_equal_oxygen_selects_first_added():
+    trimix = Gas(0.32, 0.2)
+    index = GasIndex([GasRange(trimix, 0, 40), GasRange(StandardGases.ean32, 0, 30)])
+    assert index.best_gas(20) is trimix
+    # replaced range keeps the order
+    index.add(GasRange(trimix, 0, 10))
+    assert index.best_gas(20) is StandardGases.ean32
+    assert index.best_gas(10) is trimix
+
+def test_removed_gas_replaced_by_next_best():
+    index = deco_index()
+    index.remove(StandardGases.ean50)
+    assert index.best_gas(21) is StandardGases.trimix1845
+    assert len(index) == 2
+    assert StandardGases.ean50 not in index
+
+def test_incremental_changes_match_new_index():
+    generator = random.Random(7)
+    gases = [Gas(o2 / 100, 0) for o2 in range(18, 40)]
+    index = GasIndex()
+
+    for _ in range(300):
+        gas = generator.choice(gases)
+        if gas in index and generator.random() < 0.4:
+            index.remove(gas)
+        else:
+            ceiling = generator.randint(0, 20)
+            index.add(GasRange(gas, ceiling, ceiling + generator.randint(-2, 40)))
+
+        expected = GasIndex(index.ranges)
+        for depth in range(-1, 62):
+            for probe in (depth, depth + 0.5):
+                assert index.best_gas(probe) is expected.best_gas(probe)
+        assert index._levels == expected._levels
+
+
+def previous_best_gas(source: OCGasSource, current_depth: float, current_gas):
+    """Linear search used before the index."""
+    current_pressure = source.depth_converter.to_bar(current_depth)
+    max_end_pressure = source.depth_converter.to_bar(source.options.max_end)
+    found = current_gas
+    for candidate in source.gases.all:
+        mod = source.depth_levels.to_deco_stop(GasMixtures.mod(source.options.max_deco_ppO2, candidate.o2_fraction))
+        fO2 = candidate.o2_fraction if source.options.oxygen_narcotic else 0
+        end = GasMixtures.end(current_pressure, candidate.n2_fraction, fO2)
+        if current_depth <= mod and end <= max_end_pressure:
+            if found is None or found.o2_fraction < candidate.o2_fraction:
+                found = candidate
+    return found
+
+@pytest.mark.parametrize('oxygen_narcotic', [True, False])
+def test_gas_source_matches_linear_search(oxygen_narcotic):
+    options = Options(0.4, 0.85, 1.4, 1.6)
+    options.oxygen_narcotic = oxygen_narcotic
+    gases = Gases(StandardGases.trimix1260, StandardGases.air, StandardGases.trimix2135, StandardGases.ean32,
+                  StandardGases.trimix3525, StandardGases.ean50, StandardGases.oxygen)
+    source = OCGasSource(gases, options)
+
+    for tenths in range(0, 1000, 5):
+        depth = tenths / 10
+        for current in (None, StandardGases.trimix1260, StandardGases.ean32, StandardGases.oxygen):
+            assert source.best_gas(depth, current) is previous_best_gas(source, depth, current)
+
+def test_gas_source_follows_added_gas_and_options():
+    options = Options(0.4, 0.85, 1.4, 1.6)
+    gases = Gases(StandardGases.air)
+    source = OCGasSource(gases, options)
+    assert source.best_gas(6, StandardGases.air) is StandardGases.air
+    gases.add(StandardGases.oxygen)
+    assert source.best_gas(6, StandardGases.air) is StandardGases.oxygen
+    options.max_deco_ppO2 = 1.4
+    assert source.best_gas(6, StandardGases.air) is StandardGases.air
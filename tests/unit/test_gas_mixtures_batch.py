@@ -0,0 +1,68 @@
+import array
+import numpy as np
+import pytest
+from diving_calc.gases.gas_mixtures import GasMixtures
+from diving_calc.gases.gas_mixtures_batch import GasMixturesBatch
+from diving_calc.physics.depth_converter import DepthConverter
+from diving_calc.physics.pressure_converter import Density
+
+
+@pytest.fixture
+def depth_converter():
+    return DepthConverter(Density.SALT, 0) # density and altitude in meters
+
+
+def test_partial_pressure_matches_scalar():
+    pressures = np.array([1.0, 3.0, 5.5])
+    result = GasMixturesBatch.partial_pressure(pressures, 0.21)
+    expected = [GasMixtures.partial_pressure(p, 0.21) for p in pressures]
+    assert result == pytest.approx(expected)
+
+
+def test_mod_accepts_buffers():
+    fractions = array.array('d', [0.21, 0.32, 0.5])
+    result = GasMixturesBatch.mod(1.4, memoryview(fractions))
+    assert result == pytest.approx([GasMixtures.mod(1.4, f) for f in fractions])
+
+
+def test_mod_invalid_fraction_is_nan():
+    result = GasMixturesBatch.mod(1.4, [0.21, 0, -0.1])
+    assert result[0] == pytest.approx(6.666, abs=1e-2)
+    assert np.isnan(result[1:]).all()
+
+
+def test_best_mix_capped_at_one(depth_converter):
+    result = GasMixturesBatch.best_mix(1.4, [0, 3, 30], depth_converter)
+    assert result[:2] == pytest.approx([1, 1])
+    assert result[2] == pytest.approx(GasMixtures.best_mix(1.4, 30, depth_converter))
+
+
+def test_best_mix_broadcasts_depth_and_pressure_axes(depth_converter):
+    depths = np.array([10, 20, 30, 40])
+    pressures = np.array([1.2, 1.4, 1.6])
+    result = GasMixturesBatch.best_mix(pressures[np.newaxis, :], depths[:, np.newaxis], depth_converter)
+    assert result.shape == (4, 3)
+    assert result[2, 1] == pytest.approx(GasMixtures.best_mix(1.4, 30, depth_converter))
+
+
+def test_ead_matches_scalar():
+    fractions = np.array([0.21, 0.32, 0.36])
+    result = GasMixturesBatch.ead(fractions, 2.7)
+    assert result == pytest.approx([GasMixtures.ead(f, 2.7) for f in fractions])
+
+
+def test_end_trimix():
+    result = GasMixturesBatch.end([4, 5], 0.39, 0.21)
+    assert result == pytest.approx([2.4, 3.0], abs=1e-2)
+
+
+def test_mnd_without_narcotic_gas_is_nan():
+    result = GasMixturesBatch.mnd(30, [0.39, 0], 0)
+    assert result[0] == pytest.approx(76.92, abs=1e-2)
+    assert np.isnan(result[1])
+
+
+def test_ceiling_floored_at_surface_pressure():
+    result = GasMixturesBatch.ceiling([0.12, 0.21, 0.5, 0], 1.0)
+    assert result[:3] == pytest.approx([1.5, 1.0, 1.0], abs=1e-2)
+    assert np.isnan(result[3])
@@ -37,3 +37,10 @@ def test_pure_oxygen():
 def test_gas_with_no_helium():
     assert GasNames.name_for(0.21, 0) == 'Air'
 
+
+# Test para comprobar que los nombres se calculan solo una vez
+def test_name_for_cached():
+    GasNames.name_for.cache_clear()
+    GasNames.name_for(0.32)
+    GasNames.name_for(0.32)
+    assert GasNames.name_for.cache_info().hits == 1
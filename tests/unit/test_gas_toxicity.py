@@ -0,0 +1,44 @@
+import pytest
+from diving_calc.algorithm.options import Options
+from diving_calc.gases.gas_toxicity import GasToxicity
+from diving_calc.gases.standard_gases import StandardGases
+
+toxicity = GasToxicity(Options(1, 1, 1.4, 1.6))
+
+
+def test_mnd_for_trimix_21_35():
+    assert toxicity.mnd_for_gas(StandardGases.trimix2135) == 51.54
+
+@pytest.mark.parametrize("gas, expected", [
+    (StandardGases.ean32, 33.75),
+    (StandardGases.air, 56.98),
+    (StandardGases.oxygen, 4),
+])
+def test_mod_rounded_down_like_reference(gas, expected):
+    assert toxicity.mod_for_gas(gas) == expected
+
+@pytest.mark.parametrize("gas, expected", [
+    (StandardGases.ean50, 21),
+    (StandardGases.oxygen, 6),
+])
+def test_switch_depth_rounded_to_deco_stop(gas, expected):
+    assert toxicity.switch_depth(gas) == expected
+
+def test_max_depth_is_minimum_of_mod_and_mnd():
+    assert toxicity.max_depth(StandardGases.air) == pytest.approx(30)
+    assert GasToxicity().max_depth(StandardGases.oxygen) == 4
+    assert toxicity.max_depth(StandardGases.trimix2135) == pytest.approx(51.54)
+
+def test_best_nitrox_mix_in_percents():
+    assert toxicity.best_nitrox_mix(30) == 35
+
+def test_limits_follow_changed_options():
+    options = Options(1, 1, 1.4, 1.6)
+    changing = GasToxicity(options)
+    options.max_ppO2 = 1.2
+    assert changing.mod_for_gas(StandardGases.ean32) == pytest.approx(27.5)
+
+def test_oxygen_not_narcotic_extends_mnd():
+    options = Options(1, 1, 1.4, 1.6)
+    options.oxygen_narcotic = False
+    assert GasToxicity(options).mnd_for_gas(StandardGases.trimix2135) > 51.54
@@ -0,0 +1,69 @@
+import itertools
+import io
+import pytest
+from diving_calc.algorithm.buhlmann_algorithm import AlgorithmParams, BuhlmannAlgorithm
+from diving_calc.algorithm.log_replay import REPLAY_FIELDS, DiveLogReader, LogReplay
+from diving_calc.algorithm.options import Options
+from diving_calc.gases.standard_gases import StandardGases
+from diving_calc.physics.depth_converter import DepthConverter
+
+
+def test_csv_reader_with_header():
+    lines = io.StringIO('depth,time,gas\n0,0,Air\n10,60,\n10,120,EAN50\n')
+    samples = list(DiveLogReader.csv(lines))
+    assert samples == [(0, 0, 'Air'), (60, 10, None), (120, 10, 'EAN50')]
+
+def test_csv_reader_without_header():
+    assert list(DiveLogReader.csv(['0,0', '30,5'])) == [(0, 0, None), (30, 5, None)]
+
+def test_json_lines_reader():
+    lines = ['{"time": 0, "depth": 0, "gas": "EAN32"}', '', '{"time": 10, "depth": 2.5}']
+    assert list(DiveLogReader.json_lines(lines)) == [(0, 0, 'EAN32'), (10, 2.5, None)]
+
+def test_replay_of_planned_profile_matches_algorithm_tissues():
+    options = Options()
+    profile = BuhlmannAlgorithm().decompression(AlgorithmParams.for_simple_dive(40, StandardGases.air, options))
+    samples = [(0, 0, 'Air')]
+    time = 0
+    for segment in profile.segments:
+        time += segment.duration
+        samples.append((time, segment.end_depth, None))
+
+    *_, last = LogReplay(options).replay(samples)
+    record = dict(zip(REPLAY_FIELDS, last))
+    surface = DepthConverter.for_salt_water().surface_pressure
+    assert record['gradient_factor'] == pytest.approx(profile.tissues.gradient_factor(surface))
+    assert record['ceiling'] == 0
+    assert record['cns'] > 0
+
+def test_replay_metrics_use_gas_of_the_sample():
+    samples = [(0, 0, 'Air'), (60, 21, 'EAN50')]
+    first, second = LogReplay(Options(salinity=3)).replay(samples)
+    record = dict(zip(REPLAY_FIELDS, second))
+    assert record['ppO2'] == pytest.approx(0.5 * DepthConverter.for_salt_water().to_bar(21))
+    assert record['density'] > first[REPLAY_FIELDS.index('density')]
+
+def test_replay_is_lazy():
+    endless = ((second, 10.0, None) for second in itertools.count())
+    rows = list(itertools.islice(LogReplay(Options()).replay(endless), 5))
+    assert [row[0] for row in rows] == [0, 1, 2, 3, 4]
+
+def test_replay_rejects_unordered_samples():
+    with pytest.raises(ValueError):
+        list(LogReplay(Options()).replay([(10, 5, None), (5, 5, None)]))
+
+def test_replay_rejects_unknown_gas():
+    with pytest.raises(ValueError):
+        list(LogReplay(Options()).replay([(0, 0, 'Unknown')]))
+
+def test_record_creates_segment_between_samples():
+    samples = [(0, 0, 'Air'), (60, 20, None), (60, 20, 'EAN50'), (120, 20, None)]
+    profile = LogReplay(Options()).record(samples)
+    assert len(profile) == 2
+    assert profile.gases == [StandardGases.air, StandardGases.ean50]
+    assert profile.depth_at(30) == pytest.approx(10)
+    assert profile.duration == 120
+
+def test_record_rejects_unordered_samples():
+    with pytest.raises(ValueError):
+        LogReplay(Options()).record([(10, 5, None), (5, 5, None)])
@@ -0,0 +1,61 @@
+import asyncio
+import sys
+from pathlib import Path
+import pytest
+
+pytest.importorskip('textual')
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'scripts'))
+import main
+from main import MOD, DivingCalc, Teoria, calculadora_nitrox
+
+
+def run_app(test) -> None:
+    async def run():
+        app = DivingCalc()
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await test(app, pilot)
+
+    asyncio.run(run())
+
+
+async def loaded_documents(teoria: Teoria, pilot):
+    for _ in range(100):
+        if teoria.children:
+            return teoria.children
+        await pilot.pause(0.01)
+    raise AssertionError('Theory documents were not loaded.')
+
+
+def test_only_selected_theory_document_visible():
+    async def test(app, pilot):
+        teoria = app.screen.get_widget_by_id('teoria')
+        documents = await loaded_documents(teoria, pilot)
+        assert [document.id for document in documents if document.display] == ['teoria-mod']
+
+        teoria.update_content('ead')
+        await pilot.pause()
+        assert [document.id for document in documents if document.display] == ['teoria-ead']
+
+    run_app(test)
+
+
+def test_fast_typing_publishes_only_final_result(monkeypatch):
+    # longer delay, so slow machine still types faster
+    monkeypatch.setattr(main, 'RETARDO_CALCULO', 0.5)
+
+    async def test(app, pilot):
+        caja = app.screen.query_one(MOD)
+        calculated = []
+        published = []
+        caja.calculo = lambda ppO2, o2: calculated.append((ppO2, o2)) or calculadora_nitrox.mod(ppO2, o2)
+        caja.resultado.watch_resultado = lambda value: published.append(value)
+
+        caja.input1.input.focus()
+        await pilot.press(*'1.4', 'tab', *'32')
+        await pilot.pause(main.RETARDO_CALCULO * 2)
+
+        assert calculated == [(1.4, 32)]
+        assert published == [calculadora_nitrox.mod(1.4, 32)]
+
+    run_app(test)
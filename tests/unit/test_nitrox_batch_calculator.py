@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from diving_calc.physics.depth_converter import DepthConverter
+from diving_calc.calculators.nitrox_calculator import NitroxCalculator
+from diving_calc.calculators.nitrox_batch_calculator import NitroxBatchCalculator
+from diving_calc.physics.pressure_converter import Density
+
+
+@pytest.fixture
+def depth_converter():
+    return DepthConverter(Density.SALT, 0) # density and altitude in meters
+
+
+@pytest.fixture
+def nitrox_calculator(depth_converter):
+    return NitroxCalculator(depth_converter)
+
+
+@pytest.fixture
+def batch_calculator(depth_converter):
+    return NitroxBatchCalculator(depth_converter)
+
+
+def test_ead_matches_scalar(nitrox_calculator, batch_calculator):
+    percents = np.array([32, 36, 21, 50])
+    depths = np.array([30, 25, 40, 18])
+    result = batch_calculator.ead(percents, depths)
+    expected = [nitrox_calculator.ead(p, d) for p, d in zip(percents, depths)]
+    assert result == pytest.approx(expected, abs=1e-9)
+
+
+def test_ead_above_surface_is_zero(batch_calculator):
+    result = batch_calculator.ead(50, [0, 3, 18])
+    assert result[:2] == pytest.approx([0, 0])
+    assert result[2] == pytest.approx(7.68, abs=1e-2)
+
+
+def test_best_mix_matches_scalar(nitrox_calculator, batch_calculator):
+    result = batch_calculator.best_mix([1.4, 1.6], [30, 21])
+    assert result == pytest.approx([nitrox_calculator.best_mix(1.4, 30), nitrox_calculator.best_mix(1.6, 21)])
+
+
+def test_mod_grid(nitrox_calculator, batch_calculator):
+    pressures = np.array([1.2, 1.4, 1.6])
+    percents = np.array([21, 32, 50, 100])
+    result = batch_calculator.mod(pressures[:, np.newaxis], percents[np.newaxis, :])
+    assert result.shape == (3, 4)
+    assert result[1, 1] == pytest.approx(33.28, abs=1e-2)
+    assert result[2, 2] == pytest.approx(nitrox_calculator.mod(1.6, 50))
+
+
+def test_mod_invalid_elements_are_nan(batch_calculator):
+    result = batch_calculator.mod(1.4, [32, 0, 200])
+    assert result[0] == pytest.approx(33.28, abs=1e-2)
+    assert np.isnan(result[1:]).all()
+
+
+def test_partial_pressure_matches_scalar(nitrox_calculator, batch_calculator):
+    result = batch_calculator.partial_pressure([32, 36, 50], [30, 25, 21])
+    assert result == pytest.approx([1.29, 1.27, 1.56], abs=1e-2)
+    assert result[0] == pytest.approx(nitrox_calculator.partial_pressure(32, 30))
+
+
+def test_scalars_match_scalar_calculator(nitrox_calculator, batch_calculator):
+    assert batch_calculator.mod(1.4, 32) == pytest.approx(nitrox_calculator.mod(1.4, 32))
+    assert batch_calculator.ead(32, 30) == pytest.approx(nitrox_calculator.ead(32, 30))
+    assert batch_calculator.best_mix(1.4, 30) == pytest.approx(nitrox_calculator.best_mix(1.4, 30))
+    assert batch_calculator.partial_pressure(32, 30) == pytest.approx(nitrox_calculator.partial_pressure(32, 30))
@@ -0,0 +1,71 @@
+import pytest
+from diving_calc.calculators.otu_calculator import OtuCalculator
+from diving_calc.depths.compact_profile import CompactProfile
+from diving_calc.depths.segments import Segment
+from diving_calc.gases.standard_gases import StandardGases
+from diving_calc.physics.depth_converter import DepthConverter
+
+calculator = OtuCalculator(DepthConverter.simple())
+profile = [
+    Segment(0, 36, StandardGases.ean32, 180),
+    Segment(36, 36, StandardGases.ean32, 22 * 60),
+    Segment(36, 0, StandardGases.ean32, 30 * 60),
+]
+air_at_40m = [
+    Segment(0, 40, StandardGases.air, 180),
+    Segment(40, 40, StandardGases.air, 17 * 60),
+    Segment(40, 15, StandardGases.air, 180),
+    Segment(15, 15, StandardGases.air, 60),
+    Segment(15, 12, StandardGases.air, 60),
+    Segment(12, 12, StandardGases.air, 60),
+    Segment(12, 9, StandardGases.air, 60),
+    Segment(9, 9, StandardGases.air, 5 * 60),
+    Segment(9, 6, StandardGases.air, 60),
+    Segment(6, 6, StandardGases.air, 23 * 60),
+    Segment(6, 0, StandardGases.air, 120),
+]
+oxygen_at_6m = [
+    Segment(0, 6, StandardGases.oxygen, 60),
+    Segment(6, 6, StandardGases.oxygen, 58 * 60),
+    Segment(6, 0, StandardGases.oxygen, 60),
+]
+
+
+def test_empty_profile_has_no_otu():
+    assert calculator.calculate_for_profile([]) == 0
+
+@pytest.mark.parametrize("duration, fO2, start_depth, end_depth, expected", [
+    (0, 0, 0, 0, 0),
+    (22, 0.4, 0, 0, 0),
+    (0, 1, 0, 0, 0),
+    (1320, 1.484, 0, 0, 38.676181761978775),
+    (1200, 1.6, 0, 0, 38.5817773),
+    (1200, 0.32, 30, 36, 31.9046752),
+    (1200, 0, 20, 30, 0),
+    (0, 0.32, 20, 30, 0),
+    (1320, 0.32, 36, 36, 38.28272978563932),
+    (180, 0.32, 0, 36, 2.4171302),
+    (1800, 0.32, 36, 0, 24.1713018),
+])
+def test_segment_otu(duration, fO2, start_depth, end_depth, expected):
+    assert calculator.calculate(duration, fO2, start_depth, end_depth) == pytest.approx(expected, abs=1e-7)
+
+def test_profile_otu_is_sum_of_segments():
+    assert calculator.calculate_for_profile(profile) == pytest.approx(64.8711617, abs=1e-7)
+
+def test_applies_depth_converter():
+    salt_calculator = OtuCalculator(DepthConverter.for_salt_water())
+    assert salt_calculator.calculate_for_profile(profile) == pytest.approx(65.9177262, abs=1e-7)
+
+@pytest.mark.parametrize("segments, expected", [
+    (air_at_40m, 20.8817664),
+    (oxygen_at_6m, 114.9995884),
+])
+def test_complex_profiles_in_fresh_water(segments, expected):
+    fresh_calculator = OtuCalculator(DepthConverter.for_fresh_water())
+    assert fresh_calculator.calculate_for_profile(segments) == pytest.approx(expected, abs=1e-7)
+    compact = CompactProfile.from_segments(segments)
+    assert fresh_calculator.calculate_for_compact_profile(compact) == pytest.approx(expected, abs=1e-7)
+
+def test_empty_compact_profile_has_no_otu():
+    assert calculator.calculate_for_compact_profile(CompactProfile()) == 0
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from diving_calc.calculators.cns_calculator import CnsCalculator
+from diving_calc.calculators.otu_calculator import OtuCalculator
+from diving_calc.calculators.oxygen_toxicity_batch import OxygenToxicityBatch
+from diving_calc.depths.compact_profile import CompactProfile
+from diving_calc.gases.standard_gases import StandardGases
+from diving_calc.physics.depth_converter import DepthConverter
+
+converter = DepthConverter.for_fresh_water()
+sut = OxygenToxicityBatch(converter)
+fO2 = np.array([0.32, 0.32, 1, 0.209, 0.5, 0.32])
+start_depths = np.array([0, 36, 6, 0, 21, 1])
+end_depths = np.array([36, 36, 0, 40, 9, 60])
+durations = np.array([180, 1320, 60, 180, 240, 300])
+
+
+def square_profile(depth: float, bottom: float) -> CompactProfile:
+    profile = CompactProfile()
+    profile.add(depth, StandardGases.ean32, 120)
+    profile.add_flat(StandardGases.ean32, bottom)
+    profile.add(0, StandardGases.ean32, 300)
+    return profile
+
+
+def test_cns_equals_scalar_calculator():
+    scalar = CnsCalculator(converter)
+    expected = [scalar.calculate(*values) for values in zip(fO2, start_depths, end_depths, durations)]
+    assert sut.cns(fO2, start_depths, end_depths, durations) == pytest.approx(expected)
+
+def test_integrated_cns_equals_scalar_calculator():
+    scalar = CnsCalculator(converter)
+    expected = [scalar.calculate_integrated(*values) for values in zip(fO2, start_depths, end_depths, durations)]
+    assert sut.cns_integrated(fO2, start_depths, end_depths, durations) == pytest.approx(expected)
+
+def test_integrated_cns_of_single_segment():
+    expected = CnsCalculator(converter).calculate_integrated(0.5, 0, 21, 300)
+    assert sut.cns_integrated(0.5, 0, 21, 300) == pytest.approx(expected)
+
+def test_noaa_cns_equals_scalar_calculator():
+    scalar = CnsCalculator(converter)
+    expected = [scalar.calculate_noaa(*values) for values in zip(fO2, start_depths, end_depths, durations)]
+    assert sut.noaa_cns(fO2, start_depths, end_depths, durations) == pytest.approx(expected)
+
+def test_noaa_limit_equals_scalar_lookup():
+    ppO2 = np.array([0.2, 0.5, 0.55, 1.0, 1.4000000001, 1.45, 1.6, 1.7])
+    assert sut.noaa_limit(ppO2).tolist() == [CnsCalculator.noaa_limit(value) for value in ppO2]
+
+def test_otu_equals_scalar_calculator():
+    scalar = OtuCalculator(converter)
+    expected = [scalar.calculate(duration, o2, start, end)
+                for o2, start, end, duration in zip(fO2, start_depths, end_depths, durations)]
+    assert sut.otu(fO2, start_depths, end_depths, durations) == pytest.approx(expected)
+
+def test_totals_of_each_profile():
+    profiles = [square_profile(30, 1200), CompactProfile(), square_profile(40, 600)]
+    totals = sut.for_profiles(profiles)
+    cns = CnsCalculator(converter)
+    otu = OtuCalculator(converter)
+    assert totals.cns == pytest.approx([cns.calculate_for_compact_profile(profile) for profile in profiles])
+    assert totals.otu == pytest.approx([otu.calculate_for_compact_profile(profile) for profile in profiles])
+
+def test_totals_of_empty_profiles():
+    totals = sut.for_profiles([CompactProfile()])
+    assert totals.cns.tolist() == [0]
+    assert totals.otu.tolist() == [0]
+
+def test_daily_totals_by_diver_and_day():
+    totals = OxygenToxicityBatch.daily_totals([10, 20, 5, 7], divers=[0, 0, 1, 0], days=[0, 0, 2, 1])
+    assert totals.tolist() == [[30, 7, 0], [0, 0, 5]]
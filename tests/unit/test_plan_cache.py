@@ -0,0 +1,85 @@
+import pytest
+from diving_calc.algorithm.buhlmann_algorithm import AlgorithmParams, BuhlmannAlgorithm
+from diving_calc.algorithm.options import Options
+from diving_calc.algorithm.plan_cache import PlanCache
+from diving_calc.depths.segments import Segments
+from diving_calc.gases.gases import Gases
+from diving_calc.gases.standard_gases import Gas, StandardGases
+
+
+def create_params(bottom_time: float = 1200, gf_high: float = 0.85, gas: Gas = StandardGases.air) -> AlgorithmParams:
+    segments = Segments()
+    segments.add(30, gas, 90)
+    segments.add_flat(gas, bottom_time)
+    return AlgorithmParams.for_multilevel_dive(segments, Gases(gas, StandardGases.ean50), Options(0.4, gf_high))
+
+def plan_text(profile) -> str:
+    return ' '.join(f'{s.start_depth:g},{s.end_depth:g},{s.duration:g};' for s in profile.segments)
+
+
+def test_same_dive_defined_by_other_instances_is_cached():
+    cache = PlanCache()
+    first = cache.decompression(create_params())
+    second = cache.decompression(create_params(gas=Gas(0.209, 0)))
+    assert second is first
+    assert cache.info().hits == 1
+    assert cache.info().misses == 1
+
+def test_different_bottom_time_reuses_prefix_and_matches_algorithm():
+    cache = PlanCache()
+    cache.decompression(create_params(1200))
+    profile = cache.decompression(create_params(1260))
+    expected = BuhlmannAlgorithm().decompression(create_params(1260))
+    assert cache.info().prefix_hits == 1
+    assert plan_text(profile) == plan_text(expected)
+    assert profile.tissues.p_n2 == pytest.approx(expected.tissues.p_n2)
+
+def test_different_gradient_factors_skip_all_planned_segments():
+    cache = PlanCache()
+    cache.decompression(create_params(gf_high=0.85))
+    profile = cache.decompression(create_params(gf_high=0.7))
+    expected = BuhlmannAlgorithm().decompression(create_params(gf_high=0.7))
+    assert plan_text(profile) == plan_text(expected)
+    assert profile.tissue_loads == expected.tissue_loads - 2
+
+def test_entries_expire_after_ttl():
+    now = [0]
+    cache = PlanCache(ttl=10, clock=lambda: now[0])
+    first = cache.decompression(create_params())
+    now[0] = 11
+    second = cache.decompression(create_params())
+    assert second is not first
+    assert cache.info().prefix_hits == 0
+
+def test_least_recently_used_plan_is_evicted():
+    cache = PlanCache(maxsize=2)
+    cache.decompression(create_params(600))
+    cache.decompression(create_params(900))
+    cache.decompression(create_params(600))
+    cache.decompression(create_params(1200))
+    assert cache.info().currsize == 2
+    cache.decompression(create_params(600))
+    assert cache.info().hits == 2
+
+def test_invalid_plan_cached_by_content():
+    cache = PlanCache()
+    params = create_params()
+    params.gases = Gases(StandardGases.ean32)
+    profile = cache.decompression(params)
+    assert not profile.was_calculated
+    equal = create_params()
+    equal.gases = Gases(Gas(0.32, 0))
+    assert cache.decompression(equal) is profile
+    assert cache.info().hits == 1
+
+def test_no_deco_limit_is_cached():
+    cache = PlanCache()
+    params = AlgorithmParams.for_simple_dive(30, StandardGases.air, Options())
+    assert cache.no_deco_limit(params) == cache.no_deco_limit(params)
+    assert cache.info().hits == 1
+
+def test_clear_resets_statistics():
+    cache = PlanCache()
+    cache.decompression(create_params())
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 128, 0)
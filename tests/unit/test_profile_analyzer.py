@@ -0,0 +1,104 @@
+import pytest
+from diving_calc.algorithm.options import Options
+from diving_calc.algorithm.profile_analyzer import ProfileAnalyzer
+from diving_calc.depths.compact_profile import CompactProfile
+from diving_calc.depths.segments import Segment
+from diving_calc.gases.gas_density import DensityAtDepth
+from diving_calc.gases.standard_gases import StandardGases
+from diving_calc.physics.depth_converter import DepthConverter
+
+options = Options(1, 1, 1.4, 1.6)
+analyzer = ProfileAnalyzer(options, DepthConverter.simple())
+
+
+def test_empty_profile_has_no_findings():
+    analysis = analyzer.analyze([])
+    assert analysis.max_density == 0
+    assert analysis.max_density_gas is None
+    assert analysis.min_ppO2 == 0
+    assert not analysis.has_violations
+    assert analysis.gas_switches == ()
+
+def test_air_dive_within_limits():
+    profile = [
+        Segment(0, 30, StandardGases.air, 90),
+        Segment(30, 30, StandardGases.air, 20 * 60),
+        Segment(30, 0, StandardGases.air, 180),
+    ]
+    analysis = analyzer.analyze(profile)
+    assert not analysis.has_violations
+    assert analysis.max_ppO2 == pytest.approx(0.836)
+    assert analysis.min_ppO2 == pytest.approx(0.209)
+    assert analysis.max_density == pytest.approx(DensityAtDepth(DepthConverter.simple()).at_depth(StandardGases.air, 30))
+    assert analysis.max_density_depth == 30
+
+def test_descent_crossing_mod_reports_crossing_time():
+    profile = [
+        Segment(0, 40, StandardGases.ean32, 200),
+        Segment(40, 40, StandardGases.ean32, 600),
+        Segment(40, 0, StandardGases.ean32, 400),
+    ]
+    analysis = analyzer.analyze(profile)
+    assert len(analysis.high_ppO2) == 1
+    high = analysis.high_ppO2[0]
+    assert high.depth == pytest.approx(33.75)
+    assert high.time == pytest.approx(168.75)
+
+def test_mnd_exceeded_reported_once_until_diver_returns():
+    profile = [
+        Segment(0, 40, StandardGases.air, 100),
+        Segment(40, 40, StandardGases.air, 100),
+        Segment(40, 20, StandardGases.air, 100),
+        Segment(20, 40, StandardGases.air, 100),
+    ]
+    analysis = analyzer.analyze(profile)
+    assert [(event.time, event.depth) for event in analysis.mnd_exceeded] == [
+        pytest.approx((75, 30)), pytest.approx((350, 30))]
+
+def test_hypoxic_gas_at_surface_reports_low_ppO2():
+    profile = [
+        Segment(0, 50, StandardGases.trimix1070, 150),
+        Segment(50, 50, StandardGases.trimix1070, 600),
+    ]
+    analysis = analyzer.analyze(profile)
+    assert analysis.low_ppO2[0].time == 0
+    assert analysis.low_ppO2[0].depth == 0
+    assert analysis.min_ppO2 == pytest.approx(0.1)
+
+def test_gas_switch_depth_and_deco_ppO2_after_ascent_start():
+    profile = [
+        Segment(0, 40, StandardGases.air, 120),
+        Segment(40, 21, StandardGases.air, 120),
+        Segment(21, 21, StandardGases.ean50, 60),
+        Segment(21, 6, StandardGases.ean50, 120),
+        Segment(6, 6, StandardGases.oxygen, 60),
+    ]
+    analysis = analyzer.analyze(profile, start_ascent_index=2)
+    assert [(switch.time, switch.depth, switch.switch_depth) for switch in analysis.gas_switches] == \
+        [(240, 21, 21), (420, 6, 6)]
+    assert analysis.high_ppO2 == ()
+    assert analysis.max_ppO2 == pytest.approx(1.6)
+
+def test_gas_switch_deeper_than_mod_is_high_ppO2():
+    profile = [
+        Segment(0, 30, StandardGases.air, 120),
+        Segment(30, 30, StandardGases.ean50, 60),
+    ]
+    high = analyzer.analyze(profile).high_ppO2
+    assert [(event.time, event.depth) for event in high] == [(120, 30)]
+
+def test_compact_profile_equals_segments():
+    profile = [
+        Segment(0, 60, StandardGases.trimix1845, 180),
+        Segment(60, 60, StandardGases.trimix1845, 1200),
+        Segment(60, 21, StandardGases.trimix1845, 240),
+        Segment(21, 0, StandardGases.ean50, 600),
+    ]
+    assert analyzer.analyze(CompactProfile.from_segments(profile)) == analyzer.analyze(profile)
+
+def test_analyze_many_keeps_order():
+    shallow = [Segment(0, 10, StandardGases.air, 60)]
+    deep = [Segment(0, 50, StandardGases.air, 60)]
+    results = analyzer.analyze_many([shallow, deep])
+    assert not results[0].has_violations
+    assert results[1].has_violations
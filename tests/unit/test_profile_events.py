@@ -0,0 +1,169 @@
+import random
+import pytest
+from diving_calc.algorithm.calculated_profile import EventType
+from diving_calc.algorithm.options import Options
+from diving_calc.algorithm.profile_events import ProfileEvents
+from diving_calc.depths.segments import Segment
+from diving_calc.gases.standard_gases import Gas, StandardGases
+
+
+def create_options() -> Options:
+    options = Options(1, 1, 1.4, 1.6)
+    options.ascent_speed_6m = 10
+    options.ascent_speed_50perc_to_6m = 10
+    options.ascent_speed_50perc = 10
+    options.descent_speed = 20
+    return options
+
+options = create_options()
+
+
+def types(events: ProfileEvents):
+    return [event.type for event in events.events]
+
+def test_no_events_for_safe_air_dive():
+    profile = [
+        Segment(0, 20, StandardGases.air, 60),
+        Segment(20, 20, StandardGases.air, 30 * 60),
+        Segment(20, 0, StandardGases.air, 120),
+    ]
+    assert ProfileEvents.from_profile(profile, options).events == []
+
+def test_high_ppO2_during_descent():
+    profile = [
+        Segment(0, 40, StandardGases.ean32, 200),
+        Segment(40, 40, StandardGases.ean32, 600),
+    ]
+    events = ProfileEvents.from_profile(profile, options).events
+    high = [event for event in events if event.type == EventType.HIGH_PPO2]
+    assert len(high) == 1
+    assert high[0].depth == pytest.approx(33.75)
+    assert high[0].time_stamp == pytest.approx(168.75)
+
+def test_low_ppO2_at_start_of_dive():
+    profile = [
+        Segment(0, 30, StandardGases.trimix1070, 180),
+        Segment(30, 30, StandardGases.trimix1070, 600),
+    ]
+    events = ProfileEvents.from_profile(profile, options).events
+    assert (events[0].type, events[0].time_stamp, events[0].depth) == (EventType.LOW_PPO2, 0, 0)
+
+def test_high_descent_and_ascent_speed():
+    profile = [
+        Segment(0, 30, StandardGases.air, 60),
+        Segment(30, 30, StandardGases.air, 600),
+        Segment(30, 0, StandardGases.air, 60),
+    ]
+    assert types(ProfileEvents.from_profile(profile, options)) == \
+        [EventType.HIGH_DESCENT_SPEED, EventType.HIGH_ASCENT_SPEED]
+
+def test_gas_switch_with_counter_diffusion():
+    profile = [
+        Segment(0, 30, StandardGases.trimix1845, 120),
+        Segment(30, 30, StandardGases.trimix1845, 600),
+        Segment(30, 21, StandardGases.trimix1845, 60),
+        Segment(21, 21, StandardGases.air, 60),
+    ]
+    events = ProfileEvents.from_profile(profile, options).events
+    assert [(event.type, event.time_stamp, event.depth) for event in events] == [
+        (EventType.GAS_SWITCH, 780, 21), (EventType.ISOBARIC_COUNTER_DIFFUSION, 780, 21)]
+    assert events[0].gas == StandardGases.air
+
+def test_mnd_exceeded_added_again_only_after_fixed():
+    profile = [
+        Segment(0, 40, StandardGases.air, 200),
+        Segment(40, 40, StandardGases.air, 100),
+        Segment(40, 20, StandardGases.air, 200),
+        Segment(20, 40, StandardGases.air, 200),
+    ]
+    mnd = [event for event in ProfileEvents.from_profile(profile, options).events
+           if event.type == EventType.MAX_END_EXCEEDED]
+    assert [(event.time_stamp, event.depth) for event in mnd] == [pytest.approx((150, 30)), pytest.approx((600, 30))]
+
+def test_high_density_during_descent():
+    profile = [
+        Segment(0, 50, StandardGases.air, 300),
+    ]
+    density = [event for event in ProfileEvents.from_profile(profile, options).events
+               if event.type == EventType.HIGH_GAS_DENSITY]
+    assert len(density) == 1
+    assert density[0].depth == pytest.approx(33.78, abs=0.01)
+
+def test_deco_ppO2_applied_after_ascent_start():
+    profile = [
+        Segment(0, 30, StandardGases.air, 120),
+        Segment(30, 30, StandardGases.air, 600),
+        Segment(30, 21, StandardGases.air, 90),
+        Segment(21, 21, StandardGases.ean50, 60),
+    ]
+    events = ProfileEvents.from_profile(profile, options)
+    assert EventType.HIGH_PPO2 in types(events)
+    events.start_ascent_index = 2
+    assert EventType.HIGH_PPO2 not in types(events)
+    assert events.evaluated == 2
+
+def test_append_evaluates_only_new_segment():
+    events = ProfileEvents(options, start_ascent_index=3)
+    events.append(Segment(0, 30, StandardGases.air, 120))
+    events.append(Segment(30, 30, StandardGases.air, 600))
+    events.append(Segment(30, 21, StandardGases.air, 60))
+    assert events.evaluated == 1
+    events.append(Segment(21, 21, StandardGases.ean50, 60))
+    assert events.evaluated == 1
+    assert types(events) == [EventType.GAS_SWITCH]
+
+def test_update_keeps_events_list_instance_and_moves_later_events():
+    profile = [
+        Segment(0, 30, StandardGases.air, 120),
+        Segment(30, 30, StandardGases.air, 600),
+        Segment(30, 21, StandardGases.air, 60),
+        Segment(21, 21, StandardGases.ean50, 60),
+        Segment(21, 6, StandardGases.ean50, 90),
+        Segment(6, 6, StandardGases.oxygen, 300),
+    ]
+    events = ProfileEvents.from_profile(profile, options, start_ascent_index=2)
+    live = events.events
+    events.update(1, Segment(30, 30, StandardGases.air, 900))
+    assert events.events is live
+    # the ascent speed depends on average depth of the changed bottom
+    assert events.evaluated == 3
+    assert [event.time_stamp for event in live] == [1080, 1230]
+    assert live == ProfileEvents.from_profile(events.segments, options, start_ascent_index=2).events
+
+def random_segment(start_depth: float, generator: random.Random) -> Segment:
+    gases = [StandardGases.air, StandardGases.ean32, StandardGases.ean50, StandardGases.trimix1845, Gas(0.1, 0.7)]
+    end_depth = generator.choice([start_depth, generator.uniform(0, 80)])
+    return Segment(start_depth, end_depth, generator.choice(gases), generator.choice([30, 60, 120, 600]))
+
+def test_incremental_changes_equal_full_evaluation():
+    generator = random.Random(7)
+    events = ProfileEvents(options, start_ascent_index=4)
+    for _ in range(300):
+        segments = events.segments
+        count = len(segments)
+        action = generator.random()
+        if count < 3 or action < 0.4:
+            start = segments[-1].end_depth if segments else 0
+            events.append(random_segment(start, generator))
+        elif action < 0.8:
+            index = generator.randrange(count)
+            events.update(index, random_segment(segments[index].start_depth, generator))
+        elif action < 0.9:
+            events.insert(generator.randrange(count), random_segment(0, generator))
+        else:
+            events.remove(generator.randrange(count))
+
+        expected = ProfileEvents.from_profile(events.segments, options, start_ascent_index=4).events
+        # moved time stamps may differ by rounding errors
+        assert [(event.type, event.depth, event.gas) for event in events.events] == \
+            [(event.type, event.depth, event.gas) for event in expected]
+        assert [event.time_stamp for event in events.events] == \
+            pytest.approx([event.time_stamp for event in expected])
+
+    # deeper appended segment changes the average depth, which defines the allowed speed of earlier ascent
+    air = StandardGases.air
+    profile = [Segment(0, 40, air, 120), Segment(40, 7, air, 30), Segment(7, 0, air, 120)]
+    events = ProfileEvents.from_profile(profile, Options())
+    events.append(Segment(0, 80, air, 5))
+    assert events.events == ProfileEvents.from_profile(events.segments, Options()).events
+
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from diving_calc.calculators.nitrox_calculator import NitroxCalculator
+from diving_calc.physics.depth_converter import DepthConverter
+from diving_calc.physics.pressure_converter import Salinity
+from diving_calc.service import CalculationService, RequestBatcher, ServiceOverloaded
+
+
+def run_batcher(requests, **settings):
+    async def submit_all():
+        with ThreadPoolExecutor(1) as executor:
+            batcher = RequestBatcher(executor, **settings)
+            results = await asyncio.gather(*(batcher.submit(*request) for request in requests),
+                                           return_exceptions=True)
+            return batcher, results
+
+    return asyncio.run(submit_all())
+
+
+def test_concurrent_requests_calculated_in_one_batch():
+    salt = (Salinity.SALT, 0)
+    requests = [('mod', salt, (1.4, o2)) for o2 in range(21, 41)]
+    batcher, results = run_batcher(requests)
+    calculator = NitroxCalculator(DepthConverter.for_salt_water())
+    assert batcher.batches == 1
+    assert results == [pytest.approx(calculator.mod(1.4, o2)) for o2 in range(21, 41)]
+
+
+def test_full_batch_calculated_without_waiting():
+    requests = [('pressure', None, (altitude,)) for altitude in range(10)]
+    batcher, results = run_batcher(requests, max_batch=4, batch_window=0.05)
+    assert batcher.batches == 3
+    assert results[0] == pytest.approx(1.01325)
+
+
+def test_dive_sites_calculated_in_separate_batches():
+    requests = [('ead', (Salinity.SALT, 0), (30, 32)), ('ead', (Salinity.FRESH, 1000), (30, 32))]
+    batcher, results = run_batcher(requests)
+    assert batcher.batches == 2
+    assert results == [pytest.approx(24.38, abs=0.01), pytest.approx(24.50, abs=0.01)]
+
+
+def test_requests_over_limit_rejected():
+    requests = [('altitude', None, (0.9,))] * 3
+    batcher, results = run_batcher(requests, max_pending=2)
+    assert isinstance(results[2], ServiceOverloaded)
+    assert batcher.pending == 0
+
+
+async def exchange(port: int, request: bytes) -> bytes:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(request)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response
+
+
+async def exchange_with_service(request: bytes) -> bytes:
+    service = CalculationService(workers=1)
+    server = await service.serve('127.0.0.1', 0)
+    try:
+        return await exchange(server.sockets[0].getsockname()[1], request)
+    finally:
+        server.close()
+        service.close()
+
+
+def serve_requests(*requests: bytes):
+    responses = [asyncio.run(exchange_with_service(request)) for request in requests]
+    return [(int(response.split()[1]), json.loads(response.split(b'\r\n\r\n', 1)[1])) for response in responses]
+
+
+def test_http_get_and_post():
+    body = b'{"depth": 30, "ppo2": 1.4, "salinity": "fresh"}'
+    responses = serve_requests(
+        b'GET /mod?ppo2=1.4&o2=32 HTTP/1.1\r\nConnection: close\r\n\r\n',
+        b'POST /best-mix HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s' % (len(body), body))
+    assert responses[0] == (200, {'mod': pytest.approx(33.28, abs=0.01)})
+    assert responses[1] == (200, {'best_mix': pytest.approx(35.40, abs=0.01)})
+
+
+def test_kept_alive_connection_answers_all_requests():
+    request = b'GET /gas?name=EAN32 HTTP/1.1\r\n\r\nGET /gas?name=Air HTTP/1.1\r\nConnection: close\r\n\r\n'
+    raw = asyncio.run(exchange_with_service(request))
+    assert raw.count(b'HTTP/1.1 200 OK') == 2
+
+
+def test_invalid_requests_answered_by_errors():
+    responses = serve_requests(
+        b'GET /mod?ppo2=1.4 HTTP/1.1\r\nConnection: close\r\n\r\n',
+        b'GET /mod?ppo2=1.4&o2=0 HTTP/1.1\r\nConnection: close\r\n\r\n',
+        b'GET /nitrogen HTTP/1.1\r\nConnection: close\r\n\r\n',
+        b'DELETE /mod HTTP/1.1\r\nConnection: close\r\n\r\n',
+        b'garbage\r\n\r\n')
+    assert [status for status, _ in responses] == [400, 400, 404, 405, 400]
+    assert responses[0][1] == {'error': "Missing parameter 'o2'."}
+
+
+def test_non_finite_numbers_rejected():
+    responses = serve_requests(
+        b'GET /mod?ppo2=1.4&o2=32&altitude=1e400 HTTP/1.1\r\nConnection: close\r\n\r\n',
+        b'GET /ead?depth=nan&o2=32 HTTP/1.1\r\nConnection: close\r\n\r\n')
+    assert responses == [(400, {'error': "Parameter 'altitude' needs to be finite number."}),
+                         (400, {'error': "Parameter 'depth' needs to be finite number."})]
+
+
+def test_unexpected_error_answered_by_internal_error(monkeypatch):
+    def fail(parameters):
+        raise RuntimeError('failed')
+
+    monkeypatch.setattr(CalculationService, '_gas', staticmethod(fail))
+    assert serve_requests(b'GET /gas?name=Air HTTP/1.1\r\n\r\n') == [(500, {'error': 'Calculation failed.'})]
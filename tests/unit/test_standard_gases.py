@@ -53,3 +53,34 @@ def test_by_name_empty():
     """Test para búsqueda por un nombre vacío."""
     gas = StandardGases.by_name('')
     assert gas is None, "Empty name should return None."
+
+def test_gas_interned_by_content():
+    """Test para comprobar que los gases con el mismo contenido son la misma instancia."""
+    assert Gas(0.5, 0) is StandardGases.ean50
+    assert Gas(0.2090001, 0) is StandardGases.air
+    assert Gas(0.21, 0) is not StandardGases.air
+
+def test_gas_immutable():
+    """Test para comprobar que el gas no se puede modificar."""
+    with pytest.raises(AttributeError):
+        StandardGases.air.o2_fraction = 0.32
+
+def test_gas_as_dict_key():
+    """Test para usar el gas como clave de diccionario."""
+    names = {StandardGases.ean32: 'EAN32'}
+    assert names[Gas(0.32, 0)] == 'EAN32'
+    assert StandardGases.trimix1845 == Gas(0.18, 0.45)
+    assert StandardGases.trimix1845 != StandardGases.trimix1555
+
+def test_gas_pickle_keeps_interning():
+    """Test para comprobar que el gas deserializado es la misma instancia."""
+    import copy
+    import pickle
+    assert pickle.loads(pickle.dumps(StandardGases.trimix1070)) is StandardGases.trimix1070
+    assert copy.deepcopy(StandardGases.air) is StandardGases.air
+
+def test_by_name_parsed_gas_interned():
+    """Test para comprobar que los nombres analizados devuelven gases internados."""
+    assert StandardGases.by_name('EAN32') is StandardGases.ean32
+    assert StandardGases.by_name('28/30') is Gas(0.28, 0.3)
+    assert StandardGases.by_name('HELITROX 35/25') is StandardGases.trimix3525
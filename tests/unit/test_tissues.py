@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from diving_calc.algorithm.compartments import Compartments
+from diving_calc.algorithm.tissues import LoadSegment, Tissues
+from diving_calc.gases.standard_gases import StandardGases
+
+
+def test_create_saturates_all_compartments_by_air():
+    tissues = Tissues.create(1)
+    assert tissues.p_n2.shape == (Compartments.COUNT,)
+    assert tissues.p_n2 == pytest.approx(np.full(Compartments.COUNT, 0.7414), abs=1e-4)
+    assert tissues.p_he == pytest.approx(np.zeros(Compartments.COUNT))
+
+def test_create_loaded_rejects_wrong_count():
+    with pytest.raises(ValueError):
+        Tissues.create_loaded(np.zeros(3), np.zeros(3))
+
+def test_unloaded_ceiling_is_above_surface():
+    tissues = Tissues.create(1)
+    assert tissues.ceiling(1) == pytest.approx(0.491052, abs=1e-6)
+
+def test_load_flat_segment_ongases():
+    tissues = Tissues.create(1)
+    change = tissues.load(LoadSegment(4, 600, 0), StandardGases.air)
+    assert change > 0
+    assert tissues.p_n2[0] > tissues.p_n2[-1]
+
+def test_load_by_parts_equals_whole_segment():
+    whole = Tissues.create(1)
+    whole.load(LoadSegment(1, 120, 0.05), StandardGases.trimix1845)
+    parts = Tissues.create(1)
+    parts.load(LoadSegment(1, 60, 0.05), StandardGases.trimix1845)
+    parts.load(LoadSegment(4, 60, 0.05), StandardGases.trimix1845)
+    assert parts.p_n2 == pytest.approx(whole.p_n2)
+    assert parts.p_he == pytest.approx(whole.p_he)
+
+def test_restore_from_resets_cached_coefficients():
+    tissues = Tissues.create(1)
+    original = tissues.copy()
+    tissues.load(LoadSegment(5, 1200, 0), StandardGases.air)
+    loaded_ceiling = tissues.ceiling(1)
+    tissues.restore_from(original)
+    assert tissues.p_total == pytest.approx(original.p_total)
+    assert tissues.ceiling(1) < loaded_ceiling
+
+def test_saturation_ratio_at_surface_is_offgasing():
+    tissues = Tissues.create(1)
+    ratios = tissues.saturation_ratio(2)
+    assert np.all(ratios < 0)
+    assert ratios == pytest.approx(np.full(Compartments.COUNT, 0.7414 / 2 - 1), abs=1e-4)
+
+def test_saturation_ratio_of_loaded_tissues_is_ongasing():
+    tissues = Tissues.create(1)
+    tissues.load(LoadSegment(5, 3600, 0), StandardGases.air)
+    ratios = tissues.saturation_ratio(1)
+    assert ratios[0] > 1
+    assert ratios[-1] < 0
+    assert tissues.gradient_factor(1) == pytest.approx(ratios.max())